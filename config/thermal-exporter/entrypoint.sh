@@ -18,11 +18,14 @@ fi
 # Set default environment variables if not provided
 export METRICS_PORT="${METRICS_PORT:-9200}"
 export COLLECT_INTERVAL="${COLLECT_INTERVAL:-30}"
+export ADAPTIVE_SAMPLING="${ADAPTIVE_SAMPLING:-false}"
 
 echo "Configuration:"
 echo "  Metrics Port: $METRICS_PORT"
 echo "  Collection Interval: ${COLLECT_INTERVAL}s"
+echo "  Adaptive Sampling: ${ADAPTIVE_SAMPLING}"
 echo "  N8N Webhook: ${N8N_WEBHOOK_URL:-disabled}"
+echo "  Alert Rules: ${ALERT_RULES_FILE:-alert-rules.yml}"
 
 # Start the thermal exporter
 exec python3 thermal_exporter.py
\ No newline at end of file
@@ -10,11 +10,25 @@ import logging
 import os
 import re
 import json
+import math
+import mmap
+import struct
+import sqlite3
+import gzip
+import threading
 import requests
+import yaml
+from collections import deque
 from datetime import datetime
-from prometheus_client import start_http_server, Gauge, Counter, Histogram, Info
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from prometheus_client import Gauge, Counter, Histogram, Info, generate_latest, CONTENT_TYPE_LATEST
 from prometheus_client.core import CollectorRegistry
-from typing import Dict, Optional, Tuple
+from prometheus_client.openmetrics.exposition import (
+    generate_latest as generate_openmetrics,
+    CONTENT_TYPE_LATEST as OPENMETRICS_CONTENT_TYPE
+)
+from typing import Dict, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -30,8 +44,72 @@ class RaspberryPiThermalExporter:
         self.registry = CollectorRegistry()
         self.setup_metrics()
         self.platform_info = self.detect_platform()
+        self.cpu_stats = CpuStatsReader(
+            sysfs_root=os.getenv('SYSFS_ROOT', '/sys'),
+            procfs_root=os.getenv('PROCFS_ROOT', '/proc')
+        )
+        self.process_accounting = ProcessAccountant(
+            ProcessAccountant.parse_services(
+                os.getenv('PROCESS_SERVICES', 'ollama=ollama,n8n=n8n,postgres=postgres')
+            ),
+            procfs_root=os.getenv('PROCFS_ROOT', '/proc'),
+            rescan_interval=float(os.getenv('PROCESS_RESCAN_INTERVAL', '60'))
+        )
         self.n8n_webhook_url = os.getenv('N8N_WEBHOOK_URL')
-        self.last_alert_time = {}
+        self.alert_engine = AlertEngine.from_file(
+            os.getenv('ALERT_RULES_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alert-rules.yml'))
+        )
+        self.forecaster = ThermalForecaster(
+            soft_limit=float(os.getenv('THERMAL_SOFT_LIMIT', '80')),
+            forgetting_factor=float(os.getenv('FORECAST_FORGETTING_FACTOR', '0.9'))
+        )
+        # One temperature rate per collection for alerts, forecast and sampling
+        self.temperature_trend = TemperatureTrend(self.alert_engine.rate_window)
+        
+        # Bumped after every collection so HTTP responses can be cached in between
+        self.generation = 0
+        self.last_collection_time = None
+        
+        # Latest readings (used by adaptive sampling and admission control)
+        self.last_temperature = None
+        self.last_temperature_rate = None  # °C/min over the alert rules' rate_window
+        self.last_throttled_hex = None
+        self.last_load_average = None
+        self.last_core_voltage = None
+        self.last_frequencies = {}
+        
+        self.admission = AdmissionController(
+            soft_limit=self.forecaster.soft_limit,
+            critical_limit=float(os.getenv('THERMAL_CRITICAL_LIMIT', '85')),
+            load_threshold=float(os.getenv('ADMIT_LOAD_THRESHOLD', str(os.cpu_count() or 4))),
+            delay_seconds=int(os.getenv('ADMIT_DELAY_SECONDS', '60')),
+            default_cost=float(os.getenv('ADMIT_DEFAULT_COST', '300'))
+        )
+        
+        # Optional memory-mapped snapshot of the latest readings for local scripts
+        self.snapshot = None
+        snapshot_file = os.getenv('SNAPSHOT_FILE')
+        if snapshot_file:
+            try:
+                self.snapshot = SnapshotWriter(snapshot_file)
+                logger.info(f"Publishing readings snapshot to {snapshot_file}")
+            except OSError as e:
+                logger.warning(f"Could not create snapshot file {snapshot_file}: {e}")
+        
+        # Optional local history (raw samples + 1m/1h rollups) behind /history
+        self.history = None
+        history_db = os.getenv('HISTORY_DB')
+        if history_db:
+            try:
+                self.history = HistoryStore(
+                    history_db,
+                    raw_retention=float(os.getenv('HISTORY_RAW_RETENTION_HOURS', '24')) * 3600,
+                    minute_retention=float(os.getenv('HISTORY_MINUTE_RETENTION_DAYS', '14')) * 86400,
+                    hour_retention=float(os.getenv('HISTORY_HOUR_RETENTION_DAYS', '365')) * 86400
+                )
+                logger.info(f"Recording history to {history_db}")
+            except sqlite3.Error as e:
+                logger.warning(f"Could not open history database {history_db}: {e}")
         
         logger.info(f"Thermal exporter initialized for platform: {self.platform_info['model']}")
     
@@ -86,6 +164,64 @@ class RaspberryPiThermalExporter:
             registry=self.registry
         )
         
+        # Per-core metrics (sysfs/procfs)
+        self.core_freq_per_cpu = Gauge(
+            'rpi_cpu_core_frequency_hz',
+            'Current per-core CPU frequency in Hz (cpufreq scaling_cur_freq)',
+            ['cpu'],
+            registry=self.registry
+        )
+        
+        self.core_utilization = Gauge(
+            'rpi_cpu_core_utilization_ratio',
+            'Per-core CPU utilization over the last collection interval (0-1)',
+            ['cpu'],
+            registry=self.registry
+        )
+        
+        self.freq_transitions = Counter(
+            'rpi_cpu_frequency_transitions_total',
+            'cpufreq frequency transitions per core',
+            ['cpu'],
+            registry=self.registry
+        )
+        
+        # Per-service process accounting
+        self.process_cpu_seconds = Counter(
+            'rpi_process_cpu_seconds_total',
+            'CPU time (user + system) used by service processes',
+            ['service'],
+            registry=self.registry
+        )
+        
+        self.process_rss = Gauge(
+            'rpi_process_resident_memory_bytes',
+            'Resident memory of service processes',
+            ['service'],
+            registry=self.registry
+        )
+        
+        self.process_io_bytes = Counter(
+            'rpi_process_io_bytes_total',
+            'Storage I/O bytes of service processes',
+            ['service', 'direction'],
+            registry=self.registry
+        )
+        
+        self.process_io_available = Gauge(
+            'rpi_process_io_available',
+            'Whether /proc/<pid>/io of the service processes is readable (0 = I/O not exported)',
+            ['service'],
+            registry=self.registry
+        )
+        
+        self.process_count = Gauge(
+            'rpi_process_count',
+            'Number of processes matched per service',
+            ['service'],
+            registry=self.registry
+        )
+        
         # N8N workflow correlation metrics
         self.workflow_thermal_correlation = Histogram(
             'rpi_workflow_thermal_correlation_seconds',
@@ -117,6 +253,87 @@ class RaspberryPiThermalExporter:
             ['zone'],
             registry=self.registry
         )
+        
+        # Thermal forecast metrics
+        self.predicted_temp = Gauge(
+            'rpi_cpu_temperature_predicted_celsius',
+            'Predicted CPU temperature from the online heating model',
+            ['horizon'],
+            registry=self.registry
+        )
+        
+        self.steady_state_temp = Gauge(
+            'rpi_cpu_temperature_steady_state_celsius',
+            'Temperature the CPU is converging to under the current load',
+            registry=self.registry
+        )
+        
+        self.seconds_to_soft_limit = Gauge(
+            'rpi_thermal_seconds_to_soft_limit',
+            'Estimated seconds until the soft temperature limit is reached (+Inf if not heading there)',
+            registry=self.registry
+        )
+        
+        # Admission control
+        self.admission_decisions = Counter(
+            'rpi_admission_decisions_total',
+            'Admission decisions returned by /admit',
+            ['decision'],
+            registry=self.registry
+        )
+        
+        # In-process alert rules
+        self.alert_state = Gauge(
+            'rpi_alert_state',
+            'Exporter alert rule state (0=inactive, 1=pending, 2=firing)',
+            ['alert'],
+            registry=self.registry
+        )
+        
+        self.alert_notifications = Counter(
+            'rpi_alert_notifications_total',
+            'Alert notifications sent to the N8N webhook',
+            ['alert', 'status'],
+            registry=self.registry
+        )
+        
+        # Exporter self-metrics
+        self.collect_interval = Gauge(
+            'rpi_exporter_collect_interval_seconds',
+            'Current effective metrics collection interval',
+            registry=self.registry
+        )
+        
+        self.series_evicted = Counter(
+            'rpi_exporter_series_evicted_total',
+            'Label sets removed after not being updated within SERIES_TTL_SECONDS',
+            ['metric'],
+            registry=self.registry
+        )
+        
+        self.series_overflowed = Counter(
+            'rpi_exporter_series_overflow_total',
+            'Updates folded into the "other" series because the metric hit its series limit',
+            ['metric'],
+            registry=self.registry
+        )
+        
+        # Families labelled by open-ended values: cap series count and drop stale ones
+        series_ttl = float(os.getenv('SERIES_TTL_SECONDS', '3600'))
+        self.workflow_thermal_correlation = BoundedSeries(
+            self.workflow_thermal_correlation, ['workflow_id', 'step'],
+            max_series=int(os.getenv('WORKFLOW_SERIES_LIMIT', '50')), ttl=series_ttl,
+            evicted=self.series_evicted, overflowed=self.series_overflowed
+        )
+        self.thermal_zone_temp = BoundedSeries(
+            self.thermal_zone_temp, ['zone'], max_series=16, ttl=series_ttl,
+            evicted=self.series_evicted, overflowed=self.series_overflowed
+        )
+        self.throttling_active = BoundedSeries(
+            self.throttling_active, ['reason'], max_series=16, ttl=series_ttl,
+            evicted=self.series_evicted, overflowed=self.series_overflowed
+        )
+        self.bounded_series = [self.workflow_thermal_correlation, self.thermal_zone_temp, self.throttling_active]
     
     def detect_platform(self) -> Dict[str, str]:
         """Detect Raspberry Pi platform and capabilities"""
@@ -268,19 +485,11 @@ class RaspberryPiThermalExporter:
         """Get clock frequencies"""
         frequencies = {}
         
+        # Only exported clock domains are measured (each one is a vcgencmd fork);
+        # per-core CPU frequencies come from sysfs via CpuStatsReader
         freq_commands = {
             'arm': 'measure_clock arm',
-            'core': 'measure_clock core',
-            'h264': 'measure_clock h264',
-            'isp': 'measure_clock isp',
-            'v3d': 'measure_clock v3d',
-            'uart': 'measure_clock uart',
-            'pwm': 'measure_clock pwm',
-            'emmc': 'measure_clock emmc',
-            'pixel': 'measure_clock pixel',
-            'vec': 'measure_clock vec',
-            'hdmi': 'measure_clock hdmi',
-            'dpi': 'measure_clock dpi'
+            'core': 'measure_clock core'
         }
         
         for name, command in freq_commands.items():
@@ -318,53 +527,81 @@ class RaspberryPiThermalExporter:
         
         return memory_split
     
-    def send_thermal_alert(self, alert_type: str, message: str, temperature: float):
-        """Send thermal alert to N8N webhook"""
+    def send_thermal_alert(self, notification: Dict, temperature: Optional[float]):
+        """Send thermal alert to N8N webhook (in the background, so sampling never waits on n8n)"""
+        self.alert_notifications.labels(alert=notification['alert'], status=notification['status']).inc()
+        logger.info(f"Alert {notification['alert']} {notification['status']}: {notification['message']}")
+        
         if not self.n8n_webhook_url:
             return
         
-        # Rate limiting: don't send same alert type more than once per 5 minutes
-        current_time = time.time()
-        if alert_type in self.last_alert_time:
-            if current_time - self.last_alert_time[alert_type] < 300:  # 5 minutes
-                return
-        
-        self.last_alert_time[alert_type] = current_time
-        
         payload = {
-            'alert_type': alert_type,
-            'message': message,
-            'temperature': temperature,
+            **notification,
+            'temperature': temperature or 0,
             'timestamp': datetime.utcnow().isoformat(),
             'hostname': os.uname().nodename
         }
-        
+        threading.Thread(target=self.post_alert, args=(payload,), daemon=True).start()
+    
+    def post_alert(self, payload: Dict):
+        """POST an alert payload to the N8N webhook"""
         try:
             requests.post(
                 self.n8n_webhook_url,
                 json=payload,
                 timeout=5
             )
-            logger.info(f"Sent thermal alert: {alert_type}")
+            logger.info(f"Sent thermal alert: {payload['alert_type']}")
         except Exception as e:
             logger.warning(f"Failed to send thermal alert: {e}")
     
+    def evaluate_alerts(self):
+        """Evaluate the alert rules against the latest readings"""
+        temp = self.last_temperature
+        throttled = self.last_throttled_hex
+        ready = temp is not None and self.forecaster.ready()
+        
+        signals = {
+            'temperature': temp,
+            'temperature_rate': self.last_temperature_rate,
+            'predicted_temperature': self.forecaster.predict(max(ThermalForecaster.HORIZONS)) if ready else None,
+            'seconds_to_soft_limit': self.forecaster.seconds_to_limit() if ready else None,
+            'throttled': None if throttled is None else int(bool(throttled & AdmissionController.THROTTLED_NOW)),
+            'under_voltage': None if throttled is None else int(bool(throttled & AdmissionController.UNDER_VOLTAGE_NOW)),
+            'load': self.last_load_average
+        }
+        
+        for notification in self.alert_engine.evaluate(signals):
+            self.send_thermal_alert(notification, temp)
+        
+        for name, state in self.alert_engine.states.items():
+            self.alert_state.labels(alert=name).set(AlertEngine.STATE_VALUES[state['state']])
+    
     def collect_and_update_metrics(self):
         """Collect all metrics and update Prometheus gauges"""
         
         # Temperature
         temp = self.get_temperature()
+        self.last_temperature = temp
+        self.last_temperature_rate = self.temperature_trend.update(temp, time.time())
         if temp is not None:
             self.cpu_temp.set(temp)
             
-            # Send alerts based on temperature
-            if temp > 85:
-                self.send_thermal_alert('critical', f'Critical temperature: {temp}°C', temp)
-            elif temp > 80:
-                self.send_thermal_alert('warning', f'High temperature: {temp}°C', temp)
+            # Forecast (fitted to the shared rate, not a rate of its own)
+            self.forecaster.update(temp, self.last_temperature_rate, self.temperature_trend.midpoint)
+            if self.forecaster.ready():
+                for horizon in ThermalForecaster.HORIZONS:
+                    self.predicted_temp.labels(horizon=f'{horizon}s').set(self.forecaster.predict(horizon))
+                steady_state = self.forecaster.steady_state()
+                if steady_state is not None:
+                    self.steady_state_temp.set(steady_state)
+                
+                time_to_limit = self.forecaster.seconds_to_limit()
+                self.seconds_to_soft_limit.set(time_to_limit)
         
         # Throttling
         throttled_hex, throttling_flags = self.get_throttling_status()
+        self.last_throttled_hex = throttled_hex
         if throttled_hex is not None:
             self.throttling_status.set(throttled_hex)
             
@@ -374,13 +611,6 @@ class RaspberryPiThermalExporter:
                     # Currently active throttling
                     reason_clean = reason.replace('_now', '')
                     self.throttling_active.labels(reason=reason_clean).set(1 if active else 0)
-                    
-                    if active:
-                        self.send_thermal_alert(
-                            'throttling', 
-                            f'Throttling active: {reason_clean}', 
-                            temp or 0
-                        )
                 elif reason.endswith('_occurred'):
                     # Throttling occurred since boot (increment counter only once)
                     reason_clean = reason.replace('_occurred', '')
@@ -391,16 +621,46 @@ class RaspberryPiThermalExporter:
         
         # Voltages
         voltages = self.get_voltages()
+        self.last_core_voltage = voltages.get('core')
         if voltages.get('core'):
             self.core_voltage.set(voltages['core'])
         
         # Frequencies
         frequencies = self.get_frequencies()
+        self.last_frequencies = frequencies
         if frequencies.get('arm'):
             self.arm_freq.set(frequencies['arm'])
         if frequencies.get('core'):
             self.core_freq.set(frequencies['core'])
         
+        # Per-core frequency, utilization and cpufreq transitions (one pass, no forks)
+        for cpu, stats in self.cpu_stats.read().items():
+            if stats.get('frequency_hz') is not None:
+                self.core_freq_per_cpu.labels(cpu=cpu).set(stats['frequency_hz'])
+            if stats.get('utilization') is not None:
+                self.core_utilization.labels(cpu=cpu).set(stats['utilization'])
+            if stats.get('transitions_delta'):
+                self.freq_transitions.labels(cpu=cpu).inc(stats['transitions_delta'])
+        
+        # Per-service CPU, memory and I/O (cached PID table)
+        for service, usage in self.process_accounting.sample().items():
+            self.process_count.labels(service=service).set(usage['processes'])
+            self.process_rss.labels(service=service).set(usage['rss_bytes'])
+            if usage['cpu_seconds'] > 0:
+                self.process_cpu_seconds.labels(service=service).inc(usage['cpu_seconds'])
+            # None when /proc/<pid>/io is unreadable (see ProcessAccountant)
+            self.process_io_available.labels(service=service).set(1 if usage['io_available'] else 0)
+            if usage['read_bytes']:
+                self.process_io_bytes.labels(service=service, direction='read').inc(usage['read_bytes'])
+            if usage['write_bytes']:
+                self.process_io_bytes.labels(service=service, direction='write').inc(usage['write_bytes'])
+        
+        # Load average (cheap syscall, shared by sampling and admission)
+        self.last_load_average = os.getloadavg()[0]
+        
+        # Alert rules (every sample, ahead of the Prometheus evaluation cycle)
+        self.evaluate_alerts()
+        
         # Memory split
         memory_split = self.get_memory_split()
         for mem_type, size in memory_split.items():
@@ -425,6 +685,1209 @@ class RaspberryPiThermalExporter:
                         self.thermal_zone_temp.labels(zone=zone).set(temp_celsius)
             except:
                 pass
+    
+    def mark_collected(self):
+        """Record a completed collection (invalidates cached /metrics payloads)"""
+        for series in self.bounded_series:
+            series.evict()
+        self.generation += 1
+        self.last_collection_time = time.time()
+        self.admission.update(self)
+        
+        if self.history and self.last_temperature is not None:
+            try:
+                self.history.record({
+                    'temperature': self.last_temperature,
+                    'throttled': self.last_throttled_hex,
+                    'load_average': self.last_load_average,
+                    'core_voltage': self.last_core_voltage,
+                    'arm_freq_hz': self.last_frequencies.get('arm')
+                }, self.last_collection_time)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to record history: {e}")
+        
+        if self.snapshot:
+            state = self.admission.state
+            self.snapshot.publish({
+                'timestamp': self.last_collection_time,
+                'temperature': self.last_temperature,
+                'predicted_temperature': state['predicted'],
+                'seconds_to_soft_limit': state['seconds_to_limit'],
+                'load_average': self.last_load_average,
+                'core_voltage': self.last_core_voltage,
+                'throttled': self.last_throttled_hex,
+                'arm_freq_hz': self.last_frequencies.get('arm'),
+                'core_freq_hz': self.last_frequencies.get('core'),
+                'alerts_firing': sum(1 for alert in self.alert_engine.states.values() if alert['state'] == 'firing'),
+                'generation': self.generation
+            })
+
+class BoundedSeries:
+    """
+    Series limit and TTL eviction for one labelled metric family
+    
+    Wraps the metric's labels() so call sites stay unchanged. Label sets beyond
+    `max_series` are folded into a single series with every label set to "other",
+    and label sets not updated within `ttl` seconds are removed from the registry.
+    """
+    
+    OVERFLOW_VALUE = 'other'
+    
+    def __init__(self, metric, labelnames: List[str], max_series: int, ttl: float,
+                 evicted: Counter, overflowed: Counter):
+        self.metric = metric
+        self.name = metric.describe()[0].name
+        self.labelnames = labelnames
+        self.max_series = max(1, max_series)
+        self.ttl = ttl
+        self.evicted = evicted
+        self.overflowed = overflowed
+        self.overflow_key = tuple(self.OVERFLOW_VALUE for _ in labelnames)
+        self.last_update = {}  # label values tuple -> last update time
+    
+    def labels(self, *values, **labels):
+        """Return the child for these labels (or the overflow child) and mark it fresh"""
+        if labels:
+            values = tuple(str(labels[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        
+        if values not in self.last_update and values != self.overflow_key:
+            tracked = len(self.last_update) - (self.overflow_key in self.last_update)
+            if tracked >= self.max_series:
+                self.overflowed.labels(metric=self.name).inc()
+                values = self.overflow_key
+        
+        self.last_update[values] = time.time()
+        return self.metric.labels(*values)
+    
+    def evict(self, now: Optional[float] = None) -> int:
+        """Remove label sets not updated within the TTL"""
+        if self.ttl <= 0:
+            return 0
+        
+        cutoff = (now if now is not None else time.time()) - self.ttl
+        stale = [values for values, updated in self.last_update.items() if updated < cutoff]
+        for values in stale:
+            del self.last_update[values]
+            try:
+                self.metric.remove(*values)
+            except KeyError:
+                pass
+        
+        if stale:
+            self.evicted.labels(metric=self.name).inc(len(stale))
+        return len(stale)
+
+class CpuStatsReader:
+    """
+    Per-core CPU frequency, utilization and cpufreq transitions from sysfs/procfs
+    
+    Files are opened once and re-read with pread, so a collection costs a few
+    syscalls instead of opening files or forking vcgencmd.
+    """
+    
+    PROC_STAT_READ_SIZE = 16384  # cpu lines come first; the long intr line may be cut
+    
+    def __init__(self, sysfs_root: str = '/sys', procfs_root: str = '/proc'):
+        self.cpu_files = {}  # cpu label -> {'freq': fd, 'trans': fd}
+        self.proc_stat_fd = self._open(f"{procfs_root}/stat")
+        self.last_cpu_times = {}  # cpu label -> (busy, total)
+        self.last_transitions = {}
+        
+        cpu_base = f"{sysfs_root}/devices/system/cpu"
+        try:
+            cpus = sorted(
+                (d for d in os.listdir(cpu_base) if re.fullmatch(r'cpu\d+', d)),
+                key=lambda d: int(d[3:])
+            )
+        except OSError:
+            cpus = []
+        
+        for cpu in cpus:
+            self.cpu_files[cpu] = {
+                'freq': self._open(f"{cpu_base}/{cpu}/cpufreq/scaling_cur_freq"),
+                'trans': self._open(f"{cpu_base}/{cpu}/cpufreq/stats/total_trans")
+            }
+        
+        logger.info(f"Per-core CPU stats: {len(self.cpu_files)} cores, "
+                    f"cpufreq {'available' if any(f['freq'] is not None for f in self.cpu_files.values()) else 'unavailable'}")
+    
+    @staticmethod
+    def _open(path: str) -> Optional[int]:
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _read_int(fd: Optional[int]) -> Optional[int]:
+        if fd is None:
+            return None
+        try:
+            return int(os.pread(fd, 64, 0).strip())
+        except (OSError, ValueError):
+            return None
+    
+    def _read_cpu_times(self) -> Dict[str, Tuple[int, int]]:
+        """(busy, total) jiffies per cpu line in /proc/stat ('cpu' is the aggregate)"""
+        if self.proc_stat_fd is None:
+            return {}
+        try:
+            text = os.pread(self.proc_stat_fd, self.PROC_STAT_READ_SIZE, 0).decode('ascii', 'replace')
+        except OSError:
+            return {}
+        
+        times = {}
+        for line in text.splitlines():
+            if not line.startswith('cpu'):
+                break
+            parts = line.split()
+            values = [int(v) for v in parts[1:9]]  # user nice system idle iowait irq softirq steal
+            total = sum(values)
+            idle = values[3] + values[4]
+            times['all' if parts[0] == 'cpu' else parts[0]] = (total - idle, total)
+        return times
+    
+    def read(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Read all cores in one pass; utilization is relative to the previous read"""
+        stats = {}
+        
+        for cpu, (busy, total) in self._read_cpu_times().items():
+            utilization = None
+            previous = self.last_cpu_times.get(cpu)
+            if previous and total > previous[1]:
+                utilization = round((busy - previous[0]) / (total - previous[1]), 4)
+            self.last_cpu_times[cpu] = (busy, total)
+            stats[cpu] = {'utilization': utilization}
+        
+        for cpu, fds in self.cpu_files.items():
+            entry = stats.setdefault(cpu, {'utilization': None})
+            
+            freq_khz = self._read_int(fds['freq'])
+            entry['frequency_hz'] = freq_khz * 1000 if freq_khz is not None else None
+            
+            transitions = self._read_int(fds['trans'])
+            previous = self.last_transitions.get(cpu)
+            entry['transitions_delta'] = (
+                transitions - previous if transitions is not None and previous is not None
+                and transitions >= previous else 0
+            )
+            if transitions is not None:
+                self.last_transitions[cpu] = transitions
+        
+        return stats
+
+class ProcessAccountant:
+    """
+    CPU, RSS and I/O per named service from /proc/<pid>/{stat,status,io}
+    
+    Matching PIDs are kept in a table with their files held open. /proc is only
+    listed again when a tracked process exits, or when new PIDs were created
+    (last PID in /proc/loadavg moved) and the rescan interval has passed.
+    Rescans only classify PIDs that are new or whose comm changed (exec), so
+    steady state costs a few preads per tracked process.
+    
+    A pattern matches the process name (comm), the executable name or, for
+    interpreters such as node, the script name, all as prefixes. Arguments are
+    not matched, so `psql -d n8n` is not billed to n8n.
+    
+    /proc/<pid>/io of another user's process is not readable by the exporter's
+    user. Services whose io cannot be read are logged once and report no I/O
+    (None, io_available False) rather than zero.
+    """
+    
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+    # Processes named after their interpreter; the script name identifies them
+    INTERPRETERS = ('node', 'python', 'java')
+    
+    def __init__(self, services: Dict[str, str], procfs_root: str = '/proc', rescan_interval: float = 60):
+        self.services = services  # service -> pattern (comm, executable or script name prefix)
+        self.procfs_root = procfs_root
+        self.rescan_interval = rescan_interval
+        self.tracked = {}  # pid -> {'service', 'comm', 'stat', 'status', 'io', 'cpu', 'read', 'write'}
+        self.seen_pids = {}  # pid -> comm it was classified with (matching or not)
+        self.last_scan_time = 0
+        self.last_created_pid = None
+        self.initialized = False
+        self.io_unreadable = set()  # Services already warned about unreadable /proc/<pid>/io
+        self.loadavg_fd = CpuStatsReader._open(f"{procfs_root}/loadavg")
+    
+    @staticmethod
+    def parse_services(spec: str) -> Dict[str, str]:
+        """Parse 'service=pattern,...' into a mapping"""
+        services = {}
+        for entry in spec.split(','):
+            if '=' in entry:
+                name, pattern = entry.split('=', 1)
+                if name.strip() and pattern.strip():
+                    services[name.strip()] = pattern.strip()
+        return services
+    
+    def _read(self, fd: Optional[int], size: int = 4096) -> Optional[str]:
+        if fd is None:
+            return None
+        try:
+            return os.pread(fd, size, 0).decode('utf-8', 'replace')
+        except OSError:
+            return None
+    
+    def _read_comm(self, pid: str) -> Optional[str]:
+        try:
+            with open(f"{self.procfs_root}/{pid}/comm", 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    def _classify(self, pid: str, comm: str) -> Optional[str]:
+        """Return the service a PID belongs to (None if it matches nothing)"""
+        base = f"{self.procfs_root}/{pid}"
+        try:
+            with open(f"{base}/cmdline", 'rb') as f:
+                argv = f.read(4096).decode('utf-8', 'replace').split('\0')
+        except OSError:
+            return None
+        
+        if not argv[0]:
+            return None  # Kernel thread
+        names = [comm, os.path.basename(argv[0])]
+        try:
+            names.append(os.path.basename(os.readlink(f"{base}/exe")))
+        except OSError:
+            pass  # Other users' processes: comm and argv[0] still apply
+        if len(argv) > 1 and any(name.startswith(self.INTERPRETERS) for name in names):
+            names.append(os.path.basename(argv[1]))
+        
+        for service, pattern in self.services.items():
+            if any(name.startswith(pattern) for name in names):
+                return service
+        return None
+    
+    def _last_created_pid(self) -> Optional[str]:
+        text = self._read(self.loadavg_fd, 128)
+        return text.split()[-1] if text else None
+    
+    def _rescan(self):
+        try:
+            pids = [d for d in os.listdir(self.procfs_root) if d.isdigit()]
+        except OSError:
+            return
+        
+        current = set(pids)
+        self.seen_pids = {pid: comm for pid, comm in self.seen_pids.items() if pid in current}
+        
+        for pid in pids:
+            if pid in self.tracked:
+                continue  # comm checked on every sample
+            comm = self._read_comm(pid)
+            if comm is None or self.seen_pids.get(pid) == comm:
+                continue
+            self.seen_pids[pid] = comm
+            service = self._classify(pid, comm)
+            if service is None:
+                continue
+            
+            base = f"{self.procfs_root}/{pid}"
+            entry = {
+                'service': service,
+                'comm': comm,
+                'stat': CpuStatsReader._open(f"{base}/stat"),
+                'status': CpuStatsReader._open(f"{base}/status"),
+                'io': CpuStatsReader._open(f"{base}/io"),
+                'cpu': None, 'read': None, 'write': None
+            }
+            self.tracked[pid] = entry
+            # Processes found after startup are new: count their usage from zero
+            if self.initialized:
+                entry['cpu'], entry['read'], entry['write'] = 0.0, 0, 0
+        
+        self.last_scan_time = time.time()
+        self.initialized = True
+    
+    def _drop(self, pid: str):
+        entry = self.tracked.pop(pid)
+        for key in ('stat', 'status', 'io'):
+            if entry[key] is not None:
+                try:
+                    os.close(entry[key])
+                except OSError:
+                    pass
+    
+    def sample(self) -> Dict[str, Dict[str, float]]:
+        """Per-service usage: process count, RSS and CPU/IO deltas since the last sample"""
+        if not self.services:
+            return {}
+        
+        created = self._last_created_pid()
+        churn = created != self.last_created_pid
+        self.last_created_pid = created
+        if not self.initialized or (churn and time.time() - self.last_scan_time >= self.rescan_interval):
+            self._rescan()
+        
+        usage = {service: {'processes': 0, 'rss_bytes': 0, 'cpu_seconds': 0.0,
+                           'read_bytes': None, 'write_bytes': None, 'io_available': False}
+                 for service in self.services}
+        exited = []
+        
+        for pid, entry in self.tracked.items():
+            stat = self._read(entry['stat'])
+            if not stat:
+                exited.append(pid)
+                continue
+            
+            if stat[stat.index('(') + 1:stat.rindex(')')] != entry['comm']:
+                # exec'd into another program: classify it again on the rescan
+                self.seen_pids.pop(pid, None)
+                exited.append(pid)
+                continue
+            
+            fields = stat[stat.rindex(')') + 2:].split()
+            cpu = (int(fields[11]) + int(fields[12])) / self.CLOCK_TICKS  # utime + stime
+            
+            rss = 0
+            match = re.search(r'VmRSS:\s+(\d+) kB', self._read(entry['status']) or '')
+            if match:
+                rss = int(match.group(1)) * 1024
+            
+            io = self._read(entry['io'])
+            if io is None and entry['service'] not in self.io_unreadable:
+                self.io_unreadable.add(entry['service'])
+                logger.warning(f"Cannot read {self.procfs_root}/{pid}/io for service {entry['service']}; "
+                               f"its I/O is reported as unavailable")
+            read_match = re.search(r'^read_bytes: (\d+)', io or '', re.M)
+            write_match = re.search(r'^write_bytes: (\d+)', io or '', re.M)
+            read_bytes = int(read_match.group(1)) if read_match else None
+            write_bytes = int(write_match.group(1)) if write_match else None
+            
+            service = usage[entry['service']]
+            service['processes'] += 1
+            service['rss_bytes'] += rss
+            service['io_available'] = service['io_available'] or io is not None
+            if entry['cpu'] is not None:
+                service['cpu_seconds'] += max(0.0, cpu - entry['cpu'])
+            if entry['read'] is not None and read_bytes is not None:
+                service['read_bytes'] = (service['read_bytes'] or 0) + max(0, read_bytes - entry['read'])
+            if entry['write'] is not None and write_bytes is not None:
+                service['write_bytes'] = (service['write_bytes'] or 0) + max(0, write_bytes - entry['write'])
+            entry['cpu'], entry['read'], entry['write'] = cpu, read_bytes, write_bytes
+        
+        for pid in exited:
+            self._drop(pid)
+        # A tracked process exited or exec'd: its replacement may already be running
+        if exited:
+            self._rescan()
+        
+        return usage
+
+class TemperatureTrend:
+    """
+    Temperature rate of change in °C/min over a sliding window
+    
+    Computed once per collection and shared by the alert rules
+    (temperature_rate), the forecaster and the adaptive sampler, so they
+    never disagree about how fast the CPU is heating.
+    """
+    
+    def __init__(self, window: float = 60):
+        self.window = window
+        self.samples = deque()  # (time, temperature) within window
+        self.rate = None
+        self.midpoint = None  # Mean of the window's first and last temperature
+    
+    def update(self, temperature: Optional[float], now: float) -> Optional[float]:
+        """Add a sample and return the rate (None without a reading or a second sample)"""
+        self.rate = self.midpoint = None
+        if temperature is None:
+            return None
+        
+        self.samples.append((now, temperature))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+        
+        start_time, start_temp = self.samples[0]
+        if now > start_time:
+            self.rate = (temperature - start_temp) / (now - start_time) * 60
+            self.midpoint = (temperature + start_temp) / 2
+        return self.rate
+
+class ThermalForecaster:
+    """
+    Online first-order (RC / Newton) heating model: dT/dt = c0 + c1 * (T - soft_limit)
+    
+    Coefficients are fitted by recursive least squares with a forgetting factor,
+    so each sample costs O(1) and the fit follows load changes within a few samples.
+    With c1 < 0 the temperature converges exponentially to T_ss = soft_limit - c0 / c1.
+    dT/dt is the TemperatureTrend rate, taken at the midpoint temperature of its window.
+    """
+    
+    HORIZONS = (30, 120)
+    MIN_SAMPLES = 3
+    MAX_COVARIANCE_TRACE = 1e4  # Prevents covariance wind-up while temperature is flat
+    
+    def __init__(self, soft_limit: float = 80.0, forgetting_factor: float = 0.9):
+        self.soft_limit = soft_limit
+        self.forgetting_factor = forgetting_factor
+        self.theta = [0.0, 0.0]  # c0 (°C/s at the soft limit), c1 (1/s)
+        self.covariance = [[1000.0, 0.0], [0.0, 1000.0]]
+        self.samples = 0
+        self.last_temp = None
+    
+    def update(self, temperature: float, rate: Optional[float], midpoint: Optional[float]):
+        """Feed one sample: current temperature and the shared rate (°C/min) at midpoint"""
+        self.last_temp = temperature
+        if rate is None or midpoint is None:
+            return
+        
+        y = rate / 60
+        x = (1.0, midpoint - self.soft_limit)
+        
+        P = self.covariance
+        lam = self.forgetting_factor
+        Px = (P[0][0] * x[0] + P[0][1] * x[1], P[1][0] * x[0] + P[1][1] * x[1])
+        denom = lam + x[0] * Px[0] + x[1] * Px[1]
+        gain = (Px[0] / denom, Px[1] / denom)
+        error = y - (self.theta[0] * x[0] + self.theta[1] * x[1])
+        
+        self.theta[0] += gain[0] * error
+        self.theta[1] += gain[1] * error
+        
+        scale = lam if P[0][0] + P[1][1] < self.MAX_COVARIANCE_TRACE else 1.0
+        self.covariance = [
+            [(P[0][0] - gain[0] * Px[0]) / scale, (P[0][1] - gain[0] * Px[1]) / scale],
+            [(P[1][0] - gain[1] * Px[0]) / scale, (P[1][1] - gain[1] * Px[1]) / scale]
+        ]
+        self.samples += 1
+    
+    def ready(self) -> bool:
+        return self.samples >= self.MIN_SAMPLES
+    
+    def _converging(self) -> bool:
+        return self.theta[1] < -1e-6
+    
+    def steady_state(self) -> Optional[float]:
+        """Temperature the model converges to, if it converges"""
+        if not self._converging():
+            return None
+        return self.soft_limit - self.theta[0] / self.theta[1]
+    
+    def predict(self, horizon: float) -> float:
+        """Predicted temperature horizon seconds after the last sample"""
+        c0, c1 = self.theta
+        if self._converging():
+            t_ss = self.soft_limit - c0 / c1
+            return t_ss + (self.last_temp - t_ss) * math.exp(c1 * horizon)
+        # No stable fit yet: extrapolate the current slope
+        return self.last_temp + (c0 + c1 * (self.last_temp - self.soft_limit)) * horizon
+    
+    def seconds_to_limit(self) -> float:
+        """Seconds until the soft limit is reached (0 if above it, +Inf if never)"""
+        if self.last_temp >= self.soft_limit:
+            return 0.0
+        
+        c0, c1 = self.theta
+        if self._converging():
+            t_ss = self.soft_limit - c0 / c1
+            if t_ss <= self.soft_limit:
+                return math.inf
+            return math.log((self.soft_limit - t_ss) / (self.last_temp - t_ss)) / c1
+        
+        slope = c0 + c1 * (self.last_temp - self.soft_limit)
+        if slope <= 0:
+            return math.inf
+        return (self.soft_limit - self.last_temp) / slope
+
+class AlertEngine:
+    """
+    Declarative alert rules evaluated in-process on every sample
+    
+    Each rule watches one signal and moves inactive -> pending -> firing once its
+    threshold has held for `for`. A firing alert resolves only when the value is
+    back across the `clear` level (hysteresis), re-notifies every `repeat` and
+    raises its severity along `escalate`, so notifications neither flap around a
+    threshold nor get swallowed while a condition gets worse.
+    """
+    
+    SIGNALS = ('temperature', 'temperature_rate', 'predicted_temperature',
+               'seconds_to_soft_limit', 'throttled', 'under_voltage', 'load')
+    STATE_VALUES = {'inactive': 0, 'pending': 1, 'firing': 2}
+    
+    # Used when no rules file is available (matches the previous hard-coded alerts)
+    DEFAULT_RULES = [
+        {'alert': 'HighTemperature', 'signal': 'temperature', 'above': 80, 'clear': 77,
+         'repeat': '5m', 'alert_type': 'warning', 'severity': 'warning',
+         'summary': 'High temperature: {value}°C'},
+        {'alert': 'CriticalTemperature', 'signal': 'temperature', 'above': 85, 'clear': 82,
+         'repeat': '5m', 'alert_type': 'critical', 'severity': 'critical',
+         'summary': 'Critical temperature: {value}°C'},
+        {'alert': 'ThrottlingActive', 'signal': 'throttled', 'above': 0,
+         'repeat': '5m', 'alert_type': 'throttling', 'severity': 'warning',
+         'summary': 'Throttling active'},
+    ]
+    
+    def __init__(self, rules: List[Dict], rate_window: float = 60):
+        self.rules = [self.parse_rule(rule) for rule in rules]
+        self.rate_window = rate_window  # Window of the exporter's TemperatureTrend
+        self.states = {
+            rule['alert']: {'state': 'inactive', 'since': None, 'fired_at': None,
+                            'notified_at': None, 'stage': 0, 'severity': rule['severity']}
+            for rule in self.rules
+        }
+    
+    @classmethod
+    def from_file(cls, path: Optional[str]) -> 'AlertEngine':
+        """Load rules from a YAML file, falling back to the built-in rules"""
+        if path and os.path.exists(path):
+            # A broken rules file must not take the exporter down
+            try:
+                with open(path, 'r') as f:
+                    config = yaml.safe_load(f) or {}
+                engine = cls(config.get('rules') or [], cls.parse_duration(config.get('rate_window', 60)))
+                logger.info(f"Loaded {len(engine.rules)} alert rules from {path}")
+                return engine
+            except (OSError, yaml.YAMLError, ValueError, TypeError, AttributeError) as e:
+                logger.error(f"Invalid alert rules file {path}, using built-in alert rules: {e}")
+                return cls(cls.DEFAULT_RULES)
+        
+        logger.info("No alert rules file found, using built-in alert rules")
+        return cls(cls.DEFAULT_RULES)
+    
+    @staticmethod
+    def parse_duration(value) -> float:
+        """Parse '30s', '5m', '1h' or a plain number of seconds"""
+        if value is None:
+            return 0.0
+        if isinstance(value, (int, float)):
+            return float(value)
+        match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*', str(value))
+        if not match:
+            raise ValueError(f"Invalid duration: {value}")
+        scale = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[match.group(2) or 's']
+        return float(match.group(1)) * scale
+    
+    @classmethod
+    def parse_rule(cls, rule: Dict) -> Dict:
+        """Validate a rule definition and normalize durations and thresholds"""
+        name = rule.get('alert')
+        if not name:
+            raise ValueError(f"Alert rule without a name: {rule}")
+        if rule.get('signal') not in cls.SIGNALS:
+            raise ValueError(f"Alert rule {name}: unknown signal {rule.get('signal')!r}")
+        if ('above' in rule) == ('below' in rule):
+            raise ValueError(f"Alert rule {name}: set exactly one of 'above' or 'below'")
+        
+        direction = 'above' if 'above' in rule else 'below'
+        threshold = float(rule[direction])
+        clear = float(rule.get('clear', threshold))
+        if (direction == 'above' and clear > threshold) or (direction == 'below' and clear < threshold):
+            raise ValueError(f"Alert rule {name}: 'clear' must be on the inactive side of the threshold")
+        
+        severity = rule.get('severity', 'warning')
+        return {
+            'alert': name,
+            'signal': rule['signal'],
+            'direction': direction,
+            'threshold': threshold,
+            'clear': clear,
+            'for': cls.parse_duration(rule.get('for')),
+            'repeat': cls.parse_duration(rule.get('repeat')),
+            'escalate': sorted(
+                ({'after': cls.parse_duration(step.get('after')), 'severity': step['severity']}
+                 for step in rule.get('escalate') or []),
+                key=lambda step: step['after']
+            ),
+            'alert_type': rule.get('alert_type', name),
+            'severity': severity,
+            'summary': rule.get('summary', f"{name}: {rule['signal']}={{value}}"),
+            'notify_resolved': bool(rule.get('notify_resolved', True))
+        }
+    
+    def evaluate(self, signals: Dict[str, Optional[float]], now: Optional[float] = None) -> List[Dict]:
+        """Advance every rule with the latest sample and return notifications to send"""
+        now = now if now is not None else time.time()
+        
+        notifications = []
+        for rule in self.rules:
+            state = self.states[rule['alert']]
+            value = signals.get(rule['signal'])
+            
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                # No reading: never start an alert, but keep a firing one until it clears
+                if state['state'] == 'pending':
+                    state.update(state='inactive', since=None)
+                continue
+            
+            if rule['direction'] == 'above':
+                breached = value > rule['threshold']
+                cleared = value <= rule['clear']
+            else:
+                breached = value < rule['threshold']
+                cleared = value >= rule['clear']
+            
+            if state['state'] == 'firing':
+                if cleared:
+                    if rule['notify_resolved']:
+                        notifications.append(self._notification(rule, state, 'resolved', value, signals))
+                    state.update(state='inactive', since=None, fired_at=None, notified_at=None,
+                                 stage=0, severity=rule['severity'])
+                    continue
+                
+                firing_for = now - state['fired_at']
+                stage = state['stage']
+                while stage < len(rule['escalate']) and firing_for >= rule['escalate'][stage]['after']:
+                    stage += 1
+                if stage > state['stage']:
+                    state.update(stage=stage, severity=rule['escalate'][stage - 1]['severity'], notified_at=now)
+                    notifications.append(self._notification(rule, state, 'escalated', value, signals))
+                elif rule['repeat'] and now - state['notified_at'] >= rule['repeat']:
+                    state['notified_at'] = now
+                    notifications.append(self._notification(rule, state, 'firing', value, signals))
+                continue
+            
+            if not breached:
+                state.update(state='inactive', since=None)
+                continue
+            
+            if state['state'] == 'inactive':
+                state.update(state='pending', since=now)
+            if now - state['since'] >= rule['for']:
+                state.update(state='firing', fired_at=now, notified_at=now)
+                notifications.append(self._notification(rule, state, 'firing', value, signals))
+        
+        return notifications
+    
+    @staticmethod
+    def _notification(rule: Dict, state: Dict, status: str, value: float, signals: Dict) -> Dict:
+        """Build a webhook notification for a rule transition"""
+        value = round(value, 1) if math.isfinite(value) else value
+        fields = {name: round(v, 1) if isinstance(v, float) and math.isfinite(v) else v
+                  for name, v in signals.items()}
+        try:
+            message = rule['summary'].format(**{**fields, 'value': value})
+        except (KeyError, ValueError, TypeError, IndexError):
+            message = rule['summary']
+        if status == 'resolved':
+            message = f"Resolved: {message}"
+        elif status == 'escalated':
+            message = f"Escalated to {state['severity']}: {message}"
+        
+        return {
+            'alert': rule['alert'],
+            'alert_type': rule['alert_type'],
+            'severity': state['severity'],
+            'status': status,
+            'value': value if math.isfinite(value) else None,  # JSON has no Infinity
+            'message': message
+        }
+
+class AdmissionController:
+    """
+    Go / delay / reject decisions for expensive work (LLM inference) from cached state
+    
+    State is snapshotted once per collection; answering a request is only a few
+    comparisons, so /admit never triggers sensor probes.
+    """
+    
+    UNDER_VOLTAGE_NOW = 0x1
+    THROTTLED_NOW = 0x2 | 0x4 | 0x8  # Frequency capped, throttled, soft limit active
+    
+    def __init__(self, soft_limit: float, critical_limit: float, load_threshold: float,
+                 delay_seconds: int = 60, default_cost: float = 300):
+        self.soft_limit = soft_limit
+        self.critical_limit = critical_limit
+        self.load_threshold = load_threshold
+        self.delay_seconds = delay_seconds
+        self.default_cost = default_cost  # Expected duration of the admitted work in seconds
+        self.state = None
+    
+    def update(self, exporter: 'RaspberryPiThermalExporter'):
+        """Snapshot the exporter's latest readings (called after each collection)"""
+        forecaster = exporter.forecaster
+        ready = exporter.last_temperature is not None and forecaster.ready()
+        self.state = {
+            'temperature': exporter.last_temperature,
+            'predicted': forecaster.predict(max(ThermalForecaster.HORIZONS)) if ready else None,
+            'seconds_to_limit': forecaster.seconds_to_limit() if ready else None,
+            'throttled': exporter.last_throttled_hex or 0,
+            'load': exporter.last_load_average,
+            'time': exporter.last_collection_time
+        }
+    
+    def decide(self, cost: Optional[float] = None) -> Dict:
+        """Decide whether work expected to take `cost` seconds should start now"""
+        cost = self.default_cost if cost is None else cost
+        state = self.state
+        
+        # Fail open: without readings the exporter must not block workflows
+        if not state or state['temperature'] is None:
+            return {'decision': 'go', 'reason': 'no thermal data'}
+        
+        temp = state['temperature']
+        ttl = state['seconds_to_limit']
+        result = {
+            'temperature': temp,
+            'predicted_temperature': round(state['predicted'], 1) if state['predicted'] is not None else None,
+            'seconds_to_soft_limit': round(ttl) if ttl is not None and ttl != math.inf else None,
+            'load_average': state['load'],
+            'age_seconds': round(time.time() - state['time'], 1)
+        }
+        
+        if state['throttled'] & self.UNDER_VOLTAGE_NOW:
+            return {'decision': 'reject', 'reason': 'under-voltage', **result}
+        if temp >= self.critical_limit:
+            return {'decision': 'reject', 'reason': f'critical temperature {temp}°C', **result}
+        if state['throttled'] & self.THROTTLED_NOW:
+            return {'decision': 'delay', 'delay_seconds': self.delay_seconds * 2,
+                    'reason': 'throttling active', **result}
+        if temp >= self.soft_limit:
+            return {'decision': 'delay', 'delay_seconds': self.delay_seconds,
+                    'reason': f'above soft limit ({temp}°C)', **result}
+        if ttl is not None and ttl < cost:
+            return {'decision': 'delay', 'delay_seconds': self.delay_seconds,
+                    'reason': f'soft limit expected in {ttl:.0f}s', **result}
+        if state['load'] is not None and state['load'] >= self.load_threshold:
+            return {'decision': 'delay', 'delay_seconds': self.delay_seconds,
+                    'reason': f'high load ({state["load"]:.2f})', **result}
+        
+        return {'decision': 'go', 'reason': 'ok', **result}
+
+class AdaptiveSampler:
+    """Chooses the next collection interval from temperature trend, throttling and load"""
+    
+    # Low bits of get_throttled are the "currently active" flags
+    THROTTLED_NOW_MASK = 0xF
+    
+    def __init__(self, min_interval: float, max_interval: float,
+                 temp_rise_threshold: float, load_threshold: float):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.temp_rise_threshold = temp_rise_threshold  # °C per minute
+        self.load_threshold = load_threshold  # 1-minute load average
+        self.interval = min_interval
+    
+    def next_interval(self, temp_rate: Optional[float], throttled_hex: Optional[int],
+                      load_average: Optional[float]) -> float:
+        """Sample fast while the system is busy, back off exponentially when it is quiet"""
+        busy = (
+            (temp_rate is not None and temp_rate >= self.temp_rise_threshold)
+            or bool((throttled_hex or 0) & self.THROTTLED_NOW_MASK)
+            or (load_average is not None and load_average >= self.load_threshold)
+        )
+        
+        if busy:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        
+        return self.interval
+
+class SnapshotWriter:
+    """
+    Latest readings in a fixed-layout memory-mapped file (seqlock versioning)
+    
+    Layout, little-endian: header <4sHHQ> (magic, layout version, payload size,
+    sequence) followed by FIELDS packed back to back. The sequence is odd while a
+    write is in progress; readers copy the payload and retry until they see the
+    same even sequence before and after. Missing readings are NaN (floats) or -1
+    (integers). scripts/lib/thermal-snapshot.py reads this layout, keep it in sync.
+    """
+    
+    MAGIC = b'RPTS'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHQ')
+    SEQUENCE_OFFSET = 8
+    FIELDS = (
+        ('timestamp', 'd'),
+        ('temperature', 'd'),
+        ('predicted_temperature', 'd'),
+        ('seconds_to_soft_limit', 'd'),
+        ('load_average', 'd'),
+        ('core_voltage', 'd'),
+        ('throttled', 'q'),
+        ('arm_freq_hz', 'q'),
+        ('core_freq_hz', 'q'),
+        ('alerts_firing', 'q'),
+        ('generation', 'q'),
+    )
+    PAYLOAD = struct.Struct('<' + ''.join(fmt for _, fmt in FIELDS))
+    
+    def __init__(self, path: str):
+        size = self.HEADER.size + self.PAYLOAD.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self.map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        
+        self.sequence = 0
+        self.HEADER.pack_into(self.map, 0, self.MAGIC, self.VERSION, self.PAYLOAD.size, self.sequence)
+    
+    def publish(self, values: Dict):
+        """Write a new snapshot (one writer; readers never block it)"""
+        payload = self.PAYLOAD.pack(*(
+            self._encode(values.get(name), fmt) for name, fmt in self.FIELDS
+        ))
+        
+        self.sequence += 1
+        struct.pack_into('<Q', self.map, self.SEQUENCE_OFFSET, self.sequence)
+        self.map[self.HEADER.size:] = payload
+        self.sequence += 1
+        struct.pack_into('<Q', self.map, self.SEQUENCE_OFFSET, self.sequence)
+    
+    @staticmethod
+    def _encode(value, fmt: str):
+        if fmt == 'd':
+            return math.nan if value is None else float(value)
+        return -1 if value is None else int(value)
+
+class HistoryStore:
+    """
+    Local thermal history: raw samples plus 1-minute and 1-hour rollups in SQLite
+    
+    Samples are buffered and appended once per minute in a single transaction
+    (easy on the SD card). Every closed minute and hour gets min/max/mean/p95
+    rows per metric, and each resolution is pruned to its own retention, so
+    months of thermal context fit in a few MB independent of Prometheus.
+    """
+    
+    METRICS = ('temperature', 'throttled', 'load_average', 'core_voltage', 'arm_freq_hz')
+    RESOLUTIONS = (60, 3600)
+    RESOLUTION_NAMES = {0: 'raw', 60: '1m', 3600: '1h'}
+    COLUMNS = ['time', 'min', 'max', 'mean', 'p95', 'count']
+    MAX_POINTS = 11000
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS samples (
+        ts REAL NOT NULL,
+        temperature REAL,
+        throttled INTEGER,
+        load_average REAL,
+        core_voltage REAL,
+        arm_freq_hz REAL
+    );
+    CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+    CREATE TABLE IF NOT EXISTS rollups (
+        resolution INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        metric TEXT NOT NULL,
+        min REAL, max REAL, mean REAL, p95 REAL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (resolution, bucket, metric)
+    ) WITHOUT ROWID;
+    """
+    
+    def __init__(self, path: str, raw_retention: float = 86400,
+                 minute_retention: float = 14 * 86400, hour_retention: float = 365 * 86400):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(self.SCHEMA)
+        self.retention = {0: raw_retention, 60: minute_retention, 3600: hour_retention}
+        self.pending_samples = []
+        self.pending_rollups = []
+        self.open_buckets = {resolution: (None, []) for resolution in self.RESOLUTIONS}
+        self.last_flush = time.time()
+        self.last_prune = 0
+        self._restore(self.last_flush)
+    
+    def _restore(self, now: float):
+        """Reload samples of the current hour so a restart doesn't lose its rollups"""
+        hour = int(now // 3600) * 3600
+        rows = self.conn.execute(
+            f"SELECT ts, {', '.join(self.METRICS)} FROM samples WHERE ts >= ? ORDER BY ts", (hour,)
+        ).fetchall()
+        for row in rows:
+            self._add_to_buckets(row)
+        self.pending_rollups.clear()
+    
+    def _add_to_buckets(self, row: Tuple):
+        for resolution in self.RESOLUTIONS:
+            bucket = int(row[0] // resolution) * resolution
+            start, rows = self.open_buckets[resolution]
+            if start is not None and bucket != start:
+                self.pending_rollups.extend(self._summarize(resolution, start, rows))
+                rows = []
+            rows.append(row)
+            self.open_buckets[resolution] = (bucket, rows)
+    
+    def _summarize(self, resolution: int, bucket: int, rows: List[Tuple]) -> List[Tuple]:
+        """Rollup rows (resolution, bucket, metric, min, max, mean, p95, count) for one bucket"""
+        summaries = []
+        for idx, metric in enumerate(self.METRICS, start=1):
+            values = sorted(row[idx] for row in rows if row[idx] is not None)
+            if values:
+                summaries.append((resolution, bucket, metric, *self._stats(values)))
+        return summaries
+    
+    @staticmethod
+    def _stats(values: List[float]) -> Tuple:
+        """min, max, mean, p95 (nearest rank) and count of sorted values"""
+        p95 = values[max(0, math.ceil(0.95 * len(values)) - 1)]
+        return values[0], values[-1], sum(values) / len(values), p95, len(values)
+    
+    def record(self, values: Dict, now: Optional[float] = None):
+        """Add one sample (called after every collection)"""
+        now = now if now is not None else time.time()
+        row = (now, *(values.get(metric) for metric in self.METRICS))
+        
+        with self.lock:
+            self.pending_samples.append(row)
+            self._add_to_buckets(row)
+            if self.pending_rollups or now - self.last_flush >= 60:
+                self._flush(now)
+    
+    def _flush(self, now: float):
+        """Append buffered samples and closed rollups, prune hourly (caller holds the lock)"""
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO samples (ts, {', '.join(self.METRICS)}) VALUES ({', '.join('?' * (len(self.METRICS) + 1))})",
+                self.pending_samples
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self.pending_rollups
+            )
+            if now - self.last_prune >= 3600:
+                self.conn.execute("DELETE FROM samples WHERE ts < ?", (now - self.retention[0],))
+                for resolution in self.RESOLUTIONS:
+                    self.conn.execute("DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                                      (resolution, now - self.retention[resolution]))
+                self.last_prune = now
+        
+        self.pending_samples = []
+        self.pending_rollups = []
+        self.last_flush = now
+    
+    def query(self, start: float, end: float, step: float, metrics: Optional[List[str]] = None) -> Dict:
+        """
+        Summarize [start, end] in `step`-second buckets
+        
+        Uses raw samples for steps under a minute, otherwise the coarsest-needed
+        rollup, moving to a coarser resolution when the range is older than the
+        finer one's retention. Rollups only cover completed minutes/hours.
+        """
+        metrics = list(metrics or self.METRICS)
+        unknown = [metric for metric in metrics if metric not in self.METRICS]
+        if unknown:
+            raise ValueError(f"unknown metric(s): {', '.join(unknown)}")
+        if end <= start or step <= 0:
+            raise ValueError("to must be after from and step must be positive")
+        
+        now = time.time()
+        resolution = 0 if step < 60 else 60 if step < 3600 else 3600
+        while resolution < 3600 and start < now - self.retention[resolution]:
+            resolution = 60 if resolution == 0 else 3600
+        step = max(step, resolution)
+        if (end - start) / step > self.MAX_POINTS:
+            raise ValueError(f"range/step exceeds {self.MAX_POINTS} points")
+        
+        with self.lock:
+            if self.pending_samples:
+                self._flush(now)
+            if resolution == 0:
+                rows = self.conn.execute(
+                    f"SELECT ts, {', '.join(metrics)} FROM samples WHERE ts >= ? AND ts <= ? ORDER BY ts",
+                    (start, end)
+                ).fetchall()
+            else:
+                rows = self.conn.execute(
+                    f"SELECT bucket, metric, min, max, mean, p95, count FROM rollups "
+                    f"WHERE resolution = ? AND bucket >= ? AND bucket <= ? "
+                    f"AND metric IN ({', '.join('?' * len(metrics))}) ORDER BY bucket",
+                    (resolution, int(start // resolution) * resolution, end, *metrics)
+                ).fetchall()
+        
+        series = {metric: [] for metric in metrics}
+        if resolution == 0:
+            grouped = {}
+            for row in rows:
+                grouped.setdefault(int((row[0] - start) // step), []).append(row)
+            for offset, bucket_rows in sorted(grouped.items()):
+                for idx, metric in enumerate(metrics, start=1):
+                    values = sorted(row[idx] for row in bucket_rows if row[idx] is not None)
+                    if values:
+                        series[metric].append([start + offset * step, *self._stats(values)])
+        else:
+            # Re-bucket rollups: exact min/max/count/mean, p95 as the max of the rollup p95s
+            grouped = {}
+            for bucket, metric, lo, hi, mean, p95, count in rows:
+                key = (metric, int((max(bucket, start) - start) // step))
+                grouped.setdefault(key, []).append((lo, hi, mean, p95, count))
+            for (metric, offset), parts in sorted(grouped.items()):
+                count = sum(part[4] for part in parts)
+                series[metric].append([
+                    start + offset * step,
+                    min(part[0] for part in parts),
+                    max(part[1] for part in parts),
+                    sum(part[2] * part[4] for part in parts) / count,
+                    max(part[3] for part in parts),
+                    count
+                ])
+        
+        return {
+            'from': start,
+            'to': end,
+            'step': step,
+            'resolution': self.RESOLUTION_NAMES[resolution],
+            'columns': self.COLUMNS,
+            'series': series
+        }
+
+class MetricsCache:
+    """Rendered /metrics payloads, reused until the next collection"""
+    
+    def __init__(self, exporter: RaspberryPiThermalExporter):
+        self.exporter = exporter
+        self.lock = threading.Lock()
+        self.entries = {}  # (openmetrics, gzipped) -> (generation, body)
+    
+    def get(self, openmetrics: bool, gzipped: bool) -> bytes:
+        """Return the payload for the current generation, rendering at most once"""
+        generation = self.exporter.generation
+        key = (openmetrics, gzipped)
+        
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached and cached[0] == generation:
+                return cached[1]
+        
+        if gzipped:
+            body = gzip.compress(self.get(openmetrics, False), compresslevel=6)
+        elif openmetrics:
+            body = generate_openmetrics(self.exporter.registry)
+        else:
+            body = generate_latest(self.exporter.registry)
+        
+        with self.lock:
+            self.entries[key] = (generation, body)
+        return body
+
+class ExporterRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler serving cached /metrics and a cheap /healthz"""
+    
+    exporter = None
+    metrics_cache = None
+    health_max_age = 90
+    
+    def do_GET(self):
+        path = urlparse(self.path).path
+        
+        if path == '/metrics':
+            self.serve_metrics()
+        elif path == '/healthz':
+            self.serve_health()
+        elif path == '/admit':
+            self.serve_admission()
+        elif path == '/history':
+            self.serve_history()
+        elif path == '/':
+            self.send_body(200, 'text/plain; charset=utf-8', b'Raspberry Pi Thermal Exporter: /metrics, /healthz, /admit, /history\n')
+        else:
+            self.send_body(404, 'text/plain; charset=utf-8', b'Not found\n')
+    
+    def do_HEAD(self):
+        self.do_GET()
+    
+    def serve_metrics(self):
+        accept = self.headers.get('Accept', '')
+        openmetrics = 'application/openmetrics-text' in accept
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        
+        body = self.metrics_cache.get(openmetrics, gzipped)
+        content_type = OPENMETRICS_CONTENT_TYPE if openmetrics else CONTENT_TYPE_LATEST
+        headers = {'Content-Encoding': 'gzip'} if gzipped else {}
+        self.send_body(200, content_type, body, headers)
+    
+    def serve_health(self):
+        """Healthy once a collection has completed recently; never renders metrics"""
+        last = self.exporter.last_collection_time
+        age = time.time() - last if last else None
+        
+        if age is not None and age <= self.health_max_age:
+            self.send_body(200, 'text/plain; charset=utf-8', f'ok {age:.1f}s\n'.encode())
+        else:
+            status = 'no collection yet' if age is None else f'stale {age:.1f}s'
+            self.send_body(503, 'text/plain; charset=utf-8', f'{status}\n'.encode())
+    
+    def serve_admission(self):
+        """Admission decision for an LLM step; ?cost=<seconds> is the expected run time"""
+        cost = None
+        values = parse_qs(urlparse(self.path).query).get('cost')
+        if values:
+            try:
+                cost = float(values[0])
+            except ValueError:
+                self.send_body(400, 'application/json', b'{"error": "cost must be a number of seconds"}\n')
+                return
+        
+        decision = self.exporter.admission.decide(cost)
+        self.exporter.admission_decisions.labels(decision=decision['decision']).inc()
+        
+        headers = {}
+        if decision['decision'] == 'delay':
+            headers['Retry-After'] = str(decision['delay_seconds'])
+        # Always 200 so n8n HTTP nodes can branch on the decision field
+        self.send_body(200, 'application/json', json.dumps(decision).encode(), headers)
+    
+    def serve_history(self):
+        """Downsampled local history; ?from=&to= are unix seconds or relative (-6h, now), &step=, &metric="""
+        if not self.exporter.history:
+            self.send_body(404, 'application/json', b'{"error": "history disabled (set HISTORY_DB)"}\n')
+            return
+        
+        query = parse_qs(urlparse(self.path).query)
+        now = time.time()
+        try:
+            end = self.parse_time(query.get('to', ['now'])[0], now)
+            start = self.parse_time(query.get('from', ['-1h'])[0], now)
+            step = AlertEngine.parse_duration(query.get('step', ['60'])[0])
+            metrics = [m for value in query.get('metric', []) for m in value.split(',') if m]
+            result = self.exporter.history.query(start, end, step, metrics or None)
+        except ValueError as e:
+            self.send_body(400, 'application/json', json.dumps({'error': str(e)}).encode())
+            return
+        except sqlite3.Error as e:
+            self.send_body(500, 'application/json', json.dumps({'error': str(e)}).encode())
+            return
+        
+        self.send_body(200, 'application/json', json.dumps(result).encode())
+    
+    @staticmethod
+    def parse_time(value: str, now: float) -> float:
+        """Unix seconds, 'now' or a duration before now ('-6h')"""
+        if value == 'now':
+            return now
+        if value.startswith('-'):
+            return now - AlertEngine.parse_duration(value[1:])
+        return float(value)
+    
+    def send_body(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Scrapes and health checks are too frequent for access logging
+        pass
+
+def start_exporter_server(port: int, exporter: RaspberryPiThermalExporter, collect_interval: int) -> ThreadingHTTPServer:
+    """Start the exporter HTTP server in a daemon thread"""
+    handler = type('BoundExporterRequestHandler', (ExporterRequestHandler,), {
+        'exporter': exporter,
+        'metrics_cache': MetricsCache(exporter),
+        # Allow a few missed collections before reporting unhealthy
+        'health_max_age': max(90, collect_interval * 3)
+    })
+    
+    server = ThreadingHTTPServer(('0.0.0.0', port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
 
 def main():
     """Main exporter loop"""
@@ -432,31 +1895,67 @@ def main():
     # Configuration
     metrics_port = int(os.getenv('METRICS_PORT', '9200'))
     collect_interval = int(os.getenv('COLLECT_INTERVAL', '30'))
+    adaptive_sampling = os.getenv('ADAPTIVE_SAMPLING', 'false').lower() == 'true'
     
     logger.info(f"Starting Raspberry Pi Thermal Exporter on port {metrics_port}")
-    logger.info(f"Collection interval: {collect_interval} seconds")
+    
+    sampler = None
+    if adaptive_sampling:
+        sampler = AdaptiveSampler(
+            min_interval=float(os.getenv('MIN_COLLECT_INTERVAL', '5')),
+            max_interval=float(os.getenv('MAX_COLLECT_INTERVAL', str(collect_interval * 4))),
+            temp_rise_threshold=float(os.getenv('ADAPTIVE_TEMP_RISE', '2.0')),
+            load_threshold=float(os.getenv('ADAPTIVE_LOAD_THRESHOLD', str((os.cpu_count() or 4) * 0.75)))
+        )
+        logger.info(f"Adaptive collection interval: {sampler.min_interval}-{sampler.max_interval} seconds "
+                    f"(temp rise >= {sampler.temp_rise_threshold}°C/min, load >= {sampler.load_threshold})")
+    else:
+        logger.info(f"Collection interval: {collect_interval} seconds")
     
     # Create and start exporter
     exporter = RaspberryPiThermalExporter()
     
-    # Start Prometheus metrics server
-    start_http_server(metrics_port, registry=exporter.registry)
-    logger.info(f"Metrics server started on http://0.0.0.0:{metrics_port}/metrics")
+    # Start metrics server (cached, gzip and OpenMetrics aware)
+    start_exporter_server(metrics_port, exporter, sampler.max_interval if sampler else collect_interval)
+    logger.info(f"Metrics server started on http://0.0.0.0:{metrics_port}/metrics (health: /healthz)")
     
     # Collection loop
     try:
         while True:
             start_time = time.time()
             
+            collected = False
             try:
                 exporter.collect_and_update_metrics()
+                collected = True
                 logger.debug("Metrics collection completed")
             except Exception as e:
                 logger.error(f"Error collecting metrics: {e}")
             
+            interval = collect_interval
+            if sampler:
+                try:
+                    interval = sampler.next_interval(
+                        exporter.last_temperature_rate,
+                        exporter.last_throttled_hex,
+                        exporter.last_load_average
+                    )
+                except Exception as e:
+                    logger.error(f"Error choosing collection interval: {e}")
+            # Set before mark_collected() renders the cached /metrics body
+            exporter.collect_interval.set(interval)
+            
+            if collected:
+                # Only a successful collection refreshes /healthz; history,
+                # admission and snapshot errors must not end the loop
+                try:
+                    exporter.mark_collected()
+                except Exception as e:
+                    logger.error(f"Error publishing collected metrics: {e}")
+            
             # Sleep for remaining interval
             elapsed = time.time() - start_time
-            sleep_time = max(0, collect_interval - elapsed)
+            sleep_time = max(0, interval - elapsed)
             time.sleep(sleep_time)
             
     except KeyboardInterrupt:
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Execution Parser Benchmark
+
+Runs each parser entry point and mode against synthetic executions from
+generate-execution-data.py and records wall time, throughput (input MB/s),
+peak RSS and output size. Results can be saved as a baseline; later runs are
+compared against it and regressions are flagged (exit code 1).
+
+Every case runs in a fresh process, the way the exec-* helpers call the
+scripts, so timings include interpreter start-up and JSON decoding. Peak RSS
+is the child's maximum resident set size. Inputs are deterministic (fixed
+seeds), so an output size change means parser behaviour changed.
+
+Usage:
+    ./benchmark-parsers.py [--profile <name>] [--repeat <n>] [--save-baseline]
+                           [--baseline <file>] [--threshold <ratio>] [--format text|json]
+
+Profiles:
+    small       Single email, no attachments
+    batch       Gmail batch: 50 emails, 2 LLM passes
+    attachments Gmail batch with 200KB attachments
+    large       200 emails, 8 nodes, 3 LLM passes
+
+Examples:
+    ./benchmark-parsers.py --save-baseline          # Record baseline on this machine
+    ./benchmark-parsers.py                          # Compare against it
+    ./benchmark-parsers.py --profile attachments --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+LIB_DIR = Path(__file__).resolve().parent
+
+DEFAULT_BASELINE_PATH = os.getenv(
+    'PARSER_BENCHMARK_BASELINE',
+    str(Path.home() / '.cache' / 'homelab' / 'parser-benchmark-baseline.json')
+)
+
+# Relative slowdown / memory growth tolerated before a case is flagged
+DEFAULT_THRESHOLD = 0.25
+
+# Generator arguments per profile
+PROFILES = {
+    'small': {'nodes': 4, 'llm_nodes': 1, 'items': 1, 'string_size': 2048},
+    'batch': {'nodes': 6, 'llm_nodes': 2, 'items': 50, 'string_size': 4096},
+    'attachments': {'nodes': 6, 'llm_nodes': 2, 'items': 50, 'string_size': 4096, 'binary_size': 200000},
+    'large': {'nodes': 8, 'llm_nodes': 3, 'items': 200, 'string_size': 8192, 'runs': 2},
+}
+
+# Entry point and mode per case; {input} is replaced with the generated file
+CASES = {
+    'parse': ['parse-execution-data.py', '0', '--input', '{input}'],
+    'parse-budget': ['parse-execution-data.py', '0', '--input', '{input}', '--max-field-size', '4096'],
+    'parse-node': ['parse-execution-data.py', '0', '--input', '{input}', '--node', 'Summarise Email with LLM'],
+    'parse-llm': ['parse-execution-data.py', '0', '--input', '{input}', '--llm-only', '--validate-json'],
+    'extract-llm': ['extract-llm-responses.py', '--input', '{input}', '--validate'],
+    'extract-summary': ['extract-llm-responses.py', '--input', '{input}', '--summary'],
+    'report': ['execution-report.py', '--input', '{input}', '--format', 'json'],
+}
+
+
+def load_generator_module():
+    """Load generate-execution-data.py (not importable by name because of the dashes)."""
+    path = LIB_DIR / 'generate-execution-data.py'
+    spec = importlib.util.spec_from_file_location('generate_execution_data', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_case(command: List[str], output_path: str) -> Dict[str, float]:
+    """
+    Run one case in a child process.
+
+    Returns:
+        seconds, peak RSS in bytes and output size in bytes
+
+    Raises:
+        RuntimeError: If the parser exits with an error
+    """
+    with open(output_path, 'wb') as out:
+        start = time.perf_counter()
+        proc = subprocess.Popen(command, stdout=out, stderr=subprocess.PIPE)
+        stderr = proc.stderr.read()
+        _, status, usage = os.wait4(proc.pid, 0)
+        seconds = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(command[1:3])} exited {proc.returncode}: {stderr.decode()[-300:]}")
+
+    # ru_maxrss is in kilobytes on Linux
+    return {
+        'seconds': seconds,
+        'peak_rss_bytes': usage.ru_maxrss * 1024,
+        'output_bytes': os.path.getsize(output_path)
+    }
+
+
+def benchmark_profile(name: str, generator, repeat: int, workdir: str) -> Dict[str, Dict[str, Any]]:
+    """Generate the profile's execution once and run every case `repeat` times (best time, max RSS)."""
+    input_path = os.path.join(workdir, f'{name}.json')
+    with open(input_path, 'w') as f:
+        json.dump(generator.flatten(generator.generate_execution(**PROFILES[name])), f, separators=(',', ':'))
+    input_bytes = os.path.getsize(input_path)
+    output_path = os.path.join(workdir, 'output')
+
+    results = {}
+    for case, args in CASES.items():
+        command = [sys.executable, str(LIB_DIR / args[0])] + [a.replace('{input}', input_path) for a in args[1:]]
+        runs = [run_case(command, output_path) for _ in range(repeat)]
+        seconds = min(run['seconds'] for run in runs)
+        results[case] = {
+            'input_bytes': input_bytes,
+            'seconds': round(seconds, 4),
+            'throughput_mb_s': round(input_bytes / seconds / 1e6, 2),
+            'peak_rss_bytes': max(run['peak_rss_bytes'] for run in runs),
+            'output_bytes': runs[-1]['output_bytes']
+        }
+    return results
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Flag cases that got slower or bigger than the baseline allows.
+
+    Returns:
+        Human-readable regression messages (empty if none)
+    """
+    regressions = []
+    for profile, cases in results.items():
+        for case, current in cases.items():
+            base = baseline.get('results', {}).get(profile, {}).get(case)
+            if not base:
+                continue
+            label = f"{profile}/{case}"
+            if current['seconds'] > base['seconds'] * (1 + threshold):
+                regressions.append(f"{label}: time {base['seconds']:.3f}s -> {current['seconds']:.3f}s")
+            if current['peak_rss_bytes'] > base['peak_rss_bytes'] * (1 + threshold):
+                regressions.append(f"{label}: peak RSS {base['peak_rss_bytes'] / 2**20:.1f}MB -> "
+                                   f"{current['peak_rss_bytes'] / 2**20:.1f}MB")
+            if current['input_bytes'] == base['input_bytes'] and current['output_bytes'] != base['output_bytes']:
+                regressions.append(f"{label}: output size {base['output_bytes']} -> {current['output_bytes']} bytes")
+    return regressions
+
+
+def format_text(results: Dict, baseline: Optional[Dict]) -> str:
+    """Format results as a table, with the change against the baseline if present."""
+    lines = [f"{'CASE':<32} {'INPUT':>9} {'TIME':>9} {'MB/s':>8} {'PEAK RSS':>10} {'OUTPUT':>10}  VS BASELINE"]
+    for profile, cases in results.items():
+        for case, r in cases.items():
+            delta = ''
+            base = (baseline or {}).get('results', {}).get(profile, {}).get(case)
+            if base:
+                delta = (f"time {(r['seconds'] / base['seconds'] - 1) * 100:+.0f}%, "
+                         f"rss {(r['peak_rss_bytes'] / base['peak_rss_bytes'] - 1) * 100:+.0f}%")
+            lines.append(
+                f"{profile + '/' + case:<32} {r['input_bytes'] / 2**20:>7.2f}MB {r['seconds'] * 1000:>7.0f}ms "
+                f"{r['throughput_mb_s']:>8.2f} {r['peak_rss_bytes'] / 2**20:>8.1f}MB "
+                f"{r['output_bytes'] / 2**20:>8.2f}MB  {delta}"
+            )
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point for CLI usage."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the execution data parsers on synthetic executions',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--profile', action='append', choices=list(PROFILES),
+                        help='Profile to run (repeatable; default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (best time is kept)')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE_PATH, help='Baseline file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Tolerated relative slowdown / RSS growth (default: 0.25)')
+    parser.add_argument('--format', choices=['json', 'text'], default='text', help='Output format')
+
+    args = parser.parse_args()
+    generator = load_generator_module()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='parser-bench-') as workdir:
+        for profile in args.profile or list(PROFILES):
+            print(f"Running profile {profile}...", file=sys.stderr)
+            try:
+                results[profile] = benchmark_profile(profile, generator, max(1, args.repeat), workdir)
+            except RuntimeError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    regressions = compare_to_baseline(results, baseline, args.threshold) if baseline else []
+
+    if args.format == 'json':
+        print(json.dumps({'results': results, 'regressions': regressions}, indent=2))
+    else:
+        print(format_text(results, baseline))
+
+    if args.save_baseline:
+        Path(args.baseline).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'results': results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+    elif not baseline:
+        print(f"No baseline at {args.baseline} (run with --save-baseline)", file=sys.stderr)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:", file=sys.stderr)
+        for message in regressions:
+            print(f"  {message}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+N8N Execution Data Compaction
+
+Shrinks stored executions by dropping binary payloads, truncating long strings,
+removing item fields and emptying the outputs of intermediate nodes. Each
+execution is rebuilt as a new flatted reference array: only elements that are
+still reachable are kept and every reference is renumbered, while elements
+shared by several items stay shared and strings stay deduplicated. Node names,
+runs, timings and statuses are kept, so timing analysis still works.
+
+Every compacted execution is parsed again with ExecutionDataParser before it
+is written; executions that fail the check, or would not get smaller, are
+left untouched.
+
+Without --sql this is a dry run that only reports sizes. With --sql, UPDATE
+statements are written to stdout in transactions of --batch-size executions,
+ready to pipe into psql -v ON_ERROR_STOP=1. tests/test_compact_executions.py
+runs that pipeline against a throwaway Postgres (see docs/investigation-system.md).
+
+Usage:
+    ./compact-executions.py [options] < rows.tsv
+    ./compact-executions.py --input exec-191.json --output exec-191.compact.json [options]
+
+Options:
+    --drop-binary           Remove base64 data of binary attachments (metadata kept)
+    --truncate-strings <n>  Truncate item strings longer than n characters
+    --drop-field <pattern>  Remove item fields, '<node glob>:<json|binary>.<field glob>'
+                            (repeatable, e.g. '*:json.html', 'Get Unread Emails:json.text')
+    --drop-node <glob>      Empty the output items of matching nodes (repeatable)
+    --sql                   Write UPDATE statements to stdout (default: report only)
+    --batch-size <n>        Executions per transaction with --sql (default: 50)
+    --format <json|text>    Report format (default: text)
+
+Input on stdin is one execution per line, tab-separated:
+    <execution_id> <workflow_name> <stopped_at> <execution_data_json>
+(the same rows as index-executions.py; psql -t -A -F $'\\t' output works as is).
+
+Examples:
+    # What would dropping attachments and bodies over 2KB save?
+    psql ... | ./compact-executions.py --drop-binary --truncate-strings 2048
+    # Apply it
+    psql ... | ./compact-executions.py --drop-binary --truncate-strings 2048 --sql | psql -v ON_ERROR_STOP=1
+"""
+
+import sys
+import json
+import secrets
+import argparse
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import execution_analysis
+
+DEFAULT_BATCH_SIZE = 50
+TRUNCATION_MARKER = '…[truncated {removed} chars]'
+
+
+class CompactionRules:
+    """What to remove from executions (parsed from the CLI options)."""
+
+    def __init__(self, drop_binary: bool = False, truncate_strings: Optional[int] = None,
+                 drop_fields: Optional[List[str]] = None, drop_nodes: Optional[List[str]] = None):
+        self.drop_binary = drop_binary
+        self.truncate_strings = truncate_strings
+        self.drop_nodes = drop_nodes or []
+        self.drop_fields = []  # (node glob, field glob)
+        for pattern in drop_fields or []:
+            node_glob, sep, field_glob = pattern.rpartition(':')
+            if not sep or not field_glob.startswith(('json.', 'binary.')):
+                raise ValueError(f"Invalid --drop-field '{pattern}' (expected '<node>:json.<field>')")
+            self.drop_fields.append((node_glob, field_glob))
+
+    def node_dropped(self, node_name: str) -> bool:
+        return any(fnmatchcase(node_name, glob) for glob in self.drop_nodes)
+
+    def field_globs(self, node_name: str) -> Tuple[str, ...]:
+        """Field globs that apply to a node (shared by nodes with the same rules)."""
+        return tuple(field for node_glob, field in self.drop_fields if fnmatchcase(node_name, node_glob))
+
+
+class ExecutionCompactor(execution_analysis.ExecutionDataParser):
+    """Execution parser that re-encodes the reference array with fields removed."""
+
+    def __init__(self, data: List[Any], rules: CompactionRules):
+        super().__init__(data)
+        self.rules = rules
+        self.output = []
+        self.strings = {}  # String value -> new reference (flatted deduplicates strings)
+        self.encoded = {}  # (old reference index, context) -> new reference
+        self.stats = {'binaryDropped': 0, 'stringsTruncated': 0, 'fieldsDropped': 0, 'itemsDropped': 0}
+
+    def compact(self) -> List[Any]:
+        """
+        Build the compacted reference array.
+
+        Raises:
+            QueryError: If the data is not n8n execution data
+        """
+        if not self.data or not isinstance(self.data[0], dict):
+            raise execution_analysis.QueryError("Could not parse execution data")
+
+        root = {}
+        self._reserve(root)
+        for key, ref in self.data[0].items():
+            if key == 'resultData':
+                root[key] = self._encode_result_data(ref)
+            else:
+                root[key] = self._encode(ref)
+        return self.output
+
+    def _reserve(self, element: Any) -> str:
+        """Append an element to the new array and return its reference."""
+        self.output.append(element)
+        return str(len(self.output) - 1)
+
+    def _string(self, value: str) -> str:
+        if value not in self.strings:
+            self.strings[value] = self._reserve(value)
+        return self.strings[value]
+
+    def _element(self, ref: Any) -> Tuple[Optional[int], Any]:
+        """(old index, element) for a reference, (None, value) for inline values."""
+        if isinstance(ref, str) and ref.isdigit() and int(ref) < len(self.data):
+            return int(ref), self.data[int(ref)]
+        return None, ref
+
+    def _encode(self, ref: Any, truncate: Optional[int] = None) -> Any:
+        """
+        Copy a value into the new array, renumbering references.
+
+        Args:
+            ref: Reference (or inline value) in the old array
+            truncate: Truncate strings longer than this (item contents only)
+        """
+        ref_id, element = self._element(ref)
+        if ref_id is None:
+            return element
+
+        if isinstance(element, str):
+            if truncate is not None and len(element) > truncate:
+                self.stats['stringsTruncated'] += 1
+                element = element[:truncate] + TRUNCATION_MARKER.format(removed=len(element) - truncate)
+            return self._string(element)
+
+        key = (ref_id, truncate)
+        if key in self.encoded:
+            return self.encoded[key]
+
+        if isinstance(element, dict):
+            copy = {}
+            new_ref = self.encoded[key] = self._reserve(copy)
+            for name, child in element.items():
+                copy[name] = self._encode(child, truncate)
+        elif isinstance(element, list):
+            copy = []
+            new_ref = self.encoded[key] = self._reserve(copy)
+            copy.extend(self._encode(child, truncate) for child in element)
+        else:
+            new_ref = self.encoded[key] = self._reserve(element)
+        return new_ref
+
+    def _encode_dict(self, ref: Any, encode_value) -> Any:
+        """Copy a dict element, encoding each (key, value) with encode_value (None drops it)."""
+        ref_id, element = self._element(ref)
+        if not isinstance(element, dict):
+            return self._encode(ref)
+
+        copy = {}
+        new_ref = self._reserve(copy)
+        for name, child in element.items():
+            value = encode_value(name, child)
+            if value is not None:
+                copy[name] = value
+        return new_ref
+
+    def _encode_result_data(self, ref: Any) -> Any:
+        return self._encode_dict(ref, lambda key, child: (
+            self._encode_run_data(child) if key == 'runData' else self._encode(child)
+        ))
+
+    def _encode_run_data(self, ref: Any) -> Any:
+        return self._encode_dict(ref, lambda node_name, runs_ref: self._encode_runs(node_name, runs_ref))
+
+    def _encode_runs(self, node_name: str, ref: Any) -> Any:
+        ref_id, runs = self._element(ref)
+        if not isinstance(runs, list):
+            return self._encode(ref)
+
+        copy = []
+        new_ref = self._reserve(copy)
+        for run_ref in runs:
+            copy.append(self._encode_dict(run_ref, lambda key, child: (
+                self._encode_outputs(node_name, child) if key == 'data' else self._encode(child)
+            )))
+        return new_ref
+
+    def _encode_outputs(self, node_name: str, ref: Any) -> Any:
+        """Encode data.<connection>[output][item], applying item rules."""
+        dropped = self.rules.node_dropped(node_name)
+        field_globs = self.rules.field_globs(node_name)
+
+        def encode_items(items_ref):
+            _, items = self._element(items_ref)
+            if not isinstance(items, list):
+                return self._encode(items_ref)
+            if dropped:
+                self.stats['itemsDropped'] += len(items)
+                return self._reserve([])
+            copy = []
+            new_ref = self._reserve(copy)
+            copy.extend(self._encode_item(item_ref, field_globs) for item_ref in items)
+            return new_ref
+
+        def encode_connection(outputs_ref):
+            _, outputs = self._element(outputs_ref)
+            if not isinstance(outputs, list):
+                return self._encode(outputs_ref)
+            copy = []
+            new_ref = self._reserve(copy)
+            copy.extend(encode_items(items_ref) for items_ref in outputs)
+            return new_ref
+
+        return self._encode_dict(ref, lambda connection, outputs_ref: encode_connection(outputs_ref))
+
+    def _encode_item(self, ref: Any, field_globs: Tuple[str, ...]) -> Any:
+        """Encode one item, dropping fields and binary data per the rules."""
+        ref_id, item = self._element(ref)
+        if not isinstance(item, dict):
+            return self._encode(ref)
+
+        # Items untouched by any rule keep their shared encoding
+        if not field_globs and not self.rules.drop_binary and self.rules.truncate_strings is None:
+            return self._encode(ref)
+
+        key = (ref_id, ('item', field_globs))
+        if key in self.encoded:
+            return self.encoded[key]
+
+        truncate = self.rules.truncate_strings
+
+        def encode_field(section: str, name: str, child: Any):
+            if any(fnmatchcase(f'{section}.{name}', glob) for glob in field_globs):
+                self.stats['fieldsDropped'] += 1
+                return None
+            if section == 'binary' and self.rules.drop_binary:
+                return self._encode_binary(child)
+            return self._encode(child, truncate)
+
+        def encode_section(section: str, child: Any):
+            if section in ('json', 'binary'):
+                return self._encode_dict(child, lambda name, value: encode_field(section, name, value))
+            return self._encode(child)
+
+        new_ref = self.encoded[key] = self._encode_dict(ref, encode_section)
+        return new_ref
+
+    def _encode_binary(self, ref: Any) -> Any:
+        """Keep binary metadata (mimeType, fileName, ...) but not the base64 data."""
+        def encode_value(name, child):
+            if name == 'data':
+                self.stats['binaryDropped'] += 1
+                return self._string('')
+            return self._encode(child)
+        return self._encode_dict(ref, encode_value)
+
+
+def run_signature(data: List[Any]) -> Dict[str, List[Tuple[Any, Any]]]:
+    """Node names with (executionTime, executionStatus) per run, used to verify compaction."""
+    _, node_data = execution_analysis.parse_node_data(data)
+    return {
+        node: [(run.get('executionTime'), run.get('executionStatus')) for run in runs]
+        for node, runs in node_data.items()
+    }
+
+
+def compact_execution(raw_data: str, rules: CompactionRules) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Compact one execution.
+
+    Returns:
+        Tuple of (new JSON text or None if unchanged, stats)
+
+    Raises:
+        QueryError: If the input is not execution data or the result fails verification
+    """
+    data = execution_analysis.load_execution_json(raw_data)
+    compactor = ExecutionCompactor(data, rules)
+    compacted = compactor.compact()
+
+    if run_signature(compacted) != run_signature(data):
+        raise execution_analysis.QueryError("Compacted data does not match original nodes/runs")
+
+    new_text = json.dumps(compacted, ensure_ascii=False, separators=(',', ':'))
+    stats = dict(compactor.stats)
+    stats['before'] = len(raw_data.encode('utf-8'))
+    stats['after'] = len(new_text.encode('utf-8'))
+    stats['elementsBefore'] = len(data)
+    stats['elementsAfter'] = len(compacted)
+
+    if stats['after'] >= stats['before']:
+        stats['after'] = stats['before']
+        return None, stats
+    return new_text, stats
+
+
+def update_statement(execution_id: int, new_text: str) -> str:
+    """UPDATE for one execution, dollar-quoted with a tag that cannot occur in the data."""
+    tag = f"c{secrets.token_hex(4)}"
+    while f"${tag}$" in new_text:
+        tag = f"c{secrets.token_hex(4)}"
+    return f'UPDATE execution_data SET data = ${tag}${new_text}${tag}$ WHERE "executionId" = {execution_id};'
+
+
+def iter_rows(args):
+    """Yield (execution_id, workflow, raw_data) from --input or stdin rows."""
+    if args.input:
+        with open(args.input, 'r') as f:
+            yield Path(args.input).stem, '', f.read()
+        return
+
+    for line in sys.stdin:
+        line = line.rstrip('\n')
+        if not line.strip():
+            continue
+        parts = line.split('\t', 3)
+        if len(parts) != 4 or not parts[0].strip().isdigit():
+            print(f"Warning: Skipping malformed row: {line[:60]}", file=sys.stderr)
+            continue
+        yield parts[0], parts[1], parts[3]
+
+
+def format_report(rows: List[Dict[str, Any]], totals: Dict[str, int], applied: bool) -> str:
+    """Format per-execution and total savings as text."""
+    lines = [f"{'EXECUTION':>10} {'BEFORE':>10} {'AFTER':>10} {'SAVED':>7}  WORKFLOW"]
+    for row in rows:
+        saved = (1 - row['after'] / row['before']) * 100 if row['before'] else 0
+        lines.append(f"{row['executionId']:>10} {row['before'] / 1024:>8.1f}KB {row['after'] / 1024:>8.1f}KB "
+                     f"{saved:>6.1f}%  {row['workflow']}")
+    saved = (1 - totals['after'] / totals['before']) * 100 if totals['before'] else 0
+    lines.append('')
+    lines.append(f"{'Total':>10} {totals['before'] / 2**20:>8.2f}MB {totals['after'] / 2**20:>8.2f}MB {saved:>6.1f}%  "
+                 f"({totals['compacted']} to update, {totals['unchanged']} unchanged, {totals['failed']} failed)")
+    lines.append(f"Binary payloads dropped: {totals['binaryDropped']}, strings truncated: {totals['stringsTruncated']}, "
+                 f"fields dropped: {totals['fieldsDropped']}, items dropped: {totals['itemsDropped']}")
+    if not applied:
+        lines.append("Dry run: nothing written (use --sql and pipe into psql to apply)")
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point for CLI usage."""
+    parser = argparse.ArgumentParser(
+        description='Compact stored n8n execution data',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--input', type=str, help='Compact a single execution data file')
+    parser.add_argument('--output', type=str, help='With --input: write the compacted data here')
+    parser.add_argument('--drop-binary', action='store_true', help='Remove base64 data of binary attachments')
+    parser.add_argument('--truncate-strings', type=int, help='Truncate item strings longer than this')
+    parser.add_argument('--drop-field', action='append', default=[],
+                        help="Remove item fields '<node glob>:<json|binary>.<field glob>' (repeatable)")
+    parser.add_argument('--drop-node', action='append', default=[], help='Empty output items of nodes (glob, repeatable)')
+    parser.add_argument('--sql', action='store_true', help='Write UPDATE statements to stdout')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Executions per transaction')
+    parser.add_argument('--format', choices=['json', 'text'], default='text', help='Report format')
+
+    args = parser.parse_args()
+
+    try:
+        rules = CompactionRules(args.drop_binary, args.truncate_strings, args.drop_field, args.drop_node)
+    except ValueError as e:
+        parser.error(str(e))
+    if not (rules.drop_binary or rules.truncate_strings is not None or rules.drop_fields or rules.drop_nodes):
+        parser.error("nothing to do: give --drop-binary, --truncate-strings, --drop-field or --drop-node")
+    if args.sql and args.input:
+        parser.error("--sql needs execution rows on stdin (it updates by execution id)")
+
+    totals = {key: 0 for key in ('before', 'after', 'compacted', 'unchanged', 'failed',
+                                 'binaryDropped', 'stringsTruncated', 'fieldsDropped', 'itemsDropped')}
+    rows = []
+    pending = 0
+
+    for execution_id, workflow, raw_data in iter_rows(args):
+        try:
+            new_text, stats = compact_execution(raw_data, rules)
+        except execution_analysis.QueryError as e:
+            print(f"Warning: Execution {execution_id}: {e}", file=sys.stderr)
+            totals['failed'] += 1
+            continue
+
+        for key in ('before', 'after', 'binaryDropped', 'stringsTruncated', 'fieldsDropped', 'itemsDropped'):
+            totals[key] += stats[key]
+        rows.append({'executionId': execution_id, 'workflow': workflow, **stats})
+
+        if new_text is None:
+            totals['unchanged'] += 1
+            continue
+        totals['compacted'] += 1
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(new_text)
+        if args.sql:
+            if pending == 0:
+                print('BEGIN;')
+            print(update_statement(int(execution_id), new_text))
+            pending += 1
+            if pending >= args.batch_size:
+                print('COMMIT;')
+                pending = 0
+
+    if args.sql and pending:
+        print('COMMIT;')
+
+    # The report goes to stderr when stdout carries SQL
+    report_stream = sys.stderr if args.sql else sys.stdout
+    if args.format == 'json':
+        print(json.dumps({'executions': rows, 'totals': totals}, indent=2, ensure_ascii=False), file=report_stream)
+    else:
+        print(format_report(rows, totals, args.sql or bool(args.output)), file=report_stream)
+
+    if totals['failed'] and not rows:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+N8N Execution Comparison
+
+Structurally compares two or more n8n executions (e.g. a good and a bad run
+around a model swap). Every subtree of the compressed JSON reference array is
+hashed once, Merkle-style, so identical node outputs and items are skipped
+without being resolved or walked.
+
+The first input is the baseline; every other input is compared against it.
+
+Usage:
+    ./compare-executions.py --input exec-193.json --input exec-200.json [options]
+
+Options:
+    --input <file>          Execution data file (repeatable, first is baseline)
+    --label <name>          Label for the matching --input (default: file name)
+    --format <json|text>    Output format (default: text)
+    --max-fields <n>        Changed field paths reported per node (default: 20)
+
+Examples:
+    # Compare baseline 193 against 200
+    ./compare-executions.py --input exec-193.json --label 193 \\
+                            --input exec-200.json --label 200
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+import execution_analysis
+
+PREVIEW_LENGTH = 80
+CYCLE_HASH = hashlib.sha1(b'<cycle>').hexdigest()
+
+
+class ExecutionFingerprint(execution_analysis.ExecutionDataParser):
+    """Execution parser that hashes reference subtrees instead of resolving them."""
+
+    def __init__(self, data: List[Any]):
+        super().__init__(data)
+        self.hashes = {}  # Reference index -> subtree hash
+        self._hashing = set()  # Track refs being hashed to detect cycles
+
+    def hash_ref(self, ref_id: int) -> str:
+        """
+        Hash the subtree rooted at a reference index (memoized).
+
+        Args:
+            ref_id: Index into the reference array
+
+        Returns:
+            Hex digest identifying the fully resolved value
+        """
+        if ref_id in self.hashes:
+            return self.hashes[ref_id]
+        if ref_id in self._hashing:
+            return CYCLE_HASH
+        if ref_id >= len(self.data):
+            return self.hash_value(None)
+
+        self._hashing.add(ref_id)
+        try:
+            element = self.data[ref_id]
+            if isinstance(element, str):
+                # Array elements that are strings are literals, not references
+                digest = hashlib.sha1(b's' + element.encode('utf-8')).hexdigest()
+            else:
+                digest = self.hash_value(element)
+        finally:
+            self._hashing.discard(ref_id)
+
+        self.hashes[ref_id] = digest
+        return digest
+
+    def hash_value(self, value: Any) -> str:
+        """
+        Hash a raw value from the reference array, following references.
+
+        Args:
+            value: Raw value (reference string, container or primitive)
+
+        Returns:
+            Hex digest identifying the fully resolved value
+        """
+        if isinstance(value, str) and value.isdigit():
+            return self.hash_ref(int(value))
+
+        h = hashlib.sha1()
+        if isinstance(value, dict):
+            h.update(b'd')
+            for key in sorted(value):
+                h.update(key.encode('utf-8') + b'\0' + self.hash_value(value[key]).encode('ascii'))
+        elif isinstance(value, list):
+            h.update(b'l')
+            for item in value:
+                h.update(self.hash_value(item).encode('ascii'))
+        else:
+            h.update(b'p' + json.dumps(value).encode('utf-8'))
+        return h.hexdigest()
+
+    def get_node_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize each node's runs without resolving item contents.
+
+        Returns:
+            Dictionary mapping node name to runs, timing, item refs and output hash
+        """
+        walk = execution_analysis.ExecutionWalk(self.data, [NodeSummaries()], parser=self)
+        return walk.run()['node-summaries']
+
+
+class NodeSummaries(execution_analysis.Extractor):
+    """Runs, timing and main output 0 item refs per node, hashed instead of resolved."""
+
+    name = 'node-summaries'
+
+    def start(self, walk):
+        super().start(walk)
+        self.summaries = {}
+
+    def node(self, node_name):
+        self.summaries[node_name] = {'runs': 0, 'executionTime': 0, 'items': 0, 'itemRefs': []}
+
+    def run(self, run):
+        summary = self.summaries[run.node]
+        summary['runs'] += 1
+        summary['executionTime'] += run.execution_time or 0
+        summary['itemRefs'].extend(item.ref for item in run.output_items(0))
+
+    def result(self):
+        hash_value = self.walk.parser.hash_value
+        for summary in self.summaries.values():
+            summary['items'] = len(summary['itemRefs'])
+            summary['outputHash'] = hashlib.sha1(
+                ''.join(hash_value(ref) for ref in summary['itemRefs']).encode('ascii')
+            ).hexdigest()
+        return self.summaries
+
+
+def preview(fingerprint: ExecutionFingerprint, value: Any) -> Any:
+    """Return a short printable preview of a raw value."""
+    resolved = fingerprint.resolve_ref(value)
+    if isinstance(resolved, (dict, list)):
+        return f"<{type(resolved).__name__}:{len(resolved)}>"
+    if isinstance(resolved, str) and len(resolved) > PREVIEW_LENGTH:
+        return resolved[:PREVIEW_LENGTH] + '...'
+    return resolved
+
+
+def diff_values(base: ExecutionFingerprint, other: ExecutionFingerprint,
+                base_value: Any, other_value: Any, path: str,
+                changes: Dict[str, Dict[str, Any]]):
+    """
+    Record changed leaf paths between two raw values, skipping equal subtrees.
+
+    Args:
+        base: Fingerprint of the baseline execution
+        other: Fingerprint of the compared execution
+        base_value: Raw baseline value
+        other_value: Raw compared value
+        path: Dotted field path of the values
+        changes: Accumulator mapping path to change count and example
+    """
+    if base.hash_value(base_value) == other.hash_value(other_value):
+        return
+
+    base_resolved = base.resolve_ref(base_value)
+    other_resolved = other.resolve_ref(other_value)
+
+    if isinstance(base_resolved, dict) and isinstance(other_resolved, dict):
+        for key in sorted(set(base_resolved) | set(other_resolved)):
+            child_path = f"{path}.{key}" if path else key
+            if key not in base_resolved or key not in other_resolved:
+                record_change(changes, child_path,
+                              preview(base, base_resolved.get(key)),
+                              preview(other, other_resolved.get(key)))
+            else:
+                diff_values(base, other, base_resolved[key], other_resolved[key], child_path, changes)
+        return
+
+    record_change(changes, path or '<item>', preview(base, base_value), preview(other, other_value))
+
+
+def record_change(changes: Dict[str, Dict[str, Any]], path: str, before: Any, after: Any):
+    """Count a changed path, keeping the first example seen."""
+    if path in changes:
+        changes[path]['items'] += 1
+    else:
+        changes[path] = {'items': 1, 'before': before, 'after': after}
+
+
+def compare_nodes(base: ExecutionFingerprint, other: ExecutionFingerprint,
+                  max_fields: int) -> Dict[str, Any]:
+    """
+    Compare per-node timing, item counts and output fields of two executions.
+
+    Args:
+        base: Fingerprint of the baseline execution
+        other: Fingerprint of the compared execution
+        max_fields: Maximum number of changed field paths reported per node
+
+    Returns:
+        Comparison result with per-node deltas and added/removed nodes
+    """
+    base_nodes = base.get_node_summaries()
+    other_nodes = other.get_node_summaries()
+
+    nodes = {}
+    for node_name in [n for n in base_nodes if n in other_nodes]:
+        b = base_nodes[node_name]
+        o = other_nodes[node_name]
+
+        delta_ms = o['executionTime'] - b['executionTime']
+        entry = {
+            'executionTime': [b['executionTime'], o['executionTime']],
+            'executionTimeDeltaMs': delta_ms,
+            'executionTimeDeltaPct': round(delta_ms / b['executionTime'] * 100, 1) if b['executionTime'] else None,
+            'runs': [b['runs'], o['runs']],
+            'items': [b['items'], o['items']],
+            'outputIdentical': b['outputHash'] == o['outputHash'],
+            'changedFields': {}
+        }
+
+        if not entry['outputIdentical']:
+            changes = {}
+            for base_ref, other_ref in zip(b['itemRefs'], o['itemRefs']):
+                diff_values(base, other, base_ref, other_ref, '', changes)
+            ranked = sorted(changes.items(), key=lambda kv: (-kv[1]['items'], kv[0]))
+            entry['changedFields'] = dict(ranked[:max_fields])
+            entry['changedFieldsTruncated'] = max(0, len(ranked) - max_fields)
+
+        nodes[node_name] = entry
+
+    base_total = sum(n['executionTime'] for n in base_nodes.values())
+    other_total = sum(n['executionTime'] for n in other_nodes.values())
+
+    return {
+        'totalExecutionTime': [base_total, other_total],
+        'totalExecutionTimeDeltaMs': other_total - base_total,
+        'nodesAdded': [n for n in other_nodes if n not in base_nodes],
+        'nodesRemoved': [n for n in base_nodes if n not in other_nodes],
+        'nodes': nodes
+    }
+
+
+def format_text(comparisons: List[Dict[str, Any]]) -> str:
+    """Render comparison results as a human-readable report."""
+    lines = []
+
+    for comparison in comparisons:
+        lines.append('═' * 63)
+        lines.append(f"Baseline: {comparison['baseline']}  →  Compared: {comparison['compared']}")
+        lines.append('═' * 63)
+        total = comparison['totalExecutionTime']
+        lines.append(f"Total node time:  {total[0] / 1000:.1f}s → {total[1] / 1000:.1f}s "
+                     f"({comparison['totalExecutionTimeDeltaMs'] / 1000:+.1f}s)")
+        if comparison['nodesAdded']:
+            lines.append(f"Nodes added:      {', '.join(comparison['nodesAdded'])}")
+        if comparison['nodesRemoved']:
+            lines.append(f"Nodes removed:    {', '.join(comparison['nodesRemoved'])}")
+        lines.append('')
+
+        for node_name, node in comparison['nodes'].items():
+            pct = node['executionTimeDeltaPct']
+            pct_text = f" ({pct:+.1f}%)" if pct is not None else ''
+            lines.append(f"▸ {node_name}")
+            lines.append(f"    Time:  {node['executionTime'][0]}ms → {node['executionTime'][1]}ms"
+                         f" ({node['executionTimeDeltaMs']:+d}ms){pct_text}")
+            if node['items'][0] != node['items'][1] or node['runs'][0] != node['runs'][1]:
+                lines.append(f"    Items: {node['items'][0]} → {node['items'][1]}"
+                             f"  Runs: {node['runs'][0]} → {node['runs'][1]}")
+            if node['outputIdentical']:
+                lines.append("    Output: identical")
+            for path, change in node['changedFields'].items():
+                lines.append(f"    Changed {path} ({change['items']} item(s)): "
+                             f"{json.dumps(change['before'], ensure_ascii=False)} → "
+                             f"{json.dumps(change['after'], ensure_ascii=False)}")
+            if node.get('changedFieldsTruncated'):
+                lines.append(f"    ... {node['changedFieldsTruncated']} more changed field(s)")
+
+        lines.append('')
+
+    return '\n'.join(lines)
+
+
+def load_fingerprint(path: str) -> ExecutionFingerprint:
+    """Read an execution data file into a fingerprint, exiting on invalid input."""
+    try:
+        with open(path, 'r') as f:
+            raw_data = f.read()
+    except OSError as e:
+        print(f"Error: Cannot read {path}: {e.strerror}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        data = execution_analysis.load_execution_json(raw_data)
+    except execution_analysis.QueryError as e:
+        print(f"Error: {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    return ExecutionFingerprint(data)
+
+
+def main():
+    """Main entry point for CLI usage."""
+    parser = argparse.ArgumentParser(
+        description='Compare n8n executions structurally',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument('--input', action='append', default=[], help='Execution data file (repeatable)')
+    parser.add_argument('--label', action='append', default=[], help='Label for the matching --input')
+    parser.add_argument('--format', choices=['json', 'text'], default='text', help='Output format')
+    parser.add_argument('--max-fields', type=int, default=20, help='Changed field paths reported per node')
+
+    args = parser.parse_args()
+
+    if len(args.input) < 2:
+        parser.error("at least two --input files are required")
+
+    labels = args.label + [Path(p).stem for p in args.input[len(args.label):]]
+    fingerprints = [load_fingerprint(path) for path in args.input]
+
+    comparisons = []
+    for label, fingerprint in zip(labels[1:], fingerprints[1:]):
+        comparison = compare_nodes(fingerprints[0], fingerprint, args.max_fields)
+        comparisons.append({'baseline': labels[0], 'compared': label, **comparison})
+
+    if args.format == 'json':
+        print(json.dumps(comparisons, indent=2, ensure_ascii=False))
+    else:
+        print(format_text(comparisons))
+
+
+if __name__ == '__main__':
+    main()
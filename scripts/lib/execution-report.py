@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+N8N Execution Report
+
+Runs every analysis extractor over each execution in a single pass (see
+execution_analysis.py): node timings, LLM responses, Ollama throughput,
+response validation and size accounting, instead of one full parse per
+exec-* command.
+
+Usage:
+    ./execution-report.py --input exec-191.json [--input exec-192.json] [options]
+    ./execution-report.py [options] < rows.tsv
+
+Options:
+    --input <file>          Execution data file (repeatable)
+    --extractor <name>      Extractor to run (repeatable; default: all except node-outputs)
+    --node <name>           Only analyze this node (repeatable)
+    --validate              Add JSON validation to each LLM response
+    --max-field-size <n>    Describe strings longer than n characters (node-outputs)
+    --format <json|text>    Output format (default: text)
+
+Without --input, executions are read from stdin, one per line, tab-separated:
+    <execution_id> <workflow_name> <stopped_at> <execution_data_json>
+(psql -t -A -F $'\\t' output works as is).
+
+Examples:
+    ./execution-report.py --input exec-191.json
+    ./execution-report.py --input exec-191.json --extractor node-timings --extractor size --format json
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+import execution_analysis
+
+SECTION_TITLES = {
+    'node-outputs': 'Node Outputs',
+    'node-timings': 'Node Timings',
+    'llm-responses': 'LLM Responses',
+    'ollama-stats': 'Ollama Throughput',
+    'validation': 'Response Validation',
+    'size': 'Data Size',
+}
+
+
+def iter_executions(args) -> Iterator[Tuple[str, str, str]]:
+    """Yield (execution_id, workflow, raw_data) from --input files or stdin rows."""
+    if args.input:
+        for path in args.input:
+            with open(path, 'r') as f:
+                yield Path(path).stem, '', f.read()
+        return
+
+    for line in sys.stdin:
+        line = line.rstrip('\n')
+        if not line.strip():
+            continue
+        parts = line.split('\t', 3)
+        if len(parts) != 4 or not parts[0].strip().isdigit():
+            print(f"Warning: Skipping malformed row: {line[:60]}", file=sys.stderr)
+            continue
+        yield parts[0], parts[1], parts[3]
+
+
+def report_execution(raw_data: str, args) -> Tuple[Dict[str, Any], list]:
+    """
+    Analyze one execution in a single walk.
+
+    Returns:
+        Tuple of (results by extractor name, extractor instances)
+
+    Raises:
+        QueryError: If the input is not JSON, has no run data or names an unknown extractor
+    """
+    data = execution_analysis.load_execution_json(raw_data)
+    extractors = execution_analysis.create_extractors(args.extractor, validate=args.validate)
+    walk = execution_analysis.ExecutionWalk(data, extractors, max_field_size=args.max_field_size, nodes=args.node,
+                                            raw_size=len(raw_data.encode('utf-8')))
+    if not walk.run_data():
+        raise execution_analysis.QueryError("Could not parse execution data")
+    return walk.run(), extractors
+
+
+def format_text(execution_id: str, workflow: str, results: Dict[str, Any], extractors: list) -> str:
+    """Format one execution's results using each extractor's text lines."""
+    lines = [
+        "═══════════════════════════════════════════════════════════════",
+        f"Execution {execution_id}" + (f" ({workflow})" if workflow else ''),
+        "═══════════════════════════════════════════════════════════════",
+    ]
+    for extractor in extractors:
+        section = extractor.format_text(results[extractor.name])
+        if not section:
+            continue
+        lines.append(SECTION_TITLES.get(extractor.name, extractor.name))
+        lines.append("───────────────────────────────────────────────────────────────")
+        lines.extend(section)
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point for CLI usage."""
+    parser = argparse.ArgumentParser(
+        description='Analyze n8n executions with all extractors in one pass',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--input', action='append', default=[], help='Execution data file (repeatable)')
+    parser.add_argument('--extractor', action='append', choices=list(execution_analysis.EXTRACTORS),
+                        help='Extractor to run (repeatable; default: all except node-outputs)')
+    parser.add_argument('--node', action='append', help='Only analyze this node (repeatable)')
+    parser.add_argument('--validate', action='store_true', help='Validate each LLM response as JSON')
+    parser.add_argument('--max-field-size', type=int, help='Describe strings longer than this (node-outputs)')
+    parser.add_argument('--format', choices=['json', 'text'], default='text', help='Output format')
+
+    args = parser.parse_args()
+
+    reports = []
+    analyzed = failed = 0
+    for execution_id, workflow, raw_data in iter_executions(args):
+        try:
+            results, extractors = report_execution(raw_data, args)
+        except execution_analysis.QueryError as e:
+            print(f"Warning: Execution {execution_id}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+
+        analyzed += 1
+        if args.format == 'json':
+            reports.append({'executionId': execution_id, 'workflow': workflow, 'results': results})
+        else:
+            print(format_text(execution_id, workflow, results, extractors))
+
+    if args.format == 'json':
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+
+    if failed and not analyzed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
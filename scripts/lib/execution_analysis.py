@@ -0,0 +1,1002 @@
+#!/usr/bin/env python3
+"""
+N8N Execution Analysis Library
+
+Shared parsing and analysis for n8n execution data (the compressed JSON
+reference array stored in execution_data.data). parse-execution-data.py,
+extract-llm-responses.py and execution-report.py are thin CLIs on top of it.
+
+ExecutionWalk makes a single traversal of an execution's runData and hands
+every node, run and output item to any number of extractors. Extractors are
+plug-ins: subclass Extractor, give it a name and register it with
+@register_extractor. Resolved items and LLM outputs are cached on the item
+views, so extractors that look at the same item share the work.
+
+Built-in extractors:
+    node-outputs    Resolved node runs and items (the exec-parse output)
+    node-timings    Runs, execution time and item counts per node
+    llm-responses   LLM responses with model, Ollama stats and optional validation
+    ollama-stats    Ollama throughput per model
+    validation      JSON validity of LLM responses
+    size            Stored bytes of output items per node
+
+Example:
+    import execution_analysis
+    data = execution_analysis.load_execution_json(raw_data)
+    results = execution_analysis.analyze(data, ['node-timings', 'ollama-stats'])
+"""
+
+import json
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+# Node name keywords identifying LLM nodes
+LLM_NODE_KEYWORDS = ['llm', 'ollama', 'openai', 'agent', 'summarise', 'summarize', 'chat']
+
+# Output item json fields holding the LLM response, in order of preference
+LLM_RESPONSE_FIELDS = ['response', 'output', 'text', 'content']
+
+# Ollama /api/generate timing fields (durations are reported in nanoseconds)
+OLLAMA_STAT_FIELDS = [
+    'total_duration', 'load_duration',
+    'prompt_eval_count', 'prompt_eval_duration',
+    'eval_count', 'eval_duration'
+]
+
+NS_PER_SECOND = 1e9
+
+# Characters of an invalid response kept in validation reports
+PREVIEW_LENGTH = 200
+
+EXTRACTORS = {}  # Extractor name -> class (see register_extractor)
+
+# Extractors run by analyze() when none are named
+DEFAULT_EXTRACTORS = ['node-timings', 'llm-responses', 'ollama-stats', 'validation', 'size']
+
+
+class QueryError(Exception):
+    """Raised when a parse query cannot be answered (bad input, unknown node)."""
+
+
+class ExecutionDataParser:
+    """Parser for n8n execution data with compressed JSON references."""
+
+    def __init__(self, data: List[Any], max_field_size: Optional[int] = None):
+        """
+        Initialize parser with execution data array.
+
+        Args:
+            data: The decompressed JSON array from execution_data.data
+            max_field_size: If set, binary blocks and strings longer than this
+                are replaced with lazy descriptors instead of being copied
+        """
+        self.data = data
+        self.cache = {}  # Cache resolved references for performance
+        self.max_depth = 10  # Maximum recursion depth to prevent infinite loops
+        self._resolving = set()  # Track currently resolving refs to detect cycles
+        self.max_field_size = max_field_size
+        self.lazy_refs = {}  # Reference index -> descriptor for values left unresolved
+
+    def resolve_ref(self, ref: Any) -> Any:
+        """
+        Recursively resolve a reference to actual data.
+
+        Args:
+            ref: String reference (e.g., "445") or actual value
+
+        Returns:
+            Resolved data value
+        """
+        if ref is None:
+            return None
+
+        # Return non-reference values as-is
+        if not isinstance(ref, str) or not ref.isdigit():
+            return ref
+
+        # Check cache
+        ref_int = int(ref)
+        if ref_int in self.cache:
+            return self.cache[ref_int]
+
+        # Resolve and cache
+        if ref_int < len(self.data):
+            resolved = self.data[ref_int]
+            self.cache[ref_int] = resolved
+            return resolved
+
+        return None
+
+    def binary_property(self, ref_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Find the n8n binary property whose data is stored at a reference.
+
+        Scans the whole array, so it classifies the reference whether or not
+        max_field_size described it while resolving.
+
+        Args:
+            ref_id: Reference index of the data value
+
+        Returns:
+            Binary descriptor (as built by _describe_binary, without sizes), or
+            None if the reference is not binary data
+        """
+        target = str(ref_id)
+        for element in self.data:
+            if isinstance(element, dict) and element.get('data') == target and 'mimeType' in element:
+                descriptor = {'_lazy': 'binary', 'ref': ref_id}
+                for meta in ('mimeType', 'fileName', 'fileExtension', 'fileSize', 'id'):
+                    if meta in element:
+                        descriptor[meta] = self.resolve_ref(element[meta])
+                return descriptor
+        return None
+
+    def get_run_data(self) -> Optional[Dict[str, Any]]:
+        """
+        Extract run data structure from execution data.
+
+        Returns:
+            Dictionary mapping node names to execution data
+        """
+        node_data = ExecutionWalk(self.data, [NodeOutputs()], parser=self).run()['node-outputs']
+        return node_data or None
+
+    def _resolve_item(self, item_ref: Any) -> Dict[str, Any]:
+        """
+        Recursively resolve a single item, expanding all references.
+
+        Args:
+            item_ref: Reference to item data
+
+        Returns:
+            Fully resolved item dictionary
+        """
+        item = self.resolve_ref(item_ref)
+
+        if not isinstance(item, dict):
+            return {'value': item}
+
+        resolved = {}
+        for key, value in item.items():
+            # Binary blocks are only described in budget mode, never copied
+            if key == 'binary' and self.max_field_size is not None:
+                resolved[key] = self._describe_binary(value)
+            # Recursively resolve nested structures
+            elif isinstance(value, str) and value.isdigit():
+                resolved[key] = self._resolve_field(value)
+            elif isinstance(value, dict):
+                resolved[key] = {k: self._resolve_field(v) for k, v in value.items()}
+            elif isinstance(value, list):
+                resolved[key] = [self._resolve_field(v) for v in value]
+            else:
+                resolved[key] = value
+
+        return resolved
+
+    def _resolve_field(self, ref: Any) -> Any:
+        """
+        Resolve a top-level item field, honouring the field size budget.
+
+        Args:
+            ref: Reference or value of the field
+
+        Returns:
+            Deeply resolved value or lazy descriptor
+        """
+        resolved = self.resolve_ref(ref)
+        lazy = self._lazy_descriptor(ref, resolved)
+        if lazy is not None:
+            return lazy
+        return self._deep_resolve(resolved)
+
+    def _lazy_descriptor(self, ref: Any, value: Any) -> Optional[Dict[str, Any]]:
+        """
+        Build a descriptor for an oversized string instead of returning it.
+
+        Args:
+            ref: Reference the value was resolved from
+            value: Resolved value
+
+        Returns:
+            Descriptor dictionary, or None if the value fits the budget
+        """
+        if (self.max_field_size is None or not isinstance(value, str)
+                or len(value) <= self.max_field_size
+                or not isinstance(ref, str) or not ref.isdigit()):
+            return None
+
+        ref_id = int(ref)
+        if ref_id not in self.lazy_refs:
+            self.lazy_refs[ref_id] = {
+                '_lazy': 'string',
+                'ref': ref_id,
+                'size': len(value),
+                'sha256': hashlib.sha256(value.encode('utf-8')).hexdigest(),
+                'preview': value[:80]
+            }
+        return self.lazy_refs[ref_id]
+
+    def _describe_binary(self, binary_ref: Any) -> Any:
+        """
+        Describe n8n binary properties without copying or decoding their data.
+
+        Args:
+            binary_ref: Reference to the item's binary block
+
+        Returns:
+            Dictionary mapping binary property names to descriptors
+        """
+        binary = self.resolve_ref(binary_ref)
+        if not isinstance(binary, dict):
+            return binary
+
+        described = {}
+        for prop_name, prop_ref in binary.items():
+            prop = self.resolve_ref(prop_ref)
+            if not isinstance(prop, dict):
+                described[prop_name] = self._deep_resolve(prop)
+                continue
+
+            descriptor = {'_lazy': 'binary'}
+            for meta in ('mimeType', 'fileName', 'fileExtension', 'fileSize', 'id'):
+                if meta in prop:
+                    descriptor[meta] = self.resolve_ref(prop[meta])
+
+            data_ref = prop.get('data')
+            encoded = self.resolve_ref(data_ref)
+            if isinstance(encoded, str) and isinstance(data_ref, str) and data_ref.isdigit():
+                ref_id = int(data_ref)
+                descriptor['ref'] = ref_id
+                descriptor['size'] = len(encoded)
+                descriptor['decodedSize'] = len(encoded) * 3 // 4 - encoded[-2:].count('=')
+                descriptor['sha256'] = hashlib.sha256(encoded.encode('ascii', 'replace')).hexdigest()
+                self.lazy_refs[ref_id] = descriptor
+
+            described[prop_name] = descriptor
+
+        return described
+
+    def _deep_resolve(self, value: Any, depth: int = 0) -> Any:
+        """
+        Deeply resolve a value, following all references with depth limiting.
+
+        Args:
+            value: Value to resolve
+            depth: Current recursion depth
+
+        Returns:
+            Fully resolved value or placeholder if depth exceeded
+        """
+        # Stop if we've exceeded max depth
+        if depth > self.max_depth:
+            return f"<max_depth_exceeded:{depth}>"
+
+        # Handle reference strings
+        if isinstance(value, str) and value.isdigit():
+            ref_id = int(value)
+
+            # Detect circular references
+            if ref_id in self._resolving:
+                return f"<circular_ref:{value}>"
+
+            self._resolving.add(ref_id)
+            try:
+                resolved = self.resolve_ref(value)
+                lazy = self._lazy_descriptor(value, resolved)
+                result = lazy if lazy is not None else self._deep_resolve(resolved, depth + 1)
+            finally:
+                self._resolving.discard(ref_id)
+
+            return result
+
+        elif isinstance(value, dict):
+            return {k: self._deep_resolve(v, depth + 1) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [self._deep_resolve(v, depth + 1) for v in value]
+        else:
+            return value
+
+
+class RunView:
+    """One node run as seen by extractors, with its output items."""
+
+    def __init__(self, node: str, index: int, run: Dict[str, Any], has_data: bool,
+                 parser: ExecutionDataParser):
+        self.node = node
+        self.index = index
+        self.raw = run
+        self.has_data = has_data  # False when the run stored no data object
+        self.items = []
+        self.start_time = run.get('startTime')
+        self.execution_time = run.get('executionTime')
+        self.execution_status = parser.resolve_ref(run.get('executionStatus'))
+        self.execution_index = run.get('executionIndex')
+
+    def output_items(self, output: int = 0) -> List['ItemView']:
+        """Items of one main output (IF/Switch nodes have several)."""
+        return [item for item in self.items if item.output == output]
+
+
+class ItemView:
+    """One output item; resolution is lazy and cached for all extractors."""
+
+    _UNSET = object()
+
+    def __init__(self, run: RunView, output: int, index: int, ref: Any, parser: ExecutionDataParser):
+        self.run = run
+        self.node = run.node
+        self.output = output
+        self.index = index
+        self.ref = ref
+        self.parser = parser
+        self._resolved = self._UNSET
+        self._llm_output = self._UNSET
+
+    @property
+    def raw(self) -> Any:
+        """Item element with references left unresolved."""
+        return self.parser.resolve_ref(self.ref)
+
+    def resolved(self) -> Dict[str, Any]:
+        """Fully resolved item (honours the parser's field size budget)."""
+        if self._resolved is self._UNSET:
+            self._resolved = self.parser._resolve_item(self.ref)
+        return self._resolved
+
+    def llm_output(self) -> Optional[Dict[str, Any]]:
+        """
+        Response, model and Ollama stats of an LLM output item.
+
+        Only the fields needed are resolved, not the whole item. The response
+        is always the full text, whatever the field size budget, so it can be
+        validated; use response_ref to apply the budget when copying it out.
+
+        Returns:
+            Dictionary with response, response_ref, model and ollama_stats, or
+            None if the item carries no response
+        """
+        if self._llm_output is self._UNSET:
+            self._llm_output = None
+            item = self.raw
+            json_obj = self.parser.resolve_ref(item.get('json')) if isinstance(item, dict) else None
+            if isinstance(json_obj, dict):
+                response = response_ref = None
+                for field in LLM_RESPONSE_FIELDS:
+                    if json_obj.get(field):
+                        response_ref = json_obj[field]
+                        response = self.parser.resolve_ref(response_ref)
+                        # Strings are literals; only containers hold further references
+                        if isinstance(response, (dict, list)):
+                            response = self.parser._deep_resolve(response)
+                        if response:
+                            break
+                if response:
+                    self._llm_output = {
+                        'response': response,
+                        'response_ref': response_ref,
+                        'model': self.parser.resolve_ref(json_obj.get('model')),
+                        'ollama_stats': extract_ollama_stats(
+                            {field: self.parser.resolve_ref(json_obj.get(field)) for field in OLLAMA_STAT_FIELDS}
+                        )
+                    }
+        return self._llm_output
+
+
+class Extractor:
+    """
+    Base class for analysis plug-ins.
+
+    For every node the walk calls node(), then for each run item() on every
+    output item followed by run() with the complete run. result() is called
+    once at the end. Override only the hooks you need.
+    """
+
+    name = ''
+
+    def __init__(self, **options):
+        self.options = options
+        self.walk = None
+
+    def start(self, walk: 'ExecutionWalk'):
+        self.walk = walk
+
+    def node(self, node_name: str):
+        pass
+
+    def item(self, item: ItemView):
+        pass
+
+    def run(self, run: RunView):
+        pass
+
+    def result(self) -> Any:
+        return None
+
+    def format_text(self, result: Any) -> List[str]:
+        """Lines for the text report (empty to leave the extractor out)."""
+        return []
+
+
+def register_extractor(cls):
+    """Class decorator making an extractor available by name."""
+    EXTRACTORS[cls.name] = cls
+    return cls
+
+
+@lru_cache(maxsize=256)
+def is_llm_node(node_name: str) -> bool:
+    """Whether a node name looks like an LLM node."""
+    return any(keyword in node_name.lower() for keyword in LLM_NODE_KEYWORDS)
+
+
+class ExecutionWalk:
+    """Single traversal of runData, fanned out to extractors."""
+
+    def __init__(self, data: List[Any], extractors: List[Extractor], max_field_size: Optional[int] = None,
+                 nodes: Optional[List[str]] = None, parser: Optional[ExecutionDataParser] = None,
+                 raw_size: Optional[int] = None):
+        """
+        Args:
+            data: Decoded execution data array
+            extractors: Extractor instances to feed
+            max_field_size: Field size budget for resolved items (see ExecutionDataParser)
+            nodes: Only walk these nodes (default: all)
+            parser: Existing parser to reuse (and share its resolution cache)
+            raw_size: Size of the stored execution data in bytes, if the caller has it
+        """
+        self.data = data
+        self.raw_size = raw_size
+        self.extractors = extractors
+        self.nodes = set(nodes) if nodes else None
+        self.parser = parser or ExecutionDataParser(data, max_field_size=max_field_size)
+
+    def run_data(self) -> Dict[str, Any]:
+        """Node name -> runs reference, or {} if this is not execution data."""
+        if len(self.data) < 5 or not isinstance(self.data[0], dict):
+            return {}
+
+        result_data = self.parser.resolve_ref(self.data[0].get('resultData'))
+        if not isinstance(result_data, dict):
+            return {}
+
+        run_data_map = self.parser.resolve_ref(result_data.get('runData'))
+        return run_data_map if isinstance(run_data_map, dict) else {}
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Walk the execution once.
+
+        Returns:
+            Dictionary mapping extractor names to their results
+        """
+        resolve = self.parser.resolve_ref
+        for extractor in self.extractors:
+            extractor.start(self)
+
+        for node_name, node_ref in self.run_data().items():
+            if self.nodes is not None and node_name not in self.nodes:
+                continue
+            runs = resolve(node_ref)
+            if not runs:
+                continue
+
+            for extractor in self.extractors:
+                extractor.node(node_name)
+            if not isinstance(runs, list):
+                continue
+
+            for run_idx, run_ref in enumerate(runs):
+                run_obj = resolve(run_ref)
+                if not run_obj or not isinstance(run_obj, dict):
+                    continue
+
+                data_obj = resolve(run_obj.get('data'))
+                run = RunView(node_name, run_idx, run_obj, bool(data_obj), self.parser)
+
+                main = resolve(data_obj.get('main')) if isinstance(data_obj, dict) else None
+                for output_idx, items_ref in enumerate(main if isinstance(main, list) else []):
+                    items = resolve(items_ref)
+                    if not items:
+                        continue
+                    # A single item may be stored without the list around it
+                    for item_idx, item_ref in enumerate(items if isinstance(items, list) else [items]):
+                        item = ItemView(run, output_idx, item_idx, item_ref, self.parser)
+                        run.items.append(item)
+                        for extractor in self.extractors:
+                            extractor.item(item)
+
+                for extractor in self.extractors:
+                    extractor.run(run)
+
+        return {extractor.name: extractor.result() for extractor in self.extractors}
+
+
+def create_extractors(names: Optional[List[str]] = None, **options) -> List[Extractor]:
+    """
+    Instantiate registered extractors by name.
+
+    Raises:
+        QueryError: If a name is not registered
+    """
+    extractors = []
+    for name in names or DEFAULT_EXTRACTORS:
+        if name not in EXTRACTORS:
+            raise QueryError(f"Unknown extractor '{name}' (available: {', '.join(EXTRACTORS)})")
+        extractors.append(EXTRACTORS[name](**options))
+    return extractors
+
+
+def analyze(data: List[Any], names: Optional[List[str]] = None, max_field_size: Optional[int] = None,
+            nodes: Optional[List[str]] = None, raw_size: Optional[int] = None, **options) -> Dict[str, Any]:
+    """
+    Run extractors over an execution in one pass.
+
+    Args:
+        data: Decoded execution data array
+        names: Extractor names (default: DEFAULT_EXTRACTORS)
+        max_field_size: Field size budget for resolved items
+        nodes: Only analyze these nodes
+        raw_size: Size of the stored execution data in bytes (see SizeAccounting)
+        **options: Extractor options (e.g. validate=True)
+
+    Returns:
+        Dictionary mapping extractor names to their results
+    """
+    extractors = create_extractors(names, **options)
+    return ExecutionWalk(data, extractors, max_field_size=max_field_size, nodes=nodes, raw_size=raw_size).run()
+
+
+@register_extractor
+class NodeOutputs(Extractor):
+    """Resolved runs per node, main output 0 only (the exec-parse output format)."""
+
+    name = 'node-outputs'
+
+    def start(self, walk):
+        super().start(walk)
+        self.node_data = {}
+
+    def node(self, node_name):
+        self.node_data[node_name] = []
+
+    def run(self, run):
+        if not run.has_data:
+            return
+        self.node_data[run.node].append({
+            'startTime': run.start_time,
+            'executionTime': run.execution_time,
+            'executionStatus': run.execution_status,
+            'executionIndex': run.execution_index,
+            'data': {
+                'main': [item.resolved() for item in run.output_items(0)]
+            }
+        })
+
+    def result(self):
+        return self.node_data
+
+
+@register_extractor
+class NodeTimings(Extractor):
+    """Runs, execution time, statuses and item counts per node."""
+
+    name = 'node-timings'
+
+    def start(self, walk):
+        super().start(walk)
+        self.nodes = {}
+
+    def node(self, node_name):
+        self.nodes[node_name] = {
+            'runs': 0,
+            'items': 0,
+            'executionTime': 0,
+            'maxExecutionTime': 0,
+            'startTime': None,
+            'statuses': {}
+        }
+
+    def run(self, run):
+        stats = self.nodes[run.node]
+        execution_time = run.execution_time or 0
+        stats['runs'] += 1
+        stats['items'] += len(run.items)
+        stats['executionTime'] += execution_time
+        stats['maxExecutionTime'] = max(stats['maxExecutionTime'], execution_time)
+        if run.start_time is not None and (stats['startTime'] is None or run.start_time < stats['startTime']):
+            stats['startTime'] = run.start_time
+        status = run.execution_status or 'unknown'
+        stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+
+    def result(self):
+        total = sum(stats['executionTime'] for stats in self.nodes.values())
+        for stats in self.nodes.values():
+            stats['pctOfTotal'] = round(stats['executionTime'] / total * 100, 1) if total else None
+        return self.nodes
+
+    def format_text(self, result):
+        lines = [f"{'NODE':<36} {'RUNS':>5} {'ITEMS':>6} {'TIME':>10} {'SHARE':>6}  STATUS"]
+        for name, stats in sorted(result.items(), key=lambda entry: -entry[1]['executionTime']):
+            share = f"{stats['pctOfTotal']:.1f}%" if stats['pctOfTotal'] is not None else '-'
+            statuses = ', '.join(f"{status} {count}" for status, count in stats['statuses'].items())
+            lines.append(f"{name[:36]:<36} {stats['runs']:>5} {stats['items']:>6} "
+                         f"{stats['executionTime'] / 1000:>9.1f}s {share:>6}  {statuses}")
+        return lines
+
+
+@register_extractor
+class LLMResponses(Extractor):
+    """
+    Responses of LLM nodes, one per output item with its itemIndex.
+
+    Options: validate=True adds JSON validation; first_item_only=True keeps one
+    response per run from the first item of main output 0, without itemIndex
+    (the original extract-llm-responses.py output).
+    """
+
+    name = 'llm-responses'
+
+    def start(self, walk):
+        super().start(walk)
+        self.responses = []
+
+    def item(self, item):
+        if not is_llm_node(item.node):
+            return
+        first_item_only = self.options.get('first_item_only')
+        if first_item_only and (item.output != 0 or item.index != 0):
+            return
+        output = item.llm_output()
+        if not output:
+            return
+
+        response = output['response']
+        # The field size budget applies to the copy in the output, not to validation
+        lazy = item.parser._lazy_descriptor(output['response_ref'], response)
+        response_data = {
+            'node': item.node,
+            'executionIndex': item.run.execution_index if item.run.execution_index is not None else item.run.index,
+            'itemIndex': item.index,
+            'executionTime': item.run.execution_time,
+            'response': lazy if lazy is not None else response,
+            'responseLength': len(str(response)),
+            'model': output['model']
+        }
+        if first_item_only:
+            del response_data['itemIndex']
+
+        if output['ollama_stats']:
+            response_data['ollamaStats'] = output['ollama_stats']
+
+        if self.options.get('validate') and isinstance(response, str):
+            response_data['validation'] = validate_json_response(response)
+
+        self.responses.append(response_data)
+
+    def result(self):
+        return self.responses
+
+    def format_text(self, result):
+        models = sorted({response['model'] for response in result if response['model']})
+        return [f"LLM responses: {len(result)}" + (f" ({', '.join(models)})" if models else '')]
+
+
+@register_extractor
+class OllamaStats(Extractor):
+    """Ollama throughput per model (see summarize_ollama_stats)."""
+
+    name = 'ollama-stats'
+
+    def start(self, walk):
+        super().start(walk)
+        self.calls = []
+
+    def item(self, item):
+        if not is_llm_node(item.node):
+            return
+        output = item.llm_output()
+        if output and output['ollama_stats']:
+            self.calls.append({'model': output['model'], 'ollamaStats': output['ollama_stats']})
+
+    def result(self):
+        return summarize_ollama_stats(self.calls)
+
+    def format_text(self, result):
+        lines = []
+        for model, stats in result.items():
+            lines.append(f"{model}: {stats['calls']} call(s), {stats['cold_loads']} cold load(s), "
+                         f"generation {stats['generation_tokens_per_second']} tokens/s, "
+                         f"prompt {stats['prompt_tokens_per_second']} tokens/s, "
+                         f"load {stats['load_seconds']}s ({stats['load_overhead_pct']}%)")
+        return lines or ['No Ollama timing data']
+
+
+@register_extractor
+class ResponseValidation(Extractor):
+    """JSON validity of LLM responses, with a preview of every invalid one."""
+
+    name = 'validation'
+
+    def start(self, walk):
+        super().start(walk)
+        self.summary = {'responses': 0, 'valid': 0, 'invalid': 0, 'invalidResponses': []}
+
+    def item(self, item):
+        if not is_llm_node(item.node):
+            return
+        output = item.llm_output()
+        if not output:
+            return
+
+        self.summary['responses'] += 1
+        response = output['response']
+        validation = validate_json_response(response if isinstance(response, str) else None)
+        if validation['valid']:
+            self.summary['valid'] += 1
+            return
+
+        self.summary['invalid'] += 1
+        self.summary['invalidResponses'].append({
+            'node': item.node,
+            'run': item.run.index,
+            'item': item.index,
+            'error': validation['error'],
+            'preview': str(response)[:PREVIEW_LENGTH]
+        })
+
+    def result(self):
+        return self.summary
+
+    def format_text(self, result):
+        lines = [f"Valid JSON: {result['valid']}/{result['responses']}"]
+        for invalid in result['invalidResponses']:
+            lines.append(f"  {invalid['node']} run {invalid['run']} item {invalid['item']}: {invalid['error']}")
+        return lines
+
+
+@register_extractor
+class SizeAccounting(Extractor):
+    """
+    Stored bytes of output items per node.
+
+    Each reference element is charged to the first item that reaches it, so
+    items shared with an earlier node cost nothing (see exec-size for a
+    field-level breakdown). The execution total is the walk's raw_size when
+    the caller passes it, so unreachable elements are never serialized.
+    """
+
+    name = 'size'
+
+    def start(self, walk):
+        super().start(walk)
+        self.seen = set()
+        self.nodes = {}
+
+    def node(self, node_name):
+        self.nodes[node_name] = {'items': 0, 'sharedItems': 0, 'storedBytes': 0}
+
+    def item(self, item):
+        stats = self.nodes[item.node]
+        stats['items'] += 1
+        if not (isinstance(item.ref, str) and item.ref.isdigit()):
+            return
+        if int(item.ref) in self.seen:
+            stats['sharedItems'] += 1
+            return
+
+        data = self.walk.data
+        stack = [int(item.ref)]
+        while stack:
+            ref_id = stack.pop()
+            if ref_id in self.seen or ref_id >= len(data):
+                continue
+            self.seen.add(ref_id)
+            stats['storedBytes'] += element_size(data, ref_id)
+            element = data[ref_id]
+            children = element.values() if isinstance(element, dict) else element if isinstance(element, list) else ()
+            stack.extend(int(child) for child in children if isinstance(child, str) and child.isdigit())
+
+    def result(self):
+        total = self.walk.raw_size
+        if total is None:
+            total = len(json.dumps(self.walk.data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        for stats in self.nodes.values():
+            stats['pctOfExecution'] = round(stats['storedBytes'] / total * 100, 1)
+        return {'executionBytes': total, 'nodes': self.nodes}
+
+    def format_text(self, result):
+        lines = [f"Execution data: {result['executionBytes'] / 1024:.1f}KB"]
+        for name, stats in sorted(result['nodes'].items(), key=lambda entry: -entry[1]['storedBytes']):
+            lines.append(f"  {name[:36]:<36} {stats['storedBytes'] / 1024:>9.1f}KB {stats['pctOfExecution']:>5.1f}%  "
+                         f"({stats['items']} items, {stats['sharedItems']} shared)")
+        return lines
+
+
+def element_size(data: List[Any], ref_id: int) -> int:
+    """Serialized size of one array element in bytes (plus its separator)."""
+    encoded = json.dumps(data[ref_id], ensure_ascii=False, separators=(',', ':'))
+    return len(encoded.encode('utf-8')) + 1
+
+
+def validate_json_response(response: str) -> Dict[str, Any]:
+    """
+    Validate if a response string is valid JSON.
+
+    Args:
+        response: String to validate
+
+    Returns:
+        Dictionary with validation results
+    """
+    result = {
+        'valid': False,
+        'error': None,
+        'length': len(response) if response else 0
+    }
+
+    if not response or not isinstance(response, str):
+        result['error'] = 'Empty or non-string response'
+        return result
+
+    try:
+        json.loads(response)
+        result['valid'] = True
+    except json.JSONDecodeError as e:
+        result['error'] = str(e)
+
+    return result
+
+
+def extract_ollama_stats(raw_fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Derive throughput from Ollama timing counters of an LLM output item.
+
+    Args:
+        raw_fields: Values of OLLAMA_STAT_FIELDS from the item's json
+
+    Returns:
+        Counters plus derived rates, or None when the output carries no Ollama
+        timing fields (e.g. OpenAI fallback or streamed responses)
+    """
+    raw = {}
+    for field in OLLAMA_STAT_FIELDS:
+        value = raw_fields.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            raw[field] = value
+
+    if not raw:
+        return None
+
+    stats = dict(raw)
+
+    def seconds(field):
+        value = raw.get(field)
+        return value / NS_PER_SECOND if value is not None else None
+
+    def rate(count_field, duration_field):
+        count = raw.get(count_field)
+        duration = seconds(duration_field)
+        if count is None or not duration:
+            return None
+        return round(count / duration, 2)
+
+    total_s = seconds('total_duration')
+    load_s = seconds('load_duration')
+
+    stats['total_seconds'] = round(total_s, 3) if total_s is not None else None
+    stats['load_seconds'] = round(load_s, 3) if load_s is not None else None
+    stats['prompt_tokens_per_second'] = rate('prompt_eval_count', 'prompt_eval_duration')
+    stats['generation_tokens_per_second'] = rate('eval_count', 'eval_duration')
+    stats['load_overhead_pct'] = (
+        round(load_s / total_s * 100, 1) if load_s is not None and total_s else None
+    )
+
+    return stats
+
+
+def summarize_ollama_stats(responses):
+    """
+    Aggregate Ollama throughput per model across a batch of LLM responses.
+
+    Token rates are computed from summed counts and durations, so long
+    calls weigh more than short ones (matching what a batch actually costs).
+    """
+    per_model = {}
+
+    for item in responses:
+        stats = item.get('ollamaStats')
+        if not stats:
+            continue
+
+        model = item.get('model') or 'unknown'
+        agg = per_model.setdefault(model, {
+            'calls': 0,
+            'cold_loads': 0,
+            'total_duration': 0,
+            'load_duration': 0,
+            'prompt_eval_count': 0,
+            'prompt_eval_duration': 0,
+            'eval_count': 0,
+            'eval_duration': 0,
+            'generation_rates': []
+        })
+
+        agg['calls'] += 1
+        for field in OLLAMA_STAT_FIELDS:
+            agg[field] += stats.get(field) or 0
+
+        # A load longer than a second means the model was (re)loaded into memory
+        if (stats.get('load_seconds') or 0) >= 1:
+            agg['cold_loads'] += 1
+        if stats.get('generation_tokens_per_second') is not None:
+            agg['generation_rates'].append(stats['generation_tokens_per_second'])
+
+    summary = {}
+    for model, agg in per_model.items():
+        rates = sorted(agg['generation_rates'])
+        total_s = agg['total_duration'] / NS_PER_SECOND
+        load_s = agg['load_duration'] / NS_PER_SECOND
+        prompt_s = agg['prompt_eval_duration'] / NS_PER_SECOND
+        eval_s = agg['eval_duration'] / NS_PER_SECOND
+
+        summary[model] = {
+            'calls': agg['calls'],
+            'cold_loads': agg['cold_loads'],
+            'prompt_tokens': agg['prompt_eval_count'],
+            'generated_tokens': agg['eval_count'],
+            'total_seconds': round(total_s, 3),
+            'load_seconds': round(load_s, 3),
+            'avg_seconds_per_call': round(total_s / agg['calls'], 3),
+            'prompt_tokens_per_second': round(agg['prompt_eval_count'] / prompt_s, 2) if prompt_s else None,
+            'generation_tokens_per_second': round(agg['eval_count'] / eval_s, 2) if eval_s else None,
+            'min_generation_tokens_per_second': rates[0] if rates else None,
+            'max_generation_tokens_per_second': rates[-1] if rates else None,
+            'load_overhead_pct': round(load_s / total_s * 100, 1) if total_s else None
+        }
+
+    return summary
+
+
+def load_execution_json(raw_data: str) -> List[Any]:
+    """
+    Decode raw execution data text.
+
+    Args:
+        raw_data: JSON text from execution_data.data
+
+    Returns:
+        The reference array
+
+    Raises:
+        QueryError: If the input is empty or not JSON
+    """
+    if not raw_data.strip():
+        raise QueryError("No input data received")
+
+    try:
+        return json.loads(raw_data)
+    except json.JSONDecodeError as e:
+        raise QueryError(f"Invalid JSON input: {e}")
+
+
+def parse_node_data(data: List[Any], max_field_size: Optional[int] = None):
+    """
+    Parse a reference array into per-node run data.
+
+    Args:
+        data: Decoded execution data array
+        max_field_size: Optional field size budget (see ExecutionDataParser)
+
+    Returns:
+        Tuple of (parser, node data mapping node names to parsed executions)
+
+    Raises:
+        QueryError: If the data is not n8n execution data
+    """
+    parser = ExecutionDataParser(data, max_field_size=max_field_size)
+    node_data = parser.get_run_data()
+    if not node_data:
+        raise QueryError("Could not parse execution data")
+
+    return parser, node_data
@@ -12,6 +12,11 @@ POSTGRES_CONTAINER="homelab-postgres"
 POSTGRES_USER="n8n"
 POSTGRES_DB="n8n"
 
+# Resident parser daemon (parse-execution-data.py --serve)
+EXEC_PARSER_SOCKET="${EXEC_PARSER_SOCKET:-/tmp/homelab-exec-parser.sock}"
+EXEC_PARSER_PID_FILE="${EXEC_PARSER_PID_FILE:-/tmp/homelab-exec-parser.pid}"
+EXEC_PARSER_LOG_FILE="${EXEC_PARSER_LOG_FILE:-/tmp/homelab-exec-parser.log}"
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Helper Functions
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -33,6 +38,187 @@ execute_postgres_query() {
     docker compose exec -T postgres psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -c "$query" 2>&1
 }
 
+# Fetch raw execution_data.data for an execution to stdout
+fetch_execution_data() {
+    local execution_id="$1"
+    local query="SELECT data FROM execution_data WHERE \"executionId\" = '${execution_id}';"
+
+    docker compose exec -T postgres psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -A -c "$query" 2>/dev/null
+}
+
+# Print a version stamp for an execution's stored data: stoppedAt and size
+# The parser daemon drops its cached parse when the stamp changes (a running
+# execution finished, exec-compact rewrote the data). octet_length reads the
+# size from the TOAST header without decompressing the data.
+fetch_execution_version() {
+    local execution_id="$1"
+    local query="SELECT e.\"stoppedAt\", octet_length(d.data) FROM execution_entity e JOIN execution_data d ON d.\"executionId\" = e.id WHERE e.id = '${execution_id}';"
+
+    docker compose exec -T postgres psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -A -F '|' -c "$query" 2>/dev/null
+}
+
+# Run a query and print its rows tab-separated, one per line
+# FETCH_COUNT makes psql read through a cursor one row at a time; without it
+# psql buffers the whole result set before printing anything
+stream_query_rows() {
+    local query="$1"
+
+    docker compose exec -T postgres psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -v FETCH_COUNT=1 \
+        -t -A -F $'\t' -c "$query" 2>/dev/null
+}
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Parser Daemon Functions
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# Check if the parser daemon is reachable (requires socat as the socket client)
+is_parser_daemon_running() {
+    [[ -S "$EXEC_PARSER_SOCKET" ]] && command -v socat >/dev/null 2>&1
+}
+
+# Send a request to the parser daemon; extra stdin (execution data) is forwarded
+# Prints the raw reply: status line (OK/MISS/ERROR) followed by the body
+send_parser_daemon_request() {
+    local header="$1"
+
+    { printf '%s\n' "$header"; cat; } | socat -t 60 - "UNIX-CONNECT:${EXEC_PARSER_SOCKET}" 2>/dev/null
+}
+
+# Build a JSON daemon request header for a parse query
+build_parser_request_header() {
+    local execution_id="$1"
+    local version="$2"
+    shift 2
+
+    local args_json="[]"
+    if [[ $# -gt 0 ]]; then
+        args_json=$(printf '%s\n' "$@" | jq -R . | jq -sc .)
+    fi
+
+    jq -cn --arg id "$execution_id" --arg version "$version" --arg cwd "$PWD" --argjson args "$args_json" \
+        '{execution_id: $id, version: $version, args: $args, cwd: $cwd}'
+}
+
+# Run a parse query through the daemon
+# Returns 0 on success, 1 on query error, 2 if the daemon could not be used
+query_parser_daemon() {
+    local execution_id="$1"
+    shift
+
+    is_parser_daemon_running || return 2
+
+    local version header
+    version=$(fetch_execution_version "$execution_id")
+    header=$(build_parser_request_header "$execution_id" "$version" "$@") || return 2
+
+    # Ask for a cached copy first, only fetch from PostgreSQL on a miss
+    local reply
+    reply=$(send_parser_daemon_request "$header" < /dev/null) || return 2
+
+    if [[ "${reply%%$'\n'*}" == "MISS" ]]; then
+        reply=$(fetch_execution_data "$execution_id" | send_parser_daemon_request "$header") || return 2
+    fi
+
+    local status="${reply%%$'\n'*}"
+    local body="${reply#*$'\n'}"
+
+    case "$status" in
+        OK)
+            echo "$body"
+            return 0
+            ;;
+        ERROR)
+            echo "Error: $body" >&2
+            return 1
+            ;;
+        *)
+            return 2
+            ;;
+    esac
+}
+
+# Print the validated LLM responses of one execution as JSON, one per output item
+# Uses the daemon's cached parse when it runs, a one-shot extraction otherwise
+fetch_llm_responses() {
+    local execution_id="$1"
+
+    local result
+    result=$(query_parser_daemon "$execution_id" --llm-only --validate-json)
+    local exit_code=$?
+
+    if [[ $exit_code -eq 2 ]]; then
+        fetch_execution_data "$execution_id" | python3 "${LIB_DIR}/extract-llm-responses.py" --validate --all-items
+        return
+    fi
+
+    [[ $exit_code -eq 0 ]] && echo "$result"
+    return $exit_code
+}
+
+# Start the parser daemon in the background
+start_parser_daemon() {
+    local cache_size="${1:-8}"
+    local parser_script="${LIB_DIR}/parse-execution-data.py"
+
+    if ! command -v socat >/dev/null 2>&1; then
+        log_warning "socat not installed - exec-* helpers cannot use the daemon"
+    fi
+
+    if [[ -f "$EXEC_PARSER_PID_FILE" ]] && kill -0 "$(cat "$EXEC_PARSER_PID_FILE")" 2>/dev/null; then
+        log_info "Parser daemon already running (PID: $(cat "$EXEC_PARSER_PID_FILE"))"
+        return 0
+    fi
+
+    nohup python3 "$parser_script" --serve --socket "$EXEC_PARSER_SOCKET" --cache-size "$cache_size" \
+        >> "$EXEC_PARSER_LOG_FILE" 2>&1 &
+    echo $! > "$EXEC_PARSER_PID_FILE"
+
+    # Wait briefly for the socket to appear
+    local i
+    for i in {1..20}; do
+        [[ -S "$EXEC_PARSER_SOCKET" ]] && break
+        sleep 0.1
+    done
+
+    if [[ -S "$EXEC_PARSER_SOCKET" ]]; then
+        log_success "✓ Parser daemon started (PID: $(cat "$EXEC_PARSER_PID_FILE"), socket: $EXEC_PARSER_SOCKET)"
+    else
+        log_error "✗ Parser daemon failed to start, see $EXEC_PARSER_LOG_FILE"
+        return 1
+    fi
+}
+
+# Stop the parser daemon
+stop_parser_daemon() {
+    if [[ ! -f "$EXEC_PARSER_PID_FILE" ]]; then
+        log_info "Parser daemon is not running"
+        return 0
+    fi
+
+    local pid
+    pid=$(cat "$EXEC_PARSER_PID_FILE")
+
+    if kill "$pid" 2>/dev/null; then
+        log_success "✓ Parser daemon stopped (PID: $pid)"
+    else
+        log_info "Parser daemon was not running"
+    fi
+
+    rm -f "$EXEC_PARSER_PID_FILE" "$EXEC_PARSER_SOCKET"
+}
+
+# Show parser daemon status and cache statistics
+show_parser_daemon_status() {
+    if ! is_parser_daemon_running; then
+        log_info "Parser daemon is not running (socket: $EXEC_PARSER_SOCKET)"
+        return 1
+    fi
+
+    local reply
+    reply=$(send_parser_daemon_request '{"command": "stats"}' < /dev/null)
+    echo "${reply#*$'\n'}" | jq .
+}
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Execution Query Functions
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -427,13 +613,18 @@ parse_execution_data() {
 
     log_info "Parsing execution data for execution ID: $execution_id"
 
-    # Extract raw data and pipe to parser
-    local query="SELECT data FROM execution_data WHERE \"executionId\" = '${execution_id}';"
     local result
+    local exit_code
 
-    result=$(docker compose exec -T postgres psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -A -c "$query" 2>/dev/null | \
-             python3 "$parser_script" "$execution_id" $options 2>&1)
-    local exit_code=$?
+    # Use the resident daemon when available, fall back to a one-shot parse
+    result=$(query_parser_daemon "$execution_id" $options 2>&1)
+    exit_code=$?
+
+    if [[ $exit_code -eq 2 ]]; then
+        result=$(fetch_execution_data "$execution_id" | \
+                 python3 "$parser_script" "$execution_id" $options 2>&1)
+        exit_code=$?
+    fi
 
     if [[ $exit_code -eq 0 ]]; then
         echo "$result"
@@ -473,12 +664,10 @@ analyze_llm_responses() {
     log_info "Analyzing LLM responses for execution ID: $execution_id"
     echo ""
 
-    # Extract LLM responses with validation
-    local query="SELECT data FROM execution_data WHERE \"executionId\" = '${execution_id}';"
+    # Extract LLM responses with validation (through the parser daemon when running)
     local llm_data
 
-    llm_data=$(docker compose exec -T postgres psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -A -c "$query" 2>/dev/null | \
-               python3 "$extractor_script" --validate 2>&1)
+    llm_data=$(fetch_llm_responses "$execution_id" 2>&1)
     local exit_code=$?
 
     if [[ $exit_code -ne 0 ]]; then
@@ -495,12 +684,20 @@ analyze_llm_responses() {
     # Extract model information
     local models=$(echo "$llm_data" | jq -r '[.[].model | select(. != null)] | unique | join(", ")' 2>/dev/null)
 
+    # Ollama throughput (only present when the LLM node returns Ollama timing fields)
+    local gen_tps=$(echo "$llm_data" | jq -r '[.[].ollamaStats.generation_tokens_per_second | select(. != null)] | if length > 0 then (add / length * 100 | round / 100) else empty end' 2>/dev/null)
+    local prompt_tps=$(echo "$llm_data" | jq -r '[.[].ollamaStats.prompt_tokens_per_second | select(. != null)] | if length > 0 then (add / length * 100 | round / 100) else empty end' 2>/dev/null)
+    local load_secs=$(echo "$llm_data" | jq -r '[.[].ollamaStats.load_seconds | select(. != null)] | if length > 0 then (add * 100 | round / 100) else empty end' 2>/dev/null)
+
     echo "═══════════════════════════════════════════════════════════════"
     echo "LLM Response Analysis Summary"
     echo "═══════════════════════════════════════════════════════════════"
     echo "Execution ID:     $execution_id"
     [[ -n "$workflow_name" ]] && echo "Workflow:         $workflow_name"
     [[ -n "$models" ]] && echo "Model(s) Used:    $models"
+    [[ -n "$gen_tps" ]] && echo "Generation:       ${gen_tps} tokens/s (avg)"
+    [[ -n "$prompt_tps" ]] && echo "Prompt Eval:      ${prompt_tps} tokens/s (avg)"
+    [[ -n "$load_secs" ]] && echo "Model Load Time:  ${load_secs}s (total)"
     echo "Total Responses:  $total"
     echo "Valid JSON:       $valid ($(awk "BEGIN {printf \"%.1f\", ($valid/$total)*100}")%)"
     echo "Invalid JSON:     $invalid ($(awk "BEGIN {printf \"%.1f\", ($invalid/$total)*100}")%)"
@@ -526,3 +723,436 @@ analyze_llm_responses() {
 
     return 0
 }
+
+# Aggregate Ollama inference throughput per model across executions
+analyze_llm_throughput() {
+    local execution_ids=("$@")
+
+    if [[ ${#execution_ids[@]} -eq 0 ]]; then
+        log_error "At least one execution ID required"
+        log_info "Usage: analyze_llm_throughput <execution_id> [execution_id...]"
+        return 1
+    fi
+
+    if ! is_postgres_running; then
+        log_error "PostgreSQL container is not running"
+        return 1
+    fi
+
+    local extractor_script="${LIB_DIR}/extract-llm-responses.py"
+    if [[ ! -f "$extractor_script" ]]; then
+        log_error "LLM extractor script not found: $extractor_script"
+        return 1
+    fi
+
+    log_info "Aggregating Ollama throughput for executions: ${execution_ids[*]}"
+    echo ""
+
+    local tmp_dir
+    tmp_dir=$(mktemp -d)
+    local input_args=()
+
+    # Responses come from the parser daemon's cache when it runs; the summary
+    # is computed over all of them so rates are weighted across executions
+    for execution_id in "${execution_ids[@]}"; do
+        local responses_file="${tmp_dir}/llm-${execution_id}.json"
+
+        if ! fetch_llm_responses "$execution_id" > "$responses_file" 2>/dev/null || [[ ! -s "$responses_file" ]]; then
+            log_warning "No execution data found for ID: $execution_id (skipped)"
+            continue
+        fi
+        input_args+=(--input "$responses_file")
+    done
+
+    if [[ ${#input_args[@]} -eq 0 ]]; then
+        rm -rf "$tmp_dir"
+        log_error "No execution data found"
+        return 1
+    fi
+
+    local summary
+    summary=$(python3 "$extractor_script" --summary --from-responses "${input_args[@]}" 2>&1)
+    local exit_code=$?
+    rm -rf "$tmp_dir"
+
+    if [[ $exit_code -ne 0 ]]; then
+        log_error "Failed to extract Ollama statistics"
+        echo "$summary" >&2
+        return 1
+    fi
+
+    if [[ "$summary" == "{}" ]]; then
+        log_warning "No Ollama timing data found in LLM node outputs"
+        return 0
+    fi
+
+    echo "═══════════════════════════════════════════════════════════════"
+    echo "Ollama Throughput by Model"
+    echo "═══════════════════════════════════════════════════════════════"
+    echo "$summary" | jq -r 'to_entries[] |
+        "Model:            \(.key)\n" +
+        "Calls:            \(.value.calls) (cold loads: \(.value.cold_loads))\n" +
+        "Generation:       \(.value.generation_tokens_per_second) tokens/s (min \(.value.min_generation_tokens_per_second), max \(.value.max_generation_tokens_per_second))\n" +
+        "Prompt Eval:      \(.value.prompt_tokens_per_second) tokens/s\n" +
+        "Avg Call Time:    \(.value.avg_seconds_per_call)s\n" +
+        "Load Overhead:    \(.value.load_seconds)s (\(.value.load_overhead_pct)% of inference time)\n" +
+        "───────────────────────────────────────────────────────────────"'
+
+    return 0
+}
+
+# Structurally compare executions (first ID is the baseline)
+compare_executions() {
+    local execution_ids=()
+    local options=()
+
+    # Split execution IDs from pass-through options (--format, --max-fields)
+    while [[ $# -gt 0 ]]; do
+        case "$1" in
+            --*)
+                options+=("$1" "$2")
+                shift 2
+                ;;
+            *)
+                execution_ids+=("$1")
+                shift
+                ;;
+        esac
+    done
+
+    if [[ ${#execution_ids[@]} -lt 2 ]]; then
+        log_error "At least two execution IDs required"
+        log_info "Usage: compare_executions <baseline_id> <execution_id> [execution_id...] [--format json]"
+        return 1
+    fi
+
+    if ! is_postgres_running; then
+        log_error "PostgreSQL container is not running"
+        return 1
+    fi
+
+    local compare_script="${LIB_DIR}/compare-executions.py"
+    if [[ ! -f "$compare_script" ]]; then
+        log_error "Compare script not found: $compare_script"
+        return 1
+    fi
+
+    # The comparison hashes the raw reference arrays of several executions at
+    # once, which the per-execution daemon protocol does not serve, so the
+    # data is fetched from PostgreSQL directly
+    log_info "Comparing executions: ${execution_ids[*]} (baseline: ${execution_ids[0]})"
+    echo ""
+
+    local tmp_dir
+    tmp_dir=$(mktemp -d)
+    local input_args=()
+
+    for execution_id in "${execution_ids[@]}"; do
+        local data_file="${tmp_dir}/exec-${execution_id}.json"
+
+        fetch_execution_data "$execution_id" > "$data_file"
+
+        if [[ ! -s "$data_file" ]]; then
+            rm -rf "$tmp_dir"
+            log_error "No execution data found for ID: $execution_id"
+            return 1
+        fi
+        input_args+=(--input "$data_file" --label "$execution_id")
+    done
+
+    local result
+    result=$(python3 "$compare_script" "${input_args[@]}" "${options[@]}" 2>&1)
+    local exit_code=$?
+    rm -rf "$tmp_dir"
+
+    if [[ $exit_code -ne 0 ]]; then
+        log_error "✗ Failed to compare executions"
+        echo "$result" >&2
+        return 1
+    fi
+
+    echo "$result"
+    return 0
+}
+
+# Incrementally index finished executions into the local full-text index
+index_executions() {
+    local extra_options=("$@")
+
+    if ! is_postgres_running; then
+        log_error "PostgreSQL container is not running"
+        return 1
+    fi
+
+    local index_script="${LIB_DIR}/index-executions.py"
+    if [[ ! -f "$index_script" ]]; then
+        log_error "Index script not found: $index_script"
+        return 1
+    fi
+
+    # Only fetch executions that finished since the last indexed one
+    local watermark
+    watermark=$(python3 "$index_script" watermark)
+
+    local since_clause=""
+    if [[ -n "$watermark" ]]; then
+        since_clause="AND e.\"stoppedAt\" >= '${watermark}'"
+        log_info "Indexing executions finished since ${watermark}..."
+    else
+        log_info "Building execution index from full history..."
+    fi
+
+    local query="
+SELECT d.\"executionId\", COALESCE(w.name, ''), e.\"stoppedAt\", d.data
+FROM execution_data d
+JOIN execution_entity e ON e.id = d.\"executionId\"
+LEFT JOIN workflow_entity w ON e.\"workflowId\" = w.id
+WHERE e.\"stoppedAt\" IS NOT NULL
+  AND e.\"deletedAt\" IS NULL
+  ${since_clause}
+ORDER BY e.\"stoppedAt\";
+"
+
+    # Rows are fetched one at a time, so neither psql nor the indexer holds
+    # more than one execution in memory
+    stream_query_rows "$query" | python3 "$index_script" index "${extra_options[@]}"
+    local exit_code=${PIPESTATUS[1]}
+
+    if [[ $exit_code -eq 0 ]]; then
+        log_success "✓ Execution index updated"
+    else
+        log_error "✗ Failed to update execution index"
+        return 1
+    fi
+
+    return 0
+}
+
+# Search the local full-text index of execution outputs
+search_executions() {
+    local query="$1"
+
+    if [[ -z "$query" ]]; then
+        log_error "Search query required"
+        log_info "Usage: search_executions <query> [--node <name>] [--limit <n>] [--like] [--format json]"
+        log_info "Examples: '\"parse entities\"' (phrase), 'categor*' (prefix), '%**%' --like (substring)"
+        return 1
+    fi
+
+    local index_script="${LIB_DIR}/index-executions.py"
+    if [[ ! -f "$index_script" ]]; then
+        log_error "Index script not found: $index_script"
+        return 1
+    fi
+
+    shift
+    python3 "$index_script" search "$query" "$@"
+}
+
+# Report node timings, LLM responses, Ollama throughput, validation and size
+# for one or more executions in a single pass over each
+execution_report() {
+    local execution_ids=()
+    local report_options=()
+
+    while [[ $# -gt 0 ]]; do
+        case "$1" in
+            --extractor|--node|--max-field-size|--format) report_options+=("$1" "$2"); shift 2 ;;
+            --*) report_options+=("$1"); shift ;;
+            *) execution_ids+=("$1"); shift ;;
+        esac
+    done
+
+    if [[ ${#execution_ids[@]} -eq 0 ]]; then
+        log_error "At least one execution ID required"
+        log_info "Usage: execution_report <execution_id> [execution_id...] [--extractor <name>] [--node <name>] [--format json]"
+        return 1
+    fi
+
+    local execution_id
+    for execution_id in "${execution_ids[@]}"; do
+        if ! [[ "$execution_id" =~ ^[0-9]+$ ]]; then
+            log_error "Invalid execution ID: $execution_id"
+            return 1
+        fi
+    done
+
+    if ! is_postgres_running; then
+        log_error "PostgreSQL container is not running"
+        return 1
+    fi
+
+    local report_script="${LIB_DIR}/execution-report.py"
+    if [[ ! -f "$report_script" ]]; then
+        log_error "Report script not found: $report_script"
+        return 1
+    fi
+
+    log_info "Analyzing execution(s): ${execution_ids[*]}"
+
+    local id_list
+    id_list=$(IFS=,; echo "${execution_ids[*]}")
+    local query="
+SELECT d.\"executionId\", COALESCE(w.name, ''), e.\"stoppedAt\", d.data
+FROM execution_data d
+JOIN execution_entity e ON e.id = d.\"executionId\"
+LEFT JOIN workflow_entity w ON e.\"workflowId\" = w.id
+WHERE d.\"executionId\" IN (${id_list})
+ORDER BY e.id;
+"
+
+    # Rows are fetched one at a time, so only one execution is held in memory
+    stream_query_rows "$query" | python3 "$report_script" "${report_options[@]}"
+}
+
+# Attribute stored execution data size to workflows, nodes and fields
+profile_execution_sizes() {
+    local limit=100
+    local workflow=""
+    local profiler_options=()
+
+    while [[ $# -gt 0 ]]; do
+        case "$1" in
+            --limit) limit="$2"; shift 2 ;;
+            --workflow) workflow="$2"; shift 2 ;;
+            *) profiler_options+=("$1"); shift ;;
+        esac
+    done
+
+    if ! [[ "$limit" =~ ^[0-9]+$ ]]; then
+        log_error "Invalid --limit: $limit"
+        return 1
+    fi
+
+    if ! is_postgres_running; then
+        log_error "PostgreSQL container is not running"
+        return 1
+    fi
+
+    local profile_script="${LIB_DIR}/profile-execution-size.py"
+    if [[ ! -f "$profile_script" ]]; then
+        log_error "Profiler script not found: $profile_script"
+        return 1
+    fi
+
+    local workflow_clause=""
+    if [[ -n "$workflow" ]]; then
+        workflow_clause="AND w.name = '${workflow//\'/\'\'}'"
+    fi
+
+    log_info "Profiling data size of the last ${limit} execution(s)${workflow:+ of '$workflow'}..."
+
+    local query="
+SELECT d.\"executionId\", COALESCE(w.name, ''), e.\"stoppedAt\", d.data
+FROM execution_data d
+JOIN execution_entity e ON e.id = d.\"executionId\"
+LEFT JOIN workflow_entity w ON e.\"workflowId\" = w.id
+WHERE e.\"deletedAt\" IS NULL
+  ${workflow_clause}
+ORDER BY e.id DESC
+LIMIT ${limit};
+"
+
+    # Rows are fetched one at a time, so only one execution is held in memory
+    stream_query_rows "$query" | python3 "$profile_script" "${profiler_options[@]}"
+}
+
+# Shrink stored data of old executions (drop binary data, truncate strings, empty nodes)
+# Dry run by default; --apply writes the compacted rows back in batched transactions
+compact_executions() {
+    local older_than=30
+    local limit=500
+    local workflow=""
+    local apply=false
+    local confirm="prompt"
+    local compact_options=()
+
+    while [[ $# -gt 0 ]]; do
+        case "$1" in
+            --older-than) older_than="$2"; shift 2 ;;
+            --limit) limit="$2"; shift 2 ;;
+            --workflow) workflow="$2"; shift 2 ;;
+            --apply) apply=true; shift ;;
+            --yes) confirm="skip"; shift ;;
+            *) compact_options+=("$1"); shift ;;
+        esac
+    done
+
+    if ! [[ "$older_than" =~ ^[0-9]+$ && "$limit" =~ ^[0-9]+$ ]]; then
+        log_error "--older-than and --limit must be whole numbers"
+        return 1
+    fi
+
+    if ! is_postgres_running; then
+        log_error "PostgreSQL container is not running"
+        return 1
+    fi
+
+    local compact_script="${LIB_DIR}/compact-executions.py"
+    if [[ ! -f "$compact_script" ]]; then
+        log_error "Compaction script not found: $compact_script"
+        return 1
+    fi
+
+    local workflow_clause=""
+    if [[ -n "$workflow" ]]; then
+        workflow_clause="AND w.name = '${workflow//\'/\'\'}'"
+    fi
+
+    # Only finished executions; running ones are still being written by n8n
+    local query="
+SELECT d.\"executionId\", COALESCE(w.name, ''), e.\"stoppedAt\", d.data
+FROM execution_data d
+JOIN execution_entity e ON e.id = d.\"executionId\"
+LEFT JOIN workflow_entity w ON e.\"workflowId\" = w.id
+WHERE e.\"deletedAt\" IS NULL
+  AND e.\"stoppedAt\" IS NOT NULL
+  AND e.\"stoppedAt\" < NOW() - INTERVAL '${older_than} days'
+  ${workflow_clause}
+ORDER BY e.id
+LIMIT ${limit};
+"
+
+    if [[ "$apply" != true ]]; then
+        log_info "Dry run: compacting up to ${limit} execution(s) older than ${older_than} days${workflow:+ of '$workflow'}..."
+        stream_query_rows "$query" | python3 "$compact_script" "${compact_options[@]}"
+        return
+    fi
+
+    if [[ "$confirm" == "prompt" ]]; then
+        read -p "Rewrite execution data of up to ${limit} execution(s)? Removed data cannot be recovered. (y/N) " -n 1 -r
+        echo
+        if [[ ! $REPLY =~ ^[Yy]$ ]]; then
+            log_info "Compaction skipped"
+            return 0
+        fi
+    fi
+
+    log_info "Compacting up to ${limit} execution(s) older than ${older_than} days${workflow:+ of '$workflow'}..."
+
+    # Rows are fetched one at a time; each batch of UPDATEs is one transaction
+    # and ON_ERROR_STOP aborts on the first failure
+    stream_query_rows "$query" | \
+        python3 "$compact_script" --sql "${compact_options[@]}" | \
+        docker compose exec -T postgres psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -q -v ON_ERROR_STOP=1 >/dev/null
+
+    local status=("${PIPESTATUS[@]}")
+    if [[ ${status[1]} -ne 0 || ${status[2]} -ne 0 ]]; then
+        log_error "Compaction failed (batches committed before the failure are kept)"
+        return 1
+    fi
+    log_success "✓ Compaction complete (space is reused after autovacuum; VACUUM FULL execution_data returns it to the OS)"
+}
+
+# Benchmark the execution data parsers on synthetic executions
+# (no database needed; compares against a stored baseline)
+benchmark_parsers() {
+    local benchmark_script="${LIB_DIR}/benchmark-parsers.py"
+    if [[ ! -f "$benchmark_script" ]]; then
+        log_error "Benchmark script not found: $benchmark_script"
+        return 1
+    fi
+
+    log_info "Benchmarking execution parsers (throughput, peak RSS, output size)..."
+    python3 "$benchmark_script" "$@"
+}
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Synthetic N8N Execution Data Generator
+
+Emits valid flatted-format execution_data arrays (the reference array stored in
+execution_data.data) shaped like the email summarisation workflows: a mail
+fetch node, intermediate processing nodes, Ollama LLM nodes with timing fields
+and a Telegram formatting node. Used to measure the parsers on realistic sizes
+without a Postgres dump (see benchmark-parsers.py).
+
+Output is deterministic for a given --seed.
+
+Usage:
+    ./generate-execution-data.py [options] > execution.json
+
+Options:
+    --nodes <n>             Total nodes in runData (default: 5, minimum 3)
+    --llm-nodes <n>         How many of them are LLM nodes (default: 1)
+    --items <n>             Items per node run (default: 10)
+    --runs <n>              Runs per node (default: 1)
+    --string-size <n>       Approximate characters per email body (default: 2048)
+    --binary-size <n>       Bytes of binary attachment per fetched email (default: 0)
+    --sharing <ratio>       Fraction of items passed through unchanged, so their
+                            objects are shared by reference (default: 0.3)
+    --seed <n>              Random seed (default: 1)
+
+Examples:
+    # Gmail batch: 50 emails with 200KB attachments, 2 LLM passes
+    ./generate-execution-data.py --items 50 --binary-size 200000 --llm-nodes 2 > batch.json
+    ./parse-execution-data.py 0 --input batch.json --llm-only
+"""
+
+import sys
+import json
+import base64
+import random
+import argparse
+from typing import Any, Dict, List
+
+WORDS = (
+    'invoice meeting project update please review attached schedule budget '
+    'delivery customer order request confirm thanks regards team report weekly '
+    'status deadline account payment shipping support ticket issue resolved'
+).split()
+
+MODELS = ['qwen2.5:1.5b', 'llama3.2:3b', 'qwen2.5:7b']
+
+
+def flatten(root: Any) -> List[Any]:
+    """
+    Encode a value in n8n's flatted format.
+
+    Containers and strings become array elements referenced by their index as a
+    digit string; strings are deduplicated by value and containers by identity,
+    so objects reused across items become shared references like in n8n.
+    """
+    output = []
+    known = {}
+
+    def encode(value):
+        if isinstance(value, str):
+            key = ('s', value)
+        elif isinstance(value, (dict, list)):
+            key = ('o', id(value))
+        else:
+            return value
+
+        if key in known:
+            return known[key]
+
+        ref = str(len(output))
+        known[key] = ref
+        output.append(None)
+        if isinstance(value, str):
+            output[int(ref)] = value
+        elif isinstance(value, dict):
+            output[int(ref)] = {k: encode(v) for k, v in value.items()}
+        else:
+            output[int(ref)] = [encode(v) for v in value]
+        return ref
+
+    encode(root)
+    return output
+
+
+def make_text(rng: random.Random, size: int) -> str:
+    """Generate roughly `size` characters of email-like text."""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:size]
+
+
+def make_run(items: List[Dict[str, Any]], start_time: int, execution_time: int) -> Dict[str, Any]:
+    """Build one node run (taskData) with a single main output."""
+    return {
+        'startTime': start_time,
+        'executionTime': execution_time,
+        'executionStatus': 'success',
+        'source': [{'previousNode': 'Trigger'}],
+        'data': {'main': [items]}
+    }
+
+
+def make_llm_item(rng: random.Random, model: str, index: int, size: int) -> Dict[str, Any]:
+    """Build an Ollama /api/generate output item with timing fields (nanoseconds)."""
+    response = json.dumps({
+        'summary': make_text(rng, max(20, size // 8)),
+        'category': rng.choice(['work', 'personal', 'billing', 'newsletter']),
+        'priority': rng.randint(1, 5)
+    })
+    eval_count = rng.randint(80, 400)
+    prompt_count = rng.randint(300, 1500)
+    eval_ns = eval_count * rng.randint(60, 200) * 1_000_000
+    prompt_ns = prompt_count * rng.randint(5, 30) * 1_000_000
+    load_ns = rng.choice([0, rng.randint(500, 4000) * 1_000_000])
+    return {
+        'json': {
+            'model': model,
+            'response': response,
+            'done': True,
+            'total_duration': load_ns + prompt_ns + eval_ns,
+            'load_duration': load_ns,
+            'prompt_eval_count': prompt_count,
+            'prompt_eval_duration': prompt_ns,
+            'eval_count': eval_count,
+            'eval_duration': eval_ns
+        },
+        'pairedItem': {'item': index}
+    }
+
+
+def generate_execution(nodes: int = 5, llm_nodes: int = 1, items: int = 10, runs: int = 1,
+                       string_size: int = 2048, binary_size: int = 0, sharing: float = 0.3,
+                       seed: int = 1) -> Dict[str, Any]:
+    """
+    Build the (unflattened) execution data object.
+
+    Returns:
+        Root object with startData, resultData.runData and executionData
+    """
+    rng = random.Random(seed)
+    nodes = max(3, nodes)
+    llm_nodes = max(0, min(llm_nodes, nodes - 2))
+    start_time = 1730570000000
+
+    emails = []
+    for idx in range(items):
+        item = {
+            'json': {
+                'id': f'18c{rng.getrandbits(48):012x}',
+                'threadId': f'18c{rng.getrandbits(48):012x}',
+                'from': f'sender{idx}@example.com',
+                'subject': make_text(rng, 60),
+                'text': make_text(rng, string_size),
+                'labelIds': ['INBOX', 'UNREAD']
+            },
+            'pairedItem': {'item': 0}
+        }
+        if binary_size:
+            payload = rng.getrandbits(binary_size * 8).to_bytes(binary_size, 'little')
+            item['binary'] = {
+                'attachment_0': {
+                    'data': base64.b64encode(payload).decode('ascii'),
+                    'mimeType': 'application/pdf',
+                    'fileName': f'invoice-{idx}.pdf',
+                    'fileExtension': 'pdf',
+                    'fileSize': f'{binary_size / 1024:.1f} kB'
+                }
+            }
+        emails.append(item)
+
+    run_data = {'Get Unread Emails': [make_run(emails, start_time, rng.randint(500, 3000))]}
+    previous = emails
+
+    for node_idx in range(nodes - 2):
+        is_llm = node_idx >= nodes - 2 - llm_nodes
+        if is_llm:
+            llm_idx = node_idx - (nodes - 2 - llm_nodes)
+            name = 'Summarise Email with LLM' + (f' {llm_idx + 1}' if llm_idx else '')
+        else:
+            name = f'Process Email {node_idx + 1}'
+
+        node_runs = []
+        for run_idx in range(runs):
+            output = []
+            for idx, source in enumerate(previous):
+                if is_llm:
+                    output.append(make_llm_item(rng, MODELS[node_idx % len(MODELS)], idx, string_size))
+                elif rng.random() < sharing:
+                    # Passed through unchanged: n8n stores the same object again
+                    output.append(source)
+                else:
+                    output.append({
+                        'json': {**source['json'], 'step': node_idx, 'cleaned': make_text(rng, string_size // 2)},
+                        'pairedItem': {'item': idx}
+                    })
+            execution_time = rng.randint(4000, 60000) if is_llm else rng.randint(5, 200)
+            node_runs.append(make_run(output, start_time + run_idx * 1000, execution_time))
+        run_data[name] = node_runs
+        previous = node_runs[-1]['data']['main'][0]
+
+    run_data['Format for Telegram'] = [make_run(
+        [{'json': {'text': f"*{make_text(rng, 40)}*\n{make_text(rng, 200)}"}, 'pairedItem': {'item': idx}}
+         for idx in range(len(previous))],
+        start_time, rng.randint(5, 50)
+    )]
+
+    return {
+        'startData': {},
+        'resultData': {
+            'runData': run_data,
+            'lastNodeExecuted': 'Format for Telegram'
+        },
+        'executionData': {
+            'contextData': {},
+            'nodeExecutionStack': [],
+            'waitingExecution': {},
+            'waitingExecutionSource': {}
+        }
+    }
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (shared with benchmark-parsers.py profiles)."""
+    parser = argparse.ArgumentParser(
+        description='Generate synthetic n8n execution data (flatted format)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--nodes', type=int, default=5, help='Total nodes in runData')
+    parser.add_argument('--llm-nodes', type=int, default=1, help='Number of LLM nodes')
+    parser.add_argument('--items', type=int, default=10, help='Items per node run')
+    parser.add_argument('--runs', type=int, default=1, help='Runs per node')
+    parser.add_argument('--string-size', type=int, default=2048, help='Characters per email body')
+    parser.add_argument('--binary-size', type=int, default=0, help='Attachment bytes per email (0 = none)')
+    parser.add_argument('--sharing', type=float, default=0.3, help='Fraction of items passed through by reference')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--output', type=str, help='Write to file instead of stdout')
+    return parser
+
+
+def main():
+    """Main entry point for CLI usage."""
+    args = build_arg_parser().parse_args()
+
+    data = flatten(generate_execution(
+        nodes=args.nodes, llm_nodes=args.llm_nodes, items=args.items, runs=args.runs,
+        string_size=args.string_size, binary_size=args.binary_size,
+        sharing=args.sharing, seed=args.seed
+    ))
+    output = json.dumps(data, separators=(',', ':'))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+        print(f"Wrote {len(data)} elements ({len(output)} bytes) to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
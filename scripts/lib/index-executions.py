@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+N8N Execution Full-Text Index
+
+Indexes resolved string values from n8n executions into a local SQLite FTS5
+database, tagged with execution, node, run, item and field path, so past
+LLM outputs can be searched across months of history (e.g. every execution
+whose Telegram message contained a construct that broke Markdown parsing).
+
+Indexing is incremental: executions already in the index are skipped and the
+latest indexed stoppedAt timestamp is kept as a watermark for the next fetch.
+
+Usage:
+    ./index-executions.py index [--db <file>] < rows.tsv
+    ./index-executions.py watermark [--db <file>]
+    ./index-executions.py search <query> [--db <file>] [--node <name>] [--limit <n>]
+    ./index-executions.py stats [--db <file>]
+
+Input for `index` is one execution per line, tab-separated:
+    <execution_id> <workflow_name> <stopped_at> <execution_data_json>
+(JSON text never contains raw tabs or newlines, so psql -t -A -F $'\\t' output
+can be piped in directly and is processed one execution at a time.)
+
+Search queries use FTS5 syntax:
+    "error parsing"        phrase
+    summar*                prefix
+    telegram AND markdown  boolean
+Use --like for substring matches on punctuation the tokenizer ignores
+(e.g. search '%**%' --like).
+
+Examples:
+    ./index-executions.py search '"can'"'"'t parse entities"'
+    ./index-executions.py search 'categor*' --node "Summarise Email with LLM"
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+import execution_analysis
+
+DEFAULT_DB_PATH = os.getenv(
+    'EXEC_INDEX_DB',
+    str(Path.home() / '.cache' / 'homelab' / 'execution-index.db')
+)
+
+# Strings above this size (and all binary data) are not indexed
+DEFAULT_MAX_FIELD_SIZE = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id INTEGER PRIMARY KEY,
+    workflow TEXT,
+    stopped_at TEXT,
+    indexed_at TEXT NOT NULL,
+    field_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS executions_stopped_at ON executions (stopped_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS fields USING fts5 (
+    value,
+    execution_id UNINDEXED,
+    node UNINDEXED,
+    run UNINDEXED,
+    item UNINDEXED,
+    field UNINDEXED,
+    tokenize = 'unicode61',
+    prefix = '2 3'
+);
+"""
+
+
+def open_index(db_path: str) -> sqlite3.Connection:
+    """Open (and create if needed) the index database."""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def iter_string_fields(value: Any, path: str = '') -> Iterator[Tuple[str, str]]:
+    """
+    Yield (field_path, text) for every string inside a resolved value.
+
+    Lazy descriptors (binary data, oversized strings) are skipped.
+    """
+    if isinstance(value, str):
+        if value.strip():
+            yield path, value
+    elif isinstance(value, dict):
+        if '_lazy' in value:
+            return
+        for key, child in value.items():
+            yield from iter_string_fields(child, f"{path}.{key}" if path else key)
+    elif isinstance(value, list):
+        for idx, child in enumerate(value):
+            yield from iter_string_fields(child, f"{path}[{idx}]")
+
+
+def iter_execution_fields(data: Any, max_field_size: int) -> Iterator[Tuple[str, int, int, str, str]]:
+    """
+    Yield (node, run, item, field_path, text) for one execution's output items.
+
+    Raises:
+        QueryError: If the data is not n8n execution data
+    """
+    _, node_data = execution_analysis.parse_node_data(data, max_field_size)
+
+    for node_name, runs in node_data.items():
+        for run_idx, run in enumerate(runs):
+            for item_idx, item in enumerate(run.get('data', {}).get('main', [])):
+                for field_path, text in iter_string_fields(item):
+                    yield node_name, run_idx, item_idx, field_path, text
+
+
+def index_rows(conn: sqlite3.Connection, rows, max_field_size: int, reindex: bool = False) -> dict:
+    """
+    Index tab-separated execution rows, one transaction per execution.
+
+    Args:
+        conn: Index database connection
+        rows: Iterable of lines (execution_id, workflow, stopped_at, data)
+        max_field_size: Strings above this size are not indexed
+        reindex: Replace executions that are already indexed
+
+    Returns:
+        Counters for indexed, skipped and failed executions and fields
+    """
+    counts = {'indexed': 0, 'skipped': 0, 'failed': 0, 'fields': 0}
+
+    for line in rows:
+        line = line.rstrip('\n')
+        if not line.strip():
+            continue
+
+        parts = line.split('\t', 3)
+        if len(parts) != 4 or not parts[0].strip().isdigit():
+            print(f"Warning: Skipping malformed row: {line[:60]}", file=sys.stderr)
+            counts['failed'] += 1
+            continue
+
+        execution_id, workflow, stopped_at, raw_data = parts
+        execution_id = int(execution_id)
+
+        exists = conn.execute(
+            "SELECT 1 FROM executions WHERE execution_id = ?", (execution_id,)
+        ).fetchone()
+        if exists and not reindex:
+            counts['skipped'] += 1
+            continue
+
+        try:
+            data = execution_analysis.load_execution_json(raw_data)
+            fields = [
+                (text, execution_id, node, run, item, field)
+                for node, run, item, field, text in iter_execution_fields(data, max_field_size)
+            ]
+        except execution_analysis.QueryError as e:
+            print(f"Warning: Execution {execution_id}: {e}", file=sys.stderr)
+            counts['failed'] += 1
+            continue
+
+        with conn:
+            conn.execute("DELETE FROM fields WHERE execution_id = ?", (execution_id,))
+            conn.executemany(
+                "INSERT INTO fields (value, execution_id, node, run, item, field) VALUES (?, ?, ?, ?, ?, ?)",
+                fields
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO executions (execution_id, workflow, stopped_at, indexed_at, field_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (execution_id, workflow or None, stopped_at or None,
+                 datetime.now().isoformat(timespec='seconds'), len(fields))
+            )
+
+        counts['indexed'] += 1
+        counts['fields'] += len(fields)
+
+    return counts
+
+
+def search(conn: sqlite3.Connection, query: str, node: str = None, limit: int = 20,
+           like: bool = False) -> list:
+    """
+    Search indexed values.
+
+    Args:
+        conn: Index database connection
+        query: FTS5 match expression, or LIKE pattern when like=True
+        node: Restrict results to this node name
+        limit: Maximum number of results
+
+    Returns:
+        List of matches with execution, node, location and a snippet
+    """
+    columns = ("SELECT fields.execution_id, e.workflow, e.stopped_at, fields.node, fields.run, "
+               "fields.item, fields.field, ")
+    joined = "FROM fields LEFT JOIN executions e ON e.execution_id = fields.execution_id "
+
+    if like:
+        sql = (columns + "substr(fields.value, max(1, instr(fields.value, ?) - 40), 120) " + joined +
+               "WHERE fields.value LIKE ?")
+        params = [query.strip('%').replace('%', ''), query]
+    else:
+        sql = columns + "snippet(fields, 0, '[', ']', '…', 16) " + joined + "WHERE fields MATCH ?"
+        params = [query]
+
+    if node:
+        sql += " AND fields.node = ?"
+        params.append(node)
+
+    sql += " ORDER BY fields.execution_id DESC" if like else " ORDER BY bm25(fields)"
+    sql += " LIMIT ?"
+    params.append(limit)
+
+    keys = ['executionId', 'workflow', 'stoppedAt', 'node', 'run', 'item', 'field', 'snippet']
+    return [dict(zip(keys, row)) for row in conn.execute(sql, params)]
+
+
+def get_watermark(conn: sqlite3.Connection) -> str:
+    """Return the latest indexed stoppedAt timestamp (empty if nothing indexed)."""
+    row = conn.execute("SELECT MAX(stopped_at) FROM executions").fetchone()
+    return row[0] or ''
+
+
+def main():
+    """Main entry point for CLI usage."""
+    parser = argparse.ArgumentParser(
+        description='Full-text index of n8n execution outputs',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--db', type=str, default=DEFAULT_DB_PATH, help='Index database path')
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    index_parser = subparsers.add_parser('index', help='Index execution rows from stdin')
+    index_parser.add_argument('--max-field-size', type=int, default=DEFAULT_MAX_FIELD_SIZE,
+                              help='Skip strings longer than this (binary data is never indexed)')
+    index_parser.add_argument('--reindex', action='store_true', help='Re-index executions already present')
+
+    subparsers.add_parser('watermark', help='Print latest indexed stoppedAt timestamp')
+
+    search_parser = subparsers.add_parser('search', help='Search indexed values')
+    search_parser.add_argument('query', type=str, help='FTS5 query (or LIKE pattern with --like)')
+    search_parser.add_argument('--node', type=str, help='Restrict to a node name')
+    search_parser.add_argument('--limit', type=int, default=20, help='Maximum results')
+    search_parser.add_argument('--like', action='store_true', help='Substring match instead of FTS query')
+    search_parser.add_argument('--format', choices=['json', 'text'], default='text', help='Output format')
+
+    subparsers.add_parser('stats', help='Show index statistics')
+
+    args = parser.parse_args()
+    conn = open_index(args.db)
+
+    if args.command == 'index':
+        counts = index_rows(conn, sys.stdin, args.max_field_size, args.reindex)
+        print(f"Indexed {counts['indexed']} execution(s), {counts['fields']} field(s); "
+              f"skipped {counts['skipped']}, failed {counts['failed']}", file=sys.stderr)
+        if counts['failed'] and not counts['indexed']:
+            sys.exit(1)
+
+    elif args.command == 'watermark':
+        print(get_watermark(conn))
+
+    elif args.command == 'search':
+        try:
+            results = search(conn, args.query, args.node, args.limit, args.like)
+        except sqlite3.OperationalError as e:
+            print(f"Error: Invalid search query: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        if args.format == 'json':
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            for r in results:
+                snippet = ' '.join(str(r['snippet']).split())
+                print(f"#{r['executionId']} {r['workflow'] or ''} ({r['stoppedAt'] or '?'})")
+                print(f"    {r['node']} [run {r['run']}, item {r['item']}] {r['field']}")
+                print(f"    {snippet}")
+            print(f"{len(results)} match(es)", file=sys.stderr)
+
+    elif args.command == 'stats':
+        executions, fields = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(field_count), 0) FROM executions"
+        ).fetchone()
+        oldest, newest = conn.execute(
+            "SELECT MIN(stopped_at), MAX(stopped_at) FROM executions"
+        ).fetchone()
+        size = os.path.getsize(args.db) if os.path.exists(args.db) else 0
+        print(json.dumps({
+            'db': args.db,
+            'executions': executions,
+            'fields': fields,
+            'oldest': oldest,
+            'newest': newest,
+            'sizeBytes': size
+        }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,10 +8,13 @@ source "$(dirname "${BASH_SOURCE[0]}")/common.sh"
 declare -a MONITORING_SERVICES=(
     "prometheus:9090:/metrics"
     "grafana:3000:/api/health"
-    "thermal-exporter:9200:/metrics"
+    "thermal-exporter:9200:/healthz"
     "node-exporter:9100:/metrics"
 )
 
+# Latest exporter readings, published to /dev/shm by the thermal exporter
+THERMAL_SNAPSHOT_READER="$(dirname "${BASH_SOURCE[0]}")/thermal-snapshot.py"
+
 # PostgreSQL configuration (matches executions.sh)
 POSTGRES_CONTAINER="homelab-postgres"
 POSTGRES_USER="n8n"
@@ -35,6 +38,7 @@ create_monitoring_volumes() {
     local volumes=(
         "homelab_prometheus_data"
         "homelab_grafana_data"
+        "homelab_thermal_history"
     )
     
     for volume in "${volumes[@]}"; do
@@ -154,10 +158,31 @@ test_monitoring_endpoints() {
         log_warn "Not running on Pi - thermal metrics will be limited"
     fi
     
+    # Exporter snapshot (no vcgencmd or HTTP round trip)
+    local snapshot_temp
+    if snapshot_temp=$(python3 "$THERMAL_SNAPSHOT_READER" --field temperature --max-age 300 2>/dev/null); then
+        log_pass "Exporter snapshot: ${snapshot_temp:-N/A}°C"
+    else
+        log_warn "Exporter snapshot not available (is thermal-exporter running?)"
+    fi
+    
     # Test service endpoints
     check_monitoring_health
 }
 
+# Show the thermal exporter's latest readings from its shared-memory snapshot
+show_thermal_snapshot() {
+    local rc=0
+    python3 "$THERMAL_SNAPSHOT_READER" --max-age 300 "$@" || rc=$?
+    
+    case $rc in
+        0) ;;
+        2) log_warn "Snapshot is stale - thermal exporter may have stopped collecting" ;;
+        *) log_error "No thermal snapshot - start the monitoring stack (monitoring-start)" ;;
+    esac
+    return $rc
+}
+
 # Deploy complete monitoring stack
 deploy_monitoring_stack() {
     log_deploy "Deploying monitoring stack..."
@@ -231,6 +256,25 @@ setup_monitoring_stack() {
     log_success "Monitoring stack setup complete"
 }
 
+# Query the thermal exporter's local history, shaped like a Prometheus range query
+# (used when Prometheus retention no longer covers the range)
+query_thermal_history() {
+    local start_unix="$1"
+    local end_unix="$2"
+    local metric="$3"
+    local stat="${4:-mean}"
+    
+    curl -sf "http://localhost:9200/history?from=${start_unix}&to=${end_unix}&step=60&metric=${metric}" 2>/dev/null | \
+        python3 -c "
+import json, sys
+data = json.load(sys.stdin)
+column = data['columns'].index('${stat}')
+points = data['series'].get('${metric}', [])
+result = [{'values': [[p[0], str(p[column])] for p in points]}] if points else []
+print(json.dumps({'status': 'success', 'source': 'exporter-' + data['resolution'], 'data': {'result': result}}))
+" 2>/dev/null
+}
+
 # Query Prometheus for execution metrics
 query_execution_metrics() {
     local execution_id="$1"
@@ -266,6 +310,9 @@ query_execution_metrics() {
     # Temperature query
     local temp_data
     temp_data=$(curl -s "http://localhost:9090/api/v1/query_range?query=rpi_cpu_temperature_celsius&start=${start_unix}&end=${end_unix}&step=60")
+    if ! echo "$temp_data" | grep -q '"result":\[{'; then
+        temp_data=$(query_thermal_history "$start_unix" "$end_unix" temperature mean)
+    fi
 
     if echo "$temp_data" | grep -q '"status":"success"'; then
         echo "🌡️  CPU TEMPERATURE"
@@ -296,6 +343,9 @@ else:
     # Throttling query
     local throttle_data
     throttle_data=$(curl -s "http://localhost:9090/api/v1/query_range?query=rpi_throttling_status&start=${start_unix}&end=${end_unix}&step=60")
+    if ! echo "$throttle_data" | grep -q '"result":\[{'; then
+        throttle_data=$(query_thermal_history "$start_unix" "$end_unix" throttled max)
+    fi
 
     echo "🚦 THROTTLING STATUS"
     echo "----------------------------------------------------------------------"
@@ -3,7 +3,8 @@
 N8N Execution Data Parser
 
 Parses n8n execution data from PostgreSQL, handling the compressed JSON reference format.
-Extracts node outputs, LLM responses, and other execution details.
+Extracts node outputs, LLM responses, and other execution details. Parsing is
+done by execution_analysis.py; this script adds the CLI and the --serve daemon.
 
 Usage:
     ./parse-execution-data.py <execution_id> [options]
@@ -14,6 +15,16 @@ Options:
     --llm-only              Extract only LLM responses
     --validate-json         Validate LLM responses as JSON
     --output <file>         Write output to file instead of stdout
+    --serve                 Run as a resident daemon on a Unix socket
+    --socket <path>         Daemon socket path (default: $EXEC_PARSER_SOCKET or
+                            /tmp/homelab-exec-parser.sock)
+    --cache-size <n>        Executions kept parsed in memory by the daemon (default: 8)
+    --max-field-size <n>    Replace binary data and strings longer than n characters
+                            with lazy descriptors instead of copying them
+    --extract <ref>         Write the value at reference index <ref> to a file
+                            (repeatable; inline binary data is base64-decoded,
+                            binary stored outside the database is written as its id)
+    --extract-dir <dir>     Directory for --extract output (default: .)
 
 Examples:
     # Get full execution data
@@ -27,387 +38,384 @@ Examples:
 
     # Save to file
     ./parse-execution-data.py 191 --output execution-191.json
+
+    # Mail-heavy execution: describe attachments and bodies over 4KB, save one
+    ./parse-execution-data.py 191 --max-field-size 4096
+    ./parse-execution-data.py 191 --max-field-size 4096 --extract 1234 --extract-dir /tmp
+
+    # Keep parsed executions warm for the exec-* helpers
+    ./parse-execution-data.py --serve
+
+Daemon protocol:
+    The client sends one JSON header line, e.g.
+    {"execution_id": "191", "version": "...", "args": ["--node", "X"], "cwd": "/path"},
+    optionally followed by the raw execution data, then closes its write side.
+    The daemon replies with a status line (OK, MISS or ERROR) followed by the
+    output. MISS means the execution is not cached at this version (e.g.
+    stoppedAt and data size; it changes when the data is rewritten) and no
+    data was sent.
+    Headers {"command": "stats"} and {"command": "shutdown"} control the daemon.
 """
 
+import os
 import sys
 import json
 import argparse
+import base64
+import binascii
+import signal
+import socketserver
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from execution_analysis import (
+    ExecutionDataParser,
+    ExecutionWalk,
+    LLMResponses,
+    QueryError,
+    load_execution_json,
+    parse_node_data,
+)
 
-class ExecutionDataParser:
-    """Parser for n8n execution data with compressed JSON references."""
-
-    def __init__(self, data: List[Any]):
-        """
-        Initialize parser with execution data array.
-
-        Args:
-            data: The decompressed JSON array from execution_data.data
-        """
-        self.data = data
-        self.cache = {}  # Cache resolved references for performance
-        self.max_depth = 10  # Maximum recursion depth to prevent infinite loops
-        self._resolving = set()  # Track currently resolving refs to detect cycles
+DEFAULT_SOCKET_PATH = os.getenv('EXEC_PARSER_SOCKET', '/tmp/homelab-exec-parser.sock')
+DEFAULT_CACHE_SIZE = 8
 
-    def resolve_ref(self, ref: Any) -> Any:
-        """
-        Recursively resolve a reference to actual data.
+# Base64 characters decoded per chunk when extracting binary data (multiple of 4)
+EXTRACT_CHUNK_SIZE = 4 * 64 * 1024
 
-        Args:
-            ref: String reference (e.g., "445") or actual value
 
-        Returns:
-            Resolved data value
-        """
-        if ref is None:
-            return None
+def extract_lazy_values(parser: ExecutionDataParser, refs: List[int], output_dir: Path) -> List[str]:
+    """
+    Write referenced values to files, decoding binary data in chunks.
 
-        # Return non-reference values as-is
-        if not isinstance(ref, str) or not ref.isdigit():
-            return ref
+    Binary data is recognized whether or not --max-field-size described it.
+    n8n's filesystem and S3 binary modes store an id (e.g. "filesystem-v2:...")
+    instead of base64; such values are written as text.
 
-        # Check cache
-        ref_int = int(ref)
-        if ref_int in self.cache:
-            return self.cache[ref_int]
+    Args:
+        parser: Parser that resolved the execution (provides lazy descriptors)
+        refs: Reference indexes to extract
+        output_dir: Directory to write files into
 
-        # Resolve and cache
-        if ref_int < len(self.data):
-            resolved = self.data[ref_int]
-            self.cache[ref_int] = resolved
-            return resolved
+    Returns:
+        List of written file paths
 
-        return None
+    Raises:
+        QueryError: If a reference does not point at a string value
+    """
+    written = []
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for ref_id in refs:
+        value = parser.data[ref_id] if 0 <= ref_id < len(parser.data) else None
+        if not isinstance(value, str):
+            raise QueryError(f"Reference {ref_id} does not point at a string value")
+
+        descriptor = parser.lazy_refs.get(ref_id, {})
+        if descriptor.get('_lazy') != 'binary':
+            descriptor = parser.binary_property(ref_id) or descriptor
+
+        path = None
+        if descriptor.get('_lazy') == 'binary':
+            file_name = Path(str(descriptor.get('fileName') or f"ref-{ref_id}.bin")).name
+            path = output_dir / f"{ref_id}-{file_name}"
+            try:
+                with open(path, 'wb') as f:
+                    for start in range(0, len(value), EXTRACT_CHUNK_SIZE):
+                        f.write(base64.b64decode(value[start:start + EXTRACT_CHUNK_SIZE], validate=True))
+            except binascii.Error:
+                path.unlink()
+                path = None  # Not inline base64: a binary data id
 
-    def get_run_data(self) -> Optional[Dict[str, Any]]:
-        """
-        Extract run data structure from execution data.
+        if path is None:
+            path = output_dir / f"ref-{ref_id}.txt"
+            path.write_text(value)
 
-        Returns:
-            Dictionary mapping node names to execution data
-        """
-        if len(self.data) < 5:
-            return None
+        written.append(str(path))
 
-        # Structure: data[0] = {startData, resultData, executionData}
-        # data[2] = {runData, lastNodeExecuted}
-        # data[4] = {nodeName: ref, ...}
-        result_data_ref = self.data[0].get('resultData')
-        result_data = self.resolve_ref(result_data_ref)
+    return written
 
-        if not result_data:
-            return None
 
-        run_data_ref = result_data.get('runData')
-        run_data_map = self.resolve_ref(run_data_ref)
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (also used to parse daemon requests)."""
+    parser = argparse.ArgumentParser(
+        description='Parse n8n execution data from PostgreSQL',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
 
-        if not run_data_map:
-            return None
+    parser.add_argument('execution_id', type=str, nargs='?', help='Execution ID to parse')
+    parser.add_argument('--node', type=str, help='Extract data for specific node only')
+    parser.add_argument('--format', choices=['json', 'text'], default='json', help='Output format')
+    parser.add_argument('--llm-only', action='store_true', help='Extract only LLM responses')
+    parser.add_argument('--validate-json', action='store_true', help='Validate LLM responses as JSON')
+    parser.add_argument('--output', type=str, help='Write output to file instead of stdout')
+    parser.add_argument('--input', type=str, help='Read from file instead of stdin')
+    parser.add_argument('--serve', action='store_true', help='Run as a resident daemon on a Unix socket')
+    parser.add_argument('--socket', type=str, default=DEFAULT_SOCKET_PATH, help='Daemon socket path')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help='Number of parsed executions kept in memory by the daemon')
+    parser.add_argument('--max-field-size', type=int,
+                        help='Describe binary data and strings longer than this instead of copying them')
+    parser.add_argument('--extract', type=int, action='append', default=[],
+                        help='Write the value at this reference index to a file (repeatable)')
+    parser.add_argument('--extract-dir', type=str, default='.', help='Directory for --extract output')
 
-        # run_data_map is a dict like {"Node Name": "ref", ...}
-        node_data = {}
-        for node_name, node_ref in run_data_map.items():
-            node_executions = self.resolve_ref(node_ref)
-            if node_executions:
-                node_data[node_name] = self._parse_node_executions(node_executions)
+    return parser
 
-        return node_data
 
-    def _parse_node_executions(self, executions_ref: Any) -> List[Dict[str, Any]]:
-        """
-        Parse all execution runs for a node.
+def run_query(parser: ExecutionDataParser, node_data: Dict[str, Any], args: argparse.Namespace) -> str:
+    """
+    Apply node filtering, LLM extraction and formatting to parsed run data.
 
-        Args:
-            executions_ref: Reference to array of execution runs
+    Args:
+        parser: Parser that produced node_data (its resolution cache is reused)
+        node_data: Output of ExecutionDataParser.get_run_data()
+        args: Parsed CLI arguments
 
-        Returns:
-            List of execution run details
-        """
-        executions_arr = self.resolve_ref(executions_ref)
-        if not isinstance(executions_arr, list):
-            return []
+    Returns:
+        Formatted output text
 
-        results = []
-        for exec_ref in executions_arr:
-            exec_data = self.resolve_ref(exec_ref)
-            if exec_data and isinstance(exec_data, dict):
-                parsed = self._parse_execution_run(exec_data)
-                if parsed:
-                    results.append(parsed)
+    Raises:
+        QueryError: If the requested node does not exist
+    """
+    # Filter by node if requested
+    if args.node:
+        if args.node not in node_data:
+            raise QueryError(
+                f"Node '{args.node}' not found in execution data\n"
+                f"Available nodes: {', '.join(node_data.keys())}"
+            )
+        node_data = {args.node: node_data[args.node]}
 
-        return results
+    # Extract LLM responses if requested
+    if args.llm_only:
+        walk = ExecutionWalk(parser.data, [LLMResponses(validate=args.validate_json)],
+                             nodes=list(node_data), parser=parser)
+        result = walk.run()['llm-responses']
+    else:
+        result = node_data
 
-    def _parse_execution_run(self, exec_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """
-        Parse a single execution run for a node.
+    # Format output
+    if args.format == 'json':
+        return json.dumps(result, indent=2, ensure_ascii=False)
+    return str(result)
 
-        Args:
-            exec_data: Execution run data with references
 
-        Returns:
-            Parsed execution details with resolved data
-        """
-        data_ref = exec_data.get('data')
-        data_obj = self.resolve_ref(data_ref)
+class ParserDaemon(socketserver.UnixStreamServer):
+    """
+    Unix socket server keeping recently parsed executions in an LRU cache.
 
-        if not data_obj:
-            return None
+    Requests are handled one at a time, so the cache needs no locking.
+    """
 
-        main_ref = data_obj.get('main')
-        main_data = self.resolve_ref(main_ref)
+    def __init__(self, socket_path: str, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.socket_path = socket_path
+        self.cache_size = max(1, cache_size)
+        # execution_id -> {'version', 'data': array, 'budget': max_field_size, 'view': (parser, node_data)}
+        self.cache = OrderedDict()
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'loads': 0, 'errors': 0}
 
-        # Resolve output items
-        output_items = self._resolve_output_items(main_data)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
 
-        return {
-            'startTime': exec_data.get('startTime'),
-            'executionTime': exec_data.get('executionTime'),
-            'executionStatus': self.resolve_ref(exec_data.get('executionStatus')),
-            'executionIndex': exec_data.get('executionIndex'),
-            'data': {
-                'main': output_items
-            }
-        }
+        # Socket is only reachable by the owning user
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, ParserRequestHandler)
+        finally:
+            os.umask(old_umask)
 
-    def _resolve_output_items(self, main_ref: Any) -> List[Dict[str, Any]]:
+    def get_cached(self, execution_id: str, version: Optional[str]) -> Optional[Dict[str, Any]]:
         """
-        Resolve output items from main data reference.
-
-        Args:
-            main_ref: Reference to main output data
+        Return the cache entry for an execution and mark it most recently used.
 
-        Returns:
-            List of resolved output items
+        An entry stored for another version of the data is dropped, so a stale
+        parse is never served.
         """
-        if not main_ref:
-            return []
-
-        main_arr = self.resolve_ref(main_ref)
-        if not isinstance(main_arr, list) or len(main_arr) == 0:
-            return []
-
-        items_ref = main_arr[0]
-        items = self.resolve_ref(items_ref)
-
-        if not items:
-            return []
-
-        # Handle array of items
-        if isinstance(items, list):
-            return [self._resolve_item(item_ref) for item_ref in items]
-        else:
-            return [self._resolve_item(items)]
-
-    def _resolve_item(self, item_ref: Any) -> Dict[str, Any]:
+        entry = self.cache.get(execution_id)
+        if entry is None:
+            return None
+        if entry['version'] != version:
+            del self.cache[execution_id]
+            return None
+        self.cache.move_to_end(execution_id)
+        return entry
+
+    def store(self, execution_id: str, version: Optional[str], data: List[Any]) -> Dict[str, Any]:
+        """Cache a decoded execution, evicting the least recently used entry."""
+        entry = {'version': version, 'data': data, 'budget': None, 'view': None}
+        self.cache[execution_id] = entry
+        self.cache.move_to_end(execution_id)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def get_view(entry: Dict[str, Any], max_field_size: Optional[int]):
         """
-        Recursively resolve a single item, expanding all references.
-
-        Args:
-            item_ref: Reference to item data
+        Return (parser, node_data) for an entry.
 
-        Returns:
-            Fully resolved item dictionary
+        Only one parsed view is kept per execution, so memory per entry stays
+        bounded; a query with another field budget replaces it.
         """
-        item = self.resolve_ref(item_ref)
-
-        if not isinstance(item, dict):
-            return {'value': item}
-
-        resolved = {}
-        for key, value in item.items():
-            # Recursively resolve nested structures
-            if isinstance(value, str) and value.isdigit():
-                resolved[key] = self._deep_resolve(self.resolve_ref(value))
-            elif isinstance(value, dict):
-                resolved[key] = {k: self._deep_resolve(self.resolve_ref(v)) for k, v in value.items()}
-            elif isinstance(value, list):
-                resolved[key] = [self._deep_resolve(self.resolve_ref(v)) for v in value]
+        if entry['view'] is None or entry['budget'] != max_field_size:
+            entry['view'] = None  # Release the old view before building the new one
+            entry['view'] = parse_node_data(entry['data'], max_field_size)
+            entry['budget'] = max_field_size
+        return entry['view']
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class ParserRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one daemon request: header line, optional execution data payload."""
+
+    def handle(self):
+        server = self.server
+        server.stats['requests'] += 1
+
+        try:
+            header = json.loads(self.rfile.readline().decode('utf-8') or '{}')
+        except json.JSONDecodeError as e:
+            self.reply('ERROR', f"Invalid request header: {e}")
+            return
+
+        command = header.get('command', 'query')
+        if command == 'stats':
+            self.reply('OK', json.dumps({
+                **server.stats,
+                'cached': list(server.cache.keys()),
+                'cache_size': server.cache_size,
+                'pid': os.getpid()
+            }))
+            return
+        if command == 'shutdown':
+            self.reply('OK', 'Shutting down')
+            threading.Thread(target=server.shutdown, daemon=True).start()
+            return
+
+        try:
+            args = build_arg_parser().parse_args(
+                [str(header.get('execution_id', ''))] + list(header.get('args', []))
+            )
+        except SystemExit:
+            self.reply('ERROR', f"Invalid arguments: {header.get('args')}")
+            return
+
+        cwd = Path(header.get('cwd') or '.')
+        version = header.get('version')
+
+        # Every failure gets an ERROR reply: a dropped connection makes the
+        # client fall back to parsing in-process and hides the error
+        try:
+            payload = self.rfile.read().decode('utf-8')
+            if payload.strip():
+                entry = server.store(args.execution_id, version, load_execution_json(payload))
+                server.stats['loads'] += 1
             else:
-                resolved[key] = value
+                entry = server.get_cached(args.execution_id, version)
+                if entry is None:
+                    server.stats['misses'] += 1
+                    self.reply('MISS', '')
+                    return
+                server.stats['hits'] += 1
 
-        return resolved
+            parser, node_data = server.get_view(entry, args.max_field_size)
+            output = run_query(parser, node_data, args)
+            extracted = extract_lazy_values(parser, args.extract, cwd / args.extract_dir)
 
-    def _deep_resolve(self, value: Any, depth: int = 0) -> Any:
-        """
-        Deeply resolve a value, following all references with depth limiting.
+            if args.output:
+                (cwd / args.output).write_text(output)
+                output = f"Output written to {args.output}"
+        except QueryError as e:
+            server.stats['errors'] += 1
+            self.reply('ERROR', str(e))
+            return
+        except Exception as e:
+            server.stats['errors'] += 1
+            self.reply('ERROR', f"{type(e).__name__}: {e}")
+            return
 
-        Args:
-            value: Value to resolve
-            depth: Current recursion depth
+        for path in extracted:
+            output += f"\nExtracted {path}"
 
-        Returns:
-            Fully resolved value or placeholder if depth exceeded
-        """
-        # Stop if we've exceeded max depth
-        if depth > self.max_depth:
-            return f"<max_depth_exceeded:{depth}>"
-
-        # Handle reference strings
-        if isinstance(value, str) and value.isdigit():
-            ref_id = int(value)
-
-            # Detect circular references
-            if ref_id in self._resolving:
-                return f"<circular_ref:{value}>"
-
-            self._resolving.add(ref_id)
-            try:
-                resolved = self.resolve_ref(value)
-                result = self._deep_resolve(resolved, depth + 1)
-            finally:
-                self._resolving.discard(ref_id)
+        self.reply('OK', output)
 
-            return result
+    def reply(self, status: str, body: str):
+        self.wfile.write(f"{status}\n{body}\n".encode('utf-8'))
 
-        elif isinstance(value, dict):
-            return {k: self._deep_resolve(v, depth + 1) for k, v in value.items()}
-        elif isinstance(value, list):
-            return [self._deep_resolve(v, depth + 1) for v in value]
-        else:
-            return value
 
+def serve(socket_path: str, cache_size: int):
+    """Run the parser daemon until interrupted or asked to shut down."""
+    server = ParserDaemon(socket_path, cache_size)
 
-def validate_json_response(response: str) -> Dict[str, Any]:
-    """
-    Validate if a response string is valid JSON.
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
 
-    Args:
-        response: String to validate
-
-    Returns:
-        Dictionary with validation results
-    """
-    result = {
-        'valid': False,
-        'error': None,
-        'parsed': None,
-        'length': len(response) if response else 0
-    }
-
-    if not response or not isinstance(response, str):
-        result['error'] = 'Empty or non-string response'
-        return result
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    print(f"Execution parser daemon listening on {socket_path} (cache size: {server.cache_size})",
+          file=sys.stderr)
 
     try:
-        parsed = json.loads(response)
-        result['valid'] = True
-        result['parsed'] = parsed
-    except json.JSONDecodeError as e:
-        result['error'] = str(e)
-
-    return result
-
-
-def extract_llm_responses(node_data: Dict[str, Any], validate: bool = False) -> List[Dict[str, Any]]:
-    """
-    Extract LLM responses from node execution data.
-
-    Args:
-        node_data: Parsed node execution data
-        validate: Whether to validate responses as JSON
-
-    Returns:
-        List of LLM responses with metadata
-    """
-    llm_responses = []
-
-    for node_name, executions in node_data.items():
-        # Look for common LLM node patterns
-        if any(keyword in node_name.lower() for keyword in ['llm', 'ollama', 'openai', 'agent', 'summarise', 'summarize']):
-            for idx, execution in enumerate(executions):
-                items = execution.get('data', {}).get('main', [])
-
-                for item in items:
-                    # Extract response from common LLM output fields
-                    response = item.get('response') or item.get('output') or item.get('text')
-
-                    if response:
-                        response_data = {
-                            'node': node_name,
-                            'executionIndex': execution.get('executionIndex', idx),
-                            'executionTime': execution.get('executionTime'),
-                            'response': response,
-                            'responseLength': len(str(response))
-                        }
-
-                        if validate and isinstance(response, str):
-                            validation = validate_json_response(response)
-                            response_data['validation'] = validation
-
-                        llm_responses.append(response_data)
-
-    return llm_responses
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Execution parser daemon stopped", file=sys.stderr)
 
 
 def main():
     """Main entry point for CLI usage."""
-    parser = argparse.ArgumentParser(
-        description='Parse n8n execution data from PostgreSQL',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=__doc__
-    )
+    parser = build_arg_parser()
+    args = parser.parse_args()
 
-    parser.add_argument('execution_id', type=str, help='Execution ID to parse')
-    parser.add_argument('--node', type=str, help='Extract data for specific node only')
-    parser.add_argument('--format', choices=['json', 'text'], default='json', help='Output format')
-    parser.add_argument('--llm-only', action='store_true', help='Extract only LLM responses')
-    parser.add_argument('--validate-json', action='store_true', help='Validate LLM responses as JSON')
-    parser.add_argument('--output', type=str, help='Write output to file instead of stdout')
-    parser.add_argument('--input', type=str, help='Read from file instead of stdin')
+    if args.serve:
+        serve(args.socket, args.cache_size)
+        return
 
-    args = parser.parse_args()
+    if not args.execution_id:
+        parser.error("execution_id is required unless --serve is given")
 
     # Read execution data
     if args.input:
-        with open(args.input, 'r') as f:
-            raw_data = f.read()
+        try:
+            with open(args.input, 'r') as f:
+                raw_data = f.read()
+        except OSError as e:
+            print(f"Error: Cannot read {args.input}: {e.strerror}", file=sys.stderr)
+            sys.exit(1)
     else:
         raw_data = sys.stdin.read()
 
-    if not raw_data.strip():
-        print("Error: No input data received", file=sys.stderr)
-        sys.exit(1)
-
     try:
-        data = json.loads(raw_data)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON input: {e}", file=sys.stderr)
+        parser_obj, node_data = parse_node_data(load_execution_json(raw_data), args.max_field_size)
+        output = run_query(parser_obj, node_data, args)
+        extracted = extract_lazy_values(parser_obj, args.extract, Path(args.extract_dir))
+    except QueryError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
-
-    # Parse execution data
-    parser_obj = ExecutionDataParser(data)
-    node_data = parser_obj.get_run_data()
-
-    if not node_data:
-        print("Error: Could not parse execution data", file=sys.stderr)
+    except OSError as e:
+        print(f"Error: Cannot write {e.filename}: {e.strerror}", file=sys.stderr)
         sys.exit(1)
 
-    # Filter by node if requested
-    if args.node:
-        if args.node not in node_data:
-            print(f"Error: Node '{args.node}' not found in execution data", file=sys.stderr)
-            print(f"Available nodes: {', '.join(node_data.keys())}", file=sys.stderr)
-            sys.exit(1)
-        node_data = {args.node: node_data[args.node]}
-
-    # Extract LLM responses if requested
-    if args.llm_only:
-        result = extract_llm_responses(node_data, validate=args.validate_json)
-    else:
-        result = node_data
-
-    # Format output
-    if args.format == 'json':
-        output = json.dumps(result, indent=2, ensure_ascii=False)
-    else:
-        output = str(result)
+    for path in extracted:
+        print(f"Extracted {path}", file=sys.stderr)
 
     # Write output
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(output)
+        try:
+            with open(args.output, 'w') as f:
+                f.write(output)
+        except OSError as e:
+            print(f"Error: Cannot write {args.output}: {e.strerror}", file=sys.stderr)
+            sys.exit(1)
         print(f"Output written to {args.output}", file=sys.stderr)
     else:
         print(output)
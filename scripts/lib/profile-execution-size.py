@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+N8N Execution Data Size Profiler
+
+Attributes the bytes stored in execution_data.data to workflow, node, run, item
+and field path, so n8n's data saving settings (or compaction) can target what
+actually fills the disk.
+
+Each execution's reference array is walked once. Every element is charged to
+the first location that references it:
+
+    stored     Serialized bytes of the elements owned by the location
+               (sums to the size of the row)
+    resolved   Bytes the location expands to when references are followed,
+               i.e. what a parser materializes
+    shared     Part of resolved that is stored elsewhere (elements referenced
+               from more than one place, like items passed through unchanged)
+
+Executions are processed one at a time and only the running totals are kept,
+so months of history can be profiled straight from psql.
+
+Usage:
+    ./profile-execution-size.py [--input <file>]... [options] < rows.tsv
+
+Options:
+    --input <file>          Execution data file (repeatable; otherwise rows on stdin)
+    --group-by <level>      workflow, node (default), field or item
+    --top <n>               Rows in the ranked report (default: 25)
+    --format <json|text>    Output format (default: text)
+
+Input on stdin is one execution per line, tab-separated:
+    <execution_id> <workflow_name> <stopped_at> <execution_data_json>
+(the same rows as index-executions.py; psql -t -A -F $'\\t' output works as is).
+
+Examples:
+    ./profile-execution-size.py --input exec-191.json --group-by field
+    psql ... | ./profile-execution-size.py --group-by node --top 10
+"""
+
+import sys
+import json
+import heapq
+import argparse
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import execution_analysis
+
+# Location used for execution-level structure outside runData
+EXECUTION_NODE = '(execution)'
+
+GROUP_KEYS = {
+    'workflow': ('workflow',),
+    'node': ('workflow', 'node'),
+    'field': ('workflow', 'node', 'field'),
+    'item': ('execution', 'node', 'run', 'item'),
+}
+
+# (node, run, item, field) a byte count is charged to
+Location = Tuple[str, Optional[int], Optional[int], str]
+
+
+class ExecutionSizeProfile(execution_analysis.ExecutionDataParser):
+    """Execution parser that measures reference elements instead of resolving them."""
+
+    def __init__(self, data: List[Any]):
+        super().__init__(data)
+        self.owner = {}  # Reference index -> location that first referenced it
+        self.subtree_sizes = {}  # Reference index -> resolved size (memoized)
+        self._sizing = set()  # Track refs being sized to detect cycles
+        self.stored = defaultdict(int)
+        self.resolved = defaultdict(int)
+        self.shared = defaultdict(int)
+
+    def subtree_size(self, ref_id: int) -> int:
+        """
+        Resolved size of the value rooted at a reference index (memoized).
+
+        Args:
+            ref_id: Index into the reference array
+
+        Returns:
+            Bytes of the element plus every element reachable from it, counted
+            once per reference (shared elements are counted each time)
+        """
+        if ref_id in self.subtree_sizes:
+            return self.subtree_sizes[ref_id]
+        if ref_id in self._sizing:
+            return 0
+
+        self._sizing.add(ref_id)
+        try:
+            total = execution_analysis.element_size(self.data, ref_id)
+            for child in self._child_refs(ref_id):
+                total += self.subtree_size(child)
+        finally:
+            self._sizing.discard(ref_id)
+
+        self.subtree_sizes[ref_id] = total
+        return total
+
+    def _ref_index(self, ref: Any) -> Optional[int]:
+        """Reference index for a digit-string reference, None for inline values."""
+        if isinstance(ref, str) and ref.isdigit():
+            ref_id = int(ref)
+            if ref_id < len(self.data):
+                return ref_id
+        return None
+
+    def _child_refs(self, ref_id: int) -> Iterator[int]:
+        """Reference indexes held by a container element (strings are leaves)."""
+        element = self.data[ref_id]
+        if isinstance(element, dict):
+            children = element.values()
+        elif isinstance(element, list):
+            children = element
+        else:
+            return
+        for child in children:
+            child_id = self._ref_index(child)
+            if child_id is not None:
+                yield child_id
+
+    def _claim(self, ref: Any, location: Location) -> Optional[Any]:
+        """
+        Charge an element to a location.
+
+        Returns:
+            The element if this is its first reference (so the caller descends),
+            None if it is inline or already owned by another location
+        """
+        ref_id = self._ref_index(ref)
+        if ref_id is None:
+            return None
+
+        if ref_id in self.owner:
+            size = self.subtree_size(ref_id)
+            self.resolved[location] += size
+            self.shared[location] += size
+            return None
+
+        self.owner[ref_id] = location
+        size = execution_analysis.element_size(self.data, ref_id)
+        self.stored[location] += size
+        self.resolved[location] += size
+        return self.data[ref_id]
+
+    def _walk(self, ref: Any, location: Location):
+        """Charge an element and everything below it to one location."""
+        element = self._claim(ref, location)
+        if isinstance(element, dict):
+            children = element.values()
+        elif isinstance(element, list):
+            children = element
+        else:
+            return
+        for child in children:
+            self._walk(child, location)
+
+    def profile(self) -> Dict[Location, Dict[str, int]]:
+        """
+        Walk the execution once and return byte counts per location.
+
+        Returns:
+            Mapping of (node, run, item, field) to stored, resolved and shared bytes
+
+        Raises:
+            QueryError: If the data is not n8n execution data
+        """
+        if not self.data or not isinstance(self.data[0], dict):
+            raise execution_analysis.QueryError("Could not parse execution data")
+
+        root = self._claim('0', (EXECUTION_NODE, None, None, '(root)'))
+        for key, ref in root.items():
+            if key == 'resultData':
+                self._walk_result_data(ref)
+            else:
+                self._walk(ref, (EXECUTION_NODE, None, None, key))
+
+        # Elements nothing refers to (still stored in the row)
+        orphaned = sum(execution_analysis.element_size(self.data, idx)
+                       for idx in range(len(self.data)) if idx not in self.owner)
+        if orphaned:
+            self.stored[(EXECUTION_NODE, None, None, '(unreferenced)')] += orphaned
+
+        return {
+            location: {
+                'stored': self.stored[location],
+                'resolved': self.resolved[location],
+                'shared': self.shared[location]
+            }
+            for location in self.resolved.keys() | self.stored.keys()
+        }
+
+    def _walk_result_data(self, ref: Any):
+        result_data = self._claim(ref, (EXECUTION_NODE, None, None, 'resultData'))
+        if not isinstance(result_data, dict):
+            return
+        for key, child in result_data.items():
+            if key == 'runData':
+                self._walk_run_data(child)
+            else:
+                self._walk(child, (EXECUTION_NODE, None, None, f'resultData.{key}'))
+
+    def _walk_run_data(self, ref: Any):
+        run_data = self._claim(ref, (EXECUTION_NODE, None, None, 'resultData.runData'))
+        if not isinstance(run_data, dict):
+            return
+        for node_name, runs_ref in run_data.items():
+            runs = self._claim(runs_ref, (node_name, None, None, '(runs)'))
+            if not isinstance(runs, list):
+                continue
+            for run_idx, run_ref in enumerate(runs):
+                run = self._claim(run_ref, (node_name, run_idx, None, '(run)'))
+                if not isinstance(run, dict):
+                    continue
+                for key, child in run.items():
+                    if key == 'data':
+                        self._walk_outputs(child, node_name, run_idx)
+                    else:
+                        self._walk(child, (node_name, run_idx, None, key))
+
+    def _walk_outputs(self, ref: Any, node_name: str, run_idx: int):
+        """Walk data.<connection>[output][item], charging item fields by path."""
+        location = (node_name, run_idx, None, '(run)')
+        connections = self._claim(ref, location)
+        if not isinstance(connections, dict):
+            return
+
+        item_idx = 0
+        for outputs_ref in connections.values():
+            outputs = self._claim(outputs_ref, location)
+            if not isinstance(outputs, list):
+                continue
+            for items_ref in outputs:
+                items = self._claim(items_ref, location)
+                if not isinstance(items, list):
+                    continue
+                for item_ref in items:
+                    self._walk_item(item_ref, node_name, run_idx, item_idx)
+                    item_idx += 1
+
+    def _walk_item(self, ref: Any, node_name: str, run_idx: int, item_idx: int):
+        """Charge an item's json.<key> / binary.<key> fields separately."""
+        item = self._claim(ref, (node_name, run_idx, item_idx, '(item)'))
+        if not isinstance(item, dict):
+            return
+        for key, child in item.items():
+            location = (node_name, run_idx, item_idx, key)
+            if key in ('json', 'binary'):
+                fields = self._claim(child, location)
+                if isinstance(fields, dict):
+                    for field, value in fields.items():
+                        self._walk(value, (node_name, run_idx, item_idx, f'{key}.{field}'))
+            else:
+                self._walk(child, location)
+
+
+class SizeReport:
+    """Streaming aggregation of execution profiles into ranked groups."""
+
+    def __init__(self, group_by: str = 'node', top: int = 25):
+        self.group_by = group_by
+        self.top = top
+        self.totals = defaultdict(lambda: {'stored': 0, 'resolved': 0, 'shared': 0, 'executions': 0})
+        self.item_heap = []  # (stored, key, counts) for group_by=item, bounded to `top`
+        self.executions = 0
+        self.stored_bytes = 0
+
+    def add(self, execution_id: str, workflow: str, profile: Dict[Location, Dict[str, int]]):
+        """Fold one execution's profile into the running totals."""
+        self.executions += 1
+        groups = defaultdict(lambda: {'stored': 0, 'resolved': 0, 'shared': 0})
+
+        for (node, run, item, field), counts in profile.items():
+            self.stored_bytes += counts['stored']
+            if self.group_by == 'item':
+                if item is None:
+                    continue
+                key = (execution_id, node, run, item)
+            else:
+                values = {'workflow': workflow, 'node': node, 'field': field}
+                key = tuple(values[name] for name in GROUP_KEYS[self.group_by])
+            for name, value in counts.items():
+                groups[key][name] += value
+
+        if self.group_by == 'item':
+            # Individual items are only interesting at the top; keep a bounded heap
+            for key, counts in groups.items():
+                entry = (counts['stored'], key, counts)
+                if len(self.item_heap) < self.top:
+                    heapq.heappush(self.item_heap, entry)
+                elif entry[0] > self.item_heap[0][0]:
+                    heapq.heapreplace(self.item_heap, entry)
+            return
+
+        for key, counts in groups.items():
+            total = self.totals[key]
+            for name, value in counts.items():
+                total[name] += value
+            total['executions'] += 1
+
+    def ranked(self) -> List[Dict[str, Any]]:
+        """Groups ordered by stored bytes, largest first."""
+        if self.group_by == 'item':
+            rows = [(key, dict(counts, executions=1)) for _, key, counts in self.item_heap]
+        else:
+            rows = list(self.totals.items())
+        rows.sort(key=lambda row: row[1]['stored'], reverse=True)
+
+        ranked = []
+        for key, counts in rows[:self.top]:
+            entry = dict(zip(GROUP_KEYS[self.group_by], key))
+            entry.update(counts)
+            entry['storedPct'] = round(counts['stored'] / self.stored_bytes * 100, 1) if self.stored_bytes else 0.0
+            entry['avgStored'] = round(counts['stored'] / counts['executions']) if counts['executions'] else 0
+            ranked.append(entry)
+        return ranked
+
+
+def human_bytes(size: float) -> str:
+    """Format a byte count with a binary unit."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+def format_text(report: SizeReport) -> str:
+    """Format the ranked report as a table."""
+    lines = [
+        f"{report.executions} execution(s), {human_bytes(report.stored_bytes)} stored, grouped by {report.group_by}",
+        f"{'STORED':>9} {'%':>6} {'RESOLVED':>9} {'SHARED':>9} {'AVG/EXEC':>9}  LOCATION"
+    ]
+    for row in report.ranked():
+        location = ' / '.join(
+            str(row[name]) if name not in ('run', 'item') else f"{name} {row[name]}"
+            for name in GROUP_KEYS[report.group_by] if row[name] not in (None, '')
+        )
+        lines.append(
+            f"{human_bytes(row['stored']):>9} {row['storedPct']:>5.1f}% {human_bytes(row['resolved']):>9} "
+            f"{human_bytes(row['shared']):>9} {human_bytes(row['avgStored']):>9}  {location}"
+        )
+    return '\n'.join(lines)
+
+
+def iter_rows(args) -> Iterator[Tuple[str, str, str]]:
+    """Yield (execution_id, workflow, raw_data) from --input files or stdin rows."""
+    if args.input:
+        for path in args.input:
+            with open(path, 'r') as f:
+                yield Path(path).stem, '', f.read()
+        return
+
+    for line in sys.stdin:
+        line = line.rstrip('\n')
+        if not line.strip():
+            continue
+        parts = line.split('\t', 3)
+        if len(parts) != 4:
+            print(f"Warning: Skipping malformed row: {line[:60]}", file=sys.stderr)
+            continue
+        yield parts[0], parts[1], parts[3]
+
+
+def main():
+    """Main entry point for CLI usage."""
+    parser = argparse.ArgumentParser(
+        description='Attribute n8n execution data size to nodes and fields',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--input', action='append', default=[],
+                        help='Execution data file (repeatable; default: rows on stdin)')
+    parser.add_argument('--group-by', choices=list(GROUP_KEYS), default='node', help='Aggregation level')
+    parser.add_argument('--top', type=int, default=25, help='Rows in the ranked report')
+    parser.add_argument('--format', choices=['json', 'text'], default='text', help='Output format')
+
+    args = parser.parse_args()
+    report = SizeReport(args.group_by, args.top)
+    failed = 0
+
+    for execution_id, workflow, raw_data in iter_rows(args):
+        try:
+            data = execution_analysis.load_execution_json(raw_data)
+            report.add(execution_id, workflow, ExecutionSizeProfile(data).profile())
+        except execution_analysis.QueryError as e:
+            print(f"Warning: Execution {execution_id}: {e}", file=sys.stderr)
+            failed += 1
+
+    if not report.executions:
+        print("Error: No executions profiled", file=sys.stderr)
+        sys.exit(1)
+
+    if args.format == 'json':
+        print(json.dumps({
+            'executions': report.executions,
+            'failed': failed,
+            'storedBytes': report.stored_bytes,
+            'groupBy': args.group_by,
+            'groups': report.ranked()
+        }, indent=2, ensure_ascii=False))
+    else:
+        print(format_text(report))
+
+
+if __name__ == '__main__':
+    main()
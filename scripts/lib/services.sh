@@ -21,6 +21,7 @@ init_volumes() {
     if [[ "${ENABLE_MONITORING:-false}" == "true" ]]; then
         create_volume "homelab_prometheus_data" "prometheus"
         create_volume "homelab_grafana_data" "grafana"
+        create_volume "homelab_thermal_history" "thermal history"
     fi
     
     log_success "Docker volumes initialized"
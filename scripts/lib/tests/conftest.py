@@ -0,0 +1,32 @@
+"""Shared fixtures for the execution data script tests (run: python -m pytest scripts/lib/tests)."""
+
+import sys
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+LIB_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LIB_DIR))
+
+
+def load_script(file_name: str):
+    """Load a dashed script from scripts/lib as a module."""
+    path = LIB_DIR / file_name
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def generator():
+    return load_script('generate-execution-data.py')
+
+
+@pytest.fixture
+def execution(generator):
+    """Flatted execution with attachments, shared items and two LLM nodes."""
+    return generator.flatten(generator.generate_execution(
+        nodes=6, llm_nodes=2, items=8, binary_size=3000, string_size=1024
+    ))
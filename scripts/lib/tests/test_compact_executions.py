@@ -0,0 +1,133 @@
+"""
+Compaction tests.
+
+The Postgres test runs against a throwaway database when
+COMPACT_TEST_DATABASE_URL is set (see "Testing exec-compact locally" in
+docs/investigation-system.md), never against the n8n database.
+"""
+
+import os
+import json
+import uuid
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import execution_analysis
+from conftest import LIB_DIR, load_script
+
+compact = load_script('compact-executions.py')
+SCRIPT = str(LIB_DIR / 'compact-executions.py')
+
+
+def is_valid_reference_array(data):
+    for element in data:
+        children = element.values() if isinstance(element, dict) else element if isinstance(element, list) else []
+        for child in children:
+            if isinstance(child, str) and (not child.isdigit() or int(child) >= len(data)):
+                return False
+    return True
+
+
+def test_no_rules_reproduces_the_array(execution):
+    assert compact.ExecutionCompactor(execution, compact.CompactionRules()).compact() == execution
+
+
+def test_compaction_round_trip(execution):
+    raw = json.dumps(execution, separators=(',', ':'))
+    rules = compact.CompactionRules(drop_binary=True, truncate_strings=200,
+                                    drop_fields=['*:json.subject'], drop_nodes=['Process Email 1'])
+
+    new_text, stats = compact.compact_execution(raw, rules)
+    compacted = json.loads(new_text)
+
+    assert is_valid_reference_array(compacted)
+    assert stats['after'] < stats['before'] == len(raw)
+    assert compact.run_signature(compacted) == compact.run_signature(execution)
+
+    _, before = execution_analysis.parse_node_data(execution)
+    _, after = execution_analysis.parse_node_data(compacted)
+    email = after['Get Unread Emails'][0]['data']['main'][0]
+    assert 'subject' not in email['json']
+    assert email['binary']['attachment_0']['data'] == ''
+    assert email['binary']['attachment_0']['fileName'] == before['Get Unread Emails'][0]['data']['main'][0]['binary']['attachment_0']['fileName']
+    assert after['Process Email 1'][0]['data']['main'] == []
+    assert len(after['Summarise Email with LLM'][0]['data']['main']) == 8
+
+
+def make_rows(generator, count):
+    rows = []
+    for execution_id in range(1, count + 1):
+        data = generator.flatten(generator.generate_execution(items=3, binary_size=2000, seed=execution_id))
+        rows.append(f"{execution_id}\tEmail Summary\t2026-01-01 00:00:00\t{json.dumps(data, separators=(',', ':'))}")
+    return '\n'.join(rows) + '\n'
+
+
+def run_compactor(stdin, *args):
+    return subprocess.run([sys.executable, SCRIPT, *args], input=stdin, capture_output=True, text=True, check=True)
+
+
+def test_sql_batches(generator):
+    result = run_compactor(make_rows(generator, 5), '--drop-binary', '--sql', '--batch-size', '2')
+    lines = result.stdout.splitlines()
+
+    assert lines.count('BEGIN;') == 3
+    assert lines.count('COMMIT;') == 3
+    assert sum(line.startswith('UPDATE execution_data SET data = ') for line in lines) == 5
+    # Every UPDATE sits inside a BEGIN/COMMIT pair
+    depth = 0
+    for line in lines:
+        depth += line == 'BEGIN;'
+        depth -= line == 'COMMIT;'
+        assert depth in (0, 1)
+        if line.startswith('UPDATE'):
+            assert depth == 1
+    assert '5 to update' in result.stderr
+
+
+def test_dry_run_writes_no_sql(generator):
+    result = run_compactor(make_rows(generator, 2), '--drop-binary', '--format', 'json')
+    report = json.loads(result.stdout)
+
+    assert report['totals']['compacted'] == 2
+    assert report['totals']['after'] < report['totals']['before']
+
+
+@pytest.mark.skipif(not os.getenv('COMPACT_TEST_DATABASE_URL') or not shutil.which('psql'),
+                    reason='needs COMPACT_TEST_DATABASE_URL and psql')
+def test_apply_against_postgres(generator):
+    url = os.environ['COMPACT_TEST_DATABASE_URL']
+    schema = f"compact_test_{uuid.uuid4().hex[:8]}"
+    env = {**os.environ, 'PGOPTIONS': f'-c search_path={schema}'}
+
+    def psql(*args, stdin=None):
+        return subprocess.run(['psql', url, '-X', '-q', '-v', 'ON_ERROR_STOP=1', *args],
+                              input=stdin, capture_output=True, text=True, check=True, env=env).stdout
+
+    psql('-c', f'CREATE SCHEMA {schema}')
+    try:
+        rows = make_rows(generator, 3)
+        inserts = [f'CREATE TABLE execution_data ("executionId" integer PRIMARY KEY, data text NOT NULL);']
+        for row in rows.splitlines():
+            execution_id, _, _, data = row.split('\t', 3)
+            inserts.append(f"INSERT INTO execution_data VALUES ({execution_id}, $d${data}$d$);")
+        psql(stdin='\n'.join(inserts))
+
+        # Same pipeline as exec-compact --apply
+        streamed = psql('-v', 'FETCH_COUNT=1', '-t', '-A', '-F', '\t', '-c',
+                        'SELECT "executionId", \'\', NOW(), data FROM execution_data ORDER BY 1')
+        sql = run_compactor(streamed, '--drop-binary', '--truncate-strings', '100', '--sql', '--batch-size', '2').stdout
+        psql(stdin=sql)
+
+        stored = psql('-t', '-A', '-F', '\t', '-c', 'SELECT "executionId", data FROM execution_data ORDER BY 1')
+        originals = {row.split('\t', 3)[0]: row.split('\t', 3)[3] for row in rows.splitlines()}
+        for line in stored.splitlines():
+            execution_id, data = line.split('\t', 1)
+            expected, _ = compact.compact_execution(originals[execution_id], compact.CompactionRules(
+                drop_binary=True, truncate_strings=100))
+            assert json.loads(data) == json.loads(expected)
+            assert len(data) < len(originals[execution_id])
+    finally:
+        psql('-c', f'DROP SCHEMA {schema} CASCADE')
@@ -0,0 +1,25 @@
+import execution_analysis
+from conftest import load_script
+
+compare_executions = load_script('compare-executions.py')
+
+
+def test_node_summaries_follow_the_walk(execution):
+    summaries = compare_executions.ExecutionFingerprint(execution).get_node_summaries()
+    timings = execution_analysis.analyze(execution, ['node-timings'])['node-timings']
+
+    assert set(summaries) == set(timings)
+    for node_name, summary in summaries.items():
+        assert summary['runs'] == timings[node_name]['runs']
+        assert summary['items'] == len(summary['itemRefs']) == timings[node_name]['items']
+
+
+def test_identical_executions_hash_equal(generator):
+    def summaries(seed):
+        data = generator.flatten(generator.generate_execution(nodes=4, items=3, seed=seed))
+        return compare_executions.ExecutionFingerprint(data).get_node_summaries()
+
+    same, other = summaries(1), summaries(2)
+    assert {name: s['outputHash'] for name, s in same.items()} == \
+        {name: s['outputHash'] for name, s in summaries(1).items()}
+    assert same['Get Unread Emails']['outputHash'] != other['Get Unread Emails']['outputHash']
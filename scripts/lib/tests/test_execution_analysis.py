@@ -0,0 +1,50 @@
+import json
+
+import execution_analysis
+
+
+def test_validation_ignores_field_budget(execution):
+    full = execution_analysis.analyze(execution, ['validation'])
+    budget = execution_analysis.analyze(execution, ['validation'], max_field_size=100)
+
+    assert full['validation']['responses'] == 16
+    assert budget['validation'] == full['validation']
+    assert budget['validation']['valid'] == 16
+
+
+def test_llm_responses_apply_budget_to_output_only(execution):
+    responses = execution_analysis.analyze(execution, ['llm-responses'], max_field_size=100,
+                                           validate=True)['llm-responses']
+
+    assert len(responses) == 16
+    for response in responses:
+        assert response['validation']['valid']
+        assert response['response']['_lazy'] == 'string'
+        assert response['responseLength'] == response['response']['size']
+
+
+def test_node_outputs_match_parser(execution):
+    _, node_data = execution_analysis.parse_node_data(execution)
+    results = execution_analysis.analyze(execution, ['node-outputs', 'node-timings'])
+
+    assert results['node-outputs'] == node_data
+    assert results['node-timings']['Get Unread Emails']['items'] == 8
+
+
+def test_size_uses_raw_size_from_caller(execution):
+    raw_data = json.dumps(execution, separators=(',', ':'))
+    computed = execution_analysis.analyze(execution, ['size'])['size']
+    given = execution_analysis.analyze(execution, ['size'], raw_size=len(raw_data.encode('utf-8')))['size']
+
+    assert computed['executionBytes'] == len(raw_data.encode('utf-8'))
+    assert given == computed
+
+
+def test_llm_responses_first_item_only(execution):
+    every = execution_analysis.analyze(execution, ['llm-responses'])['llm-responses']
+    first = execution_analysis.analyze(execution, ['llm-responses'], first_item_only=True)['llm-responses']
+
+    assert len(first) == 2
+    assert all('itemIndex' not in response for response in first)
+    assert [response['response'] for response in first] == \
+        [response['response'] for response in every if response['itemIndex'] == 0]
@@ -0,0 +1,39 @@
+import base64
+
+import pytest
+
+from conftest import load_script
+
+
+@pytest.fixture(scope='module')
+def parse_execution_data():
+    return load_script('parse-execution-data.py')
+
+
+def binary_data_ref(execution):
+    return next(int(element['data']) for element in execution
+                if isinstance(element, dict) and 'mimeType' in element)
+
+
+@pytest.mark.parametrize('max_field_size', [None, 10])
+def test_extract_decodes_binary_with_or_without_budget(parse_execution_data, execution, tmp_path, max_field_size):
+    ref_id = binary_data_ref(execution)
+    parser, _ = parse_execution_data.parse_node_data(execution, max_field_size)
+
+    [path] = parse_execution_data.extract_lazy_values(parser, [ref_id], tmp_path)
+
+    assert path.endswith('.pdf')
+    assert open(path, 'rb').read() == base64.b64decode(execution[ref_id])
+
+
+@pytest.mark.parametrize('max_field_size', [None, 10])
+def test_extract_writes_filesystem_binary_id_as_text(parse_execution_data, execution, tmp_path, max_field_size):
+    ref_id = binary_data_ref(execution)
+    execution[ref_id] = 'filesystem-v2:workflows/1/executions/5/binary_data/0b2c7e'
+    parser, _ = parse_execution_data.parse_node_data(execution, max_field_size)
+
+    [path] = parse_execution_data.extract_lazy_values(parser, [ref_id], tmp_path)
+
+    assert path.endswith(f'ref-{ref_id}.txt')
+    assert open(path).read() == execution[ref_id]
+    assert list(tmp_path.iterdir()) == [tmp_path / f'ref-{ref_id}.txt']
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Thermal Snapshot Reader
+
+Reads the latest readings the thermal exporter publishes to a memory-mapped
+file (SNAPSHOT_FILE in docker-compose.yml, /dev/shm on the host). Reading is a
+few struct unpacks with no vcgencmd probe or HTTP request, so scripts can check
+temperature and throttle state as often as they like.
+
+The file layout is defined by SnapshotWriter in
+config/thermal-exporter/thermal_exporter.py. Writes are versioned seqlock-style:
+the sequence is odd while the exporter is writing, and a read is retried (with
+a short sleep, for up to READ_TIMEOUT seconds) until the sequence is even and
+unchanged across the copy.
+
+Usage:
+    ./thermal-snapshot.py [--file <path>] [--format json|shell] [--max-age <seconds>]
+    ./thermal-snapshot.py --field temperature
+
+Exit codes:
+    0  Snapshot read
+    1  Snapshot missing or unreadable
+    2  Snapshot older than --max-age (exporter not updating)
+
+Examples:
+    ./thermal-snapshot.py
+    eval "$(./thermal-snapshot.py --format shell)" && echo "$temperature"
+    ./thermal-snapshot.py --field throttled --max-age 120
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import mmap
+import struct
+import argparse
+from typing import Dict, Optional
+
+DEFAULT_SNAPSHOT_FILE = os.getenv('THERMAL_SNAPSHOT_FILE', '/dev/shm/homelab-thermal.snapshot')
+
+# Must match SnapshotWriter in config/thermal-exporter/thermal_exporter.py
+MAGIC = b'RPTS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ')
+SEQUENCE = struct.Struct('<Q')
+SEQUENCE_OFFSET = 8
+FIELDS = (
+    ('timestamp', 'd'),
+    ('temperature', 'd'),
+    ('predicted_temperature', 'd'),
+    ('seconds_to_soft_limit', 'd'),
+    ('load_average', 'd'),
+    ('core_voltage', 'd'),
+    ('throttled', 'q'),
+    ('arm_freq_hz', 'q'),
+    ('core_freq_hz', 'q'),
+    ('alerts_firing', 'q'),
+    ('generation', 'q'),
+)
+PAYLOAD = struct.Struct('<' + ''.join(fmt for _, fmt in FIELDS))
+
+# How long to retry while the exporter is writing, and the pause between attempts
+READ_TIMEOUT = 0.5
+RETRY_SLEEP = 0.001
+
+
+class SnapshotError(Exception):
+    """Raised when the snapshot file is missing, foreign or never stable."""
+    pass
+
+
+def read_snapshot(path: str = DEFAULT_SNAPSHOT_FILE, timeout: float = READ_TIMEOUT) -> Dict[str, Optional[float]]:
+    """
+    Read a consistent copy of the latest readings.
+
+    Args:
+        path: Snapshot file written by the thermal exporter
+        timeout: Seconds to keep retrying a snapshot that is being written
+
+    Returns:
+        Readings by field name (None where the exporter had no reading),
+        plus age_seconds since the exporter's last collection
+
+    Raises:
+        SnapshotError: If the file is missing, has another layout or no stable copy was read
+    """
+    try:
+        with open(path, 'rb') as f:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Cannot open snapshot {path}: {e}")
+
+    try:
+        if len(view) < HEADER.size + PAYLOAD.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+
+        magic, version, payload_size, _ = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION or payload_size != PAYLOAD.size:
+            raise SnapshotError(f"Snapshot {path} has an unsupported layout (version {version})")
+
+        # Sleep between attempts so the writer can finish instead of the
+        # reader burning every attempt during a single write
+        deadline = time.monotonic() + timeout
+        while True:
+            before = SEQUENCE.unpack_from(view, SEQUENCE_OFFSET)[0]
+            if not before % 2:
+                values = PAYLOAD.unpack_from(view, HEADER.size)
+                if SEQUENCE.unpack_from(view, SEQUENCE_OFFSET)[0] == before:
+                    break
+            if time.monotonic() >= deadline:
+                raise SnapshotError(f"Snapshot {path} did not stabilise within {timeout}s")
+            time.sleep(RETRY_SLEEP)
+    finally:
+        view.close()
+
+    if before == 0:
+        raise SnapshotError(f"Snapshot {path} has not been written yet")
+
+    snapshot = {}
+    for (name, fmt), value in zip(FIELDS, values):
+        if fmt == 'd':
+            snapshot[name] = None if math.isnan(value) else value
+        else:
+            snapshot[name] = None if value < 0 else value
+
+    snapshot['age_seconds'] = round(time.time() - snapshot['timestamp'], 3) if snapshot['timestamp'] else None
+    return snapshot
+
+
+def format_shell(snapshot: Dict) -> str:
+    """Format readings as name=value lines for eval (missing readings are empty)."""
+    lines = []
+    for name, value in snapshot.items():
+        if value is None:
+            value = ''
+        elif isinstance(value, float) and math.isinf(value):
+            value = 'inf'
+        lines.append(f"{name}={value}")
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point for CLI usage."""
+    parser = argparse.ArgumentParser(
+        description='Read the thermal exporter snapshot',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--file', type=str, default=DEFAULT_SNAPSHOT_FILE, help='Snapshot file path')
+    parser.add_argument('--format', choices=['json', 'shell'], default='json', help='Output format')
+    parser.add_argument('--field', type=str, choices=[name for name, _ in FIELDS] + ['age_seconds'],
+                        help='Print a single field')
+    parser.add_argument('--max-age', type=float, help='Fail (exit 2) if the snapshot is older than this')
+
+    args = parser.parse_args()
+
+    try:
+        snapshot = read_snapshot(args.file)
+    except SnapshotError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.field:
+        value = snapshot[args.field]
+        print('' if value is None else value)
+    elif args.format == 'shell':
+        print(format_shell(snapshot))
+    else:
+        # JSON has no infinity; like /admit, "not heading to the soft limit" is null
+        print(json.dumps({name: None if isinstance(value, float) and math.isinf(value) else value
+                          for name, value in snapshot.items()}, indent=2))
+
+    if args.max_age is not None and (snapshot['age_seconds'] is None or snapshot['age_seconds'] > args.max_age):
+        print(f"Warning: Snapshot is {snapshot['age_seconds']}s old", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
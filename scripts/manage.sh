@@ -61,6 +61,7 @@ Commands:
   monitoring-stop            Stop monitoring services 
   monitoring-status          Show monitoring service status
   thermal-test               Test thermal monitoring stack
+  thermal-now [--format shell]  Show latest exporter readings (shared-memory snapshot)
   exec-details <id>          Show detailed execution information
   exec-stats                 Show execution statistics summary
   exec-workflow <name> [limit]  Show executions for specific workflow
@@ -68,6 +69,17 @@ Commands:
   exec-data <id> [file]      Extract raw execution data (optionally save to file)
   exec-parse <id> [options]  Parse execution data and extract node outputs
   exec-llm <id>              Analyze LLM responses with JSON validation
+  exec-parser-start [cache]  Start resident parser daemon (speeds up exec-parse)
+  exec-parser-stop           Stop resident parser daemon
+  exec-parser-status         Show parser daemon cache statistics
+  exec-llm-stats <id> [id...]  Ollama tokens/s and load time per model across executions
+  exec-compare <base> <id> [id...]  Compare node timings, item counts and outputs
+  exec-index                 Update full-text index of execution outputs
+  exec-search <query> [opts] Search indexed outputs (phrase, prefix*, --node, --like)
+  exec-report <id> [id...]   Timings, LLM responses, Ollama stats, validation and size in one pass
+  exec-size [opts]           Rank nodes/fields by stored data size (--limit, --workflow, --group-by)
+  exec-benchmark [opts]      Benchmark parsers on synthetic executions (--save-baseline)
+  exec-compact [opts]        Shrink old execution data (--drop-binary, --truncate-strings, --apply)
   exec-monitoring <id>       Get monitoring data (temp, CPU, memory) for execution
 
   WiFi Management:
@@ -101,6 +113,9 @@ Examples:
   $0 exec-data 191 exec-191.json     # Extract raw execution data to file
   $0 exec-parse 191 --llm-only       # Parse and extract LLM responses
   $0 exec-llm 191                    # Analyze LLM responses with validation
+  $0 exec-llm-stats 286 287 290      # Compare Ollama throughput per model
+  $0 exec-compare 193 200            # Diff a good and a bad run
+  $0 exec-search '"parse entities"'  # Find executions whose outputs contain a phrase
   $0 exec-monitoring 200             # Get temperature/CPU/memory data for execution
   $0 diagnose                        # Full system diagnostic
   $0 diagnose database               # Database analysis only
@@ -338,6 +353,47 @@ case "${1:-}" in
     "exec-llm")
         analyze_llm_responses "$2"
         ;;
+    "exec-parser-start")
+        start_parser_daemon "$2"
+        ;;
+    "exec-parser-stop")
+        stop_parser_daemon
+        ;;
+    "exec-parser-status")
+        show_parser_daemon_status
+        ;;
+    "exec-compare")
+        shift  # Remove command name
+        compare_executions "$@"
+        ;;
+    "exec-index")
+        shift  # Remove command name
+        index_executions "$@"
+        ;;
+    "exec-search")
+        shift  # Remove command name
+        search_executions "$@"
+        ;;
+    "exec-report")
+        shift  # Remove command name
+        execution_report "$@"
+        ;;
+    "exec-size")
+        shift  # Remove command name
+        profile_execution_sizes "$@"
+        ;;
+    "exec-benchmark")
+        shift  # Remove command name
+        benchmark_parsers "$@"
+        ;;
+    "exec-compact")
+        shift  # Remove command name
+        compact_executions "$@"
+        ;;
+    "exec-llm-stats")
+        shift  # Remove command name
+        analyze_llm_throughput "$@"
+        ;;
     "exec-monitoring")
         get_execution_monitoring_data "$2"
         ;;
@@ -359,6 +415,9 @@ case "${1:-}" in
     "thermal-test")
         exec "${SCRIPT_DIR}/test-thermal-monitoring.sh"
         ;;
+    "thermal-now")
+        show_thermal_snapshot "${@:2}"
+        ;;
     "wifi-status")
         get_wifi_status
         ;;